@@ -9,8 +9,64 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+# URLconf с асинхронными эндпоинтами, которые доступны только под ASGI
+ASGI_URLCONF = 'config.asgi_urls'
+
+
+class URLConfASGIHandler(ASGIHandler):
+    """
+    ASGIHandler, который разрешает запросы по ASGI_URLCONF.
+    """
+
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None:
+            request.urlconf = ASGI_URLCONF
+        return request, error_response
+
+
+class AsyncEndpointsHandler(URLConfASGIHandler):
+    """
+    Обработчик асинхронных эндпоинтов с цепочкой ASYNC_MIDDLEWARE вместо
+    MIDDLEWARE.
+
+    Синхронные middleware (сессии, CSRF, аутентификация, сообщения) под
+    ASGI выполняются в потоке через `sync_to_async`, и каждый запрос платил
+    бы за переключения потоков. Асинхронным эндпоинтам они не нужны.
+    """
+
+    def load_middleware(self, is_async=False):
+        # BaseHandler читает список из settings.MIDDLEWARE; цепочка строится
+        # один раз при создании обработчика, до приёма запросов.
+        middleware = settings.MIDDLEWARE
+        settings.MIDDLEWARE = settings.ASYNC_MIDDLEWARE
+        try:
+            super().load_middleware(is_async)
+        finally:
+            settings.MIDDLEWARE = middleware
+
+
+django.setup(set_prefix=False)
+
+from .asgi_urls import ASYNC_PREFIX  # noqa: E402
+
+handler = URLConfASGIHandler()
+async_handler = AsyncEndpointsHandler()
+
+
+async def application(scope, receive, send):
+    """
+    Направляет запросы к асинхронным эндпоинтам в `async_handler`,
+    остальные — в обычный обработчик со всеми middleware.
+    """
+    path = scope.get('path', '')
+    if scope['type'] == 'http' and path.startswith(f"{scope.get('root_path', '')}/{ASYNC_PREFIX}"):
+        await async_handler(scope, receive, send)
+    else:
+        await handler(scope, receive, send)
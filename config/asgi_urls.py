@@ -0,0 +1,20 @@
+"""
+URLconf ASGI-сервера (`config.asgi`): все маршруты `config.urls` и
+асинхронные эндпоинты чтения.
+
+Под WSGI асинхронные представления выполнялись бы в отдельном цикле
+событий на каждый запрос, а SSE-поток занимал бы воркер целиком,
+поэтому в `config.urls` они не подключаются.
+"""
+from django.urls import include, path
+
+from .urls import urlpatterns as wsgi_urlpatterns
+
+# Префикс асинхронных эндпоинтов; `config.asgi` обслуживает его
+# цепочкой ASYNC_MIDDLEWARE
+ASYNC_PREFIX = 'api/v1/async/'
+
+urlpatterns = [
+    *wsgi_urlpatterns,
+    path(ASYNC_PREFIX, include('core.async_urls')),
+]
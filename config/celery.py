@@ -1,6 +1,7 @@
 # config/celery.py
 import os
 from celery import Celery
+from celery.schedules import crontab
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
@@ -11,4 +12,24 @@ app.autodiscover_tasks()
 app.conf.task_routes = {
     'core.tasks.send_donation_emails': {'queue': 'emails'},
     'core.tasks.send_collect_creation_email': {'queue': 'emails'},
+    'core.tasks.process_cover_image': {'queue': 'media'},
+}
+
+app.conf.beat_schedule = {
+    'expire-collects': {
+        'task': 'core.tasks.expire_collects',
+        'schedule': crontab(),
+    },
+    'finalize-ended-collects': {
+        'task': 'core.tasks.finalize_ended_collects',
+        'schedule': crontab(minute='*/10'),
+    },
+    'recompute-stats': {
+        'task': 'core.tasks.recompute_stats',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'reconcile-collect-totals': {
+        'task': 'core.tasks.reconcile_collect_totals',
+        'schedule': crontab(minute=30),
+    },
 }
@@ -60,30 +60,99 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': os.getenv('POSTGRES_DB'),
-        'USER': os.getenv('POSTGRES_USER'),
-        'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
-        'HOST': os.getenv('DB_HOST'),
-        'PORT': os.getenv('DB_PORT'),
+if os.getenv("DB_ENGINE") == "sqlite":
+    # Локальный запуск без PostgreSQL (например, для проверки реплик на двух файлах)
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB'),
+            'USER': os.getenv('POSTGRES_USER'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
+            'HOST': os.getenv('DB_HOST'),
+            'PORT': os.getenv('DB_PORT'),
+        }
     }
-}
+
+# Реплики для чтения: для PostgreSQL — "host:port" через запятую,
+# для SQLite — пути к файлам через запятую.
+DATABASE_REPLICAS = []
+for number, replica in enumerate(filter(None, os.getenv("DB_REPLICAS", "").split(",")), start=1):
+    alias = f'replica_{number}'
+    if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+        location = {'NAME': replica}
+    else:
+        host, _, port = replica.partition(':')
+        location = {'HOST': host, 'PORT': port or DATABASES['default']['PORT']}
+    DATABASES[alias] = {**DATABASES['default'], **location, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+
+# Middleware асинхронных эндпоинтов под ASGI (config.asgi): только
+# нативно асинхронные, без сессий, CSRF и аутентификации Django
+ASYNC_MIDDLEWARE = []
+
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ['core.db_routers.ReplicaRouter']
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.contrib.auth.middleware.AuthenticationMiddleware') + 1,
+        'core.db_routers.ReplicaRoutingMiddleware',
+    )
+    ASYNC_MIDDLEWARE.append('core.db_routers.ReplicaRoutingMiddleware')
+
+# Чтения каких путей можно отправлять на реплики
+REPLICA_PATH_PREFIXES = ('/api/',)
+# Сколько секунд после записи клиент читает только из основной базы
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 5))
+# Допустимое отставание реплики и период его проверки, секунды
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 2))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", 5))
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.StatelessJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
     'DEFAULT_PAGINATION_CLASS': 'core.pagination.Pagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_CLASSES': (
+        'core.throttling.UserTokenBucketThrottle',
+        'core.throttling.IPTokenBucketThrottle',
+    ),
+    # <scope> — на пользователя (аноним — на IP), <scope>_ip — на IP-адрес
+    'DEFAULT_THROTTLE_RATES': {
+        'register': os.getenv("THROTTLE_REGISTER", '5/min'),
+        'login': os.getenv("THROTTLE_LOGIN", '10/min'),
+        'payment': os.getenv("THROTTLE_PAYMENT", '30/min'),
+        'payment_ip': os.getenv("THROTTLE_PAYMENT_IP", '120/min'),
+    },
 }
 
+# Быстрый путь сериализации списков сборов и платежей (core.fast_serializers)
+FAST_SERIALIZATION = os.getenv("FAST_SERIALIZATION", "False") == "True"
+
+# Читать и суммировать деньги из целочисленных колонок в копейках (core.money)
+MONEY_MINOR_UNITS = os.getenv("MONEY_MINOR_UNITS", "False") == "True"
+
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    "TOKEN_OBTAIN_SERIALIZER": "core.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "core.serializers.ClaimsTokenRefreshSerializer",
 }
 
+# Сколько секунд держать в кэше полную строку пользователя из токена
+JWT_USER_CACHE_TIMEOUT = int(os.getenv('JWT_USER_CACHE_TIMEOUT', 60))
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -100,19 +169,84 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://redis:6379/1")
+
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
-        "LOCATION": "redis://redis:6379/1",
+        # RedisCache с локальным LRU в памяти процесса для горячих ключей
+        "BACKEND": "core.near_cache.NearCache",
+        "LOCATION": CACHE_REDIS_URL,
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "NEAR_CACHE": {
+                "KEY_PREFIXES": ("collects_page_",),
+                "MAX_BYTES": int(os.getenv("NEAR_CACHE_MAX_BYTES", 32 * 1024 * 1024)),
+                "TIMEOUT": int(os.getenv("NEAR_CACHE_TIMEOUT", 60)),
+            },
         }
     }
 }
 
+# Защита от лавины промахов кэша (core.cache): время жизни блокировки пересчёта
+# и сколько секунд после истечения/инвалидации отдавать устаревшие данные
+CACHE_LOCK_TIMEOUT = int(os.getenv("CACHE_LOCK_TIMEOUT", 10))
+CACHE_STALE_TIMEOUT = int(os.getenv("CACHE_STALE_TIMEOUT", 30))
+
+# Сколько секунд хранить ответ на запрос с Idempotency-Key и сколько
+# ждать завершения одновременного запроса с тем же ключом
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", 60 * 60 * 24))
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", 10))
+
+# Redis для pub/sub событий сборов (SSE) и период пинга SSE-соединений, секунды
+EVENTS_REDIS_URL = os.getenv("EVENTS_REDIS_URL", "redis://redis:6379/2")
+SSE_HEARTBEAT_SECONDS = int(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+
+# Время жизни ответов асинхронных (ASGI) эндпоинтов в Redis, секунды
+ASYNC_CACHE_TIMEOUT = int(os.getenv("ASYNC_CACHE_TIMEOUT", 60))
+SHORT_LINK_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Время жизни итогов пожертвований пользователя (/me/payments/) в кэше, секунды
+DONOR_TOTALS_CACHE_TIMEOUT = int(os.getenv("DONOR_TOTALS_CACHE_TIMEOUT", 60 * 60 * 24))
+
+# Пакетное чтение сборов (/collects/batch/): максимум id в запросе и
+# время жизни представления одного сбора в кэше, секунды
+COLLECTS_BATCH_MAX_IDS = int(os.getenv("COLLECTS_BATCH_MAX_IDS", 100))
+COLLECT_CACHE_TIMEOUT = int(os.getenv("COLLECT_CACHE_TIMEOUT", 300))
+
+# Сколько последних комментариев встраивать в платёж (core.comments)
+COMMENTS_PREVIEW_SIZE = int(os.getenv("COMMENTS_PREVIEW_SIZE", 3))
+
+# Размер пачки строк серверного курсора при выгрузке платежей
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+
+# Размер окна по id при сверке агрегатов сборов с платежами
+RECONCILE_CHUNK_SIZE = int(os.getenv("RECONCILE_CHUNK_SIZE", 1000))
+
+# Сколько сборов переводить в статус «завершён» одним UPDATE
+STATUS_SWEEP_BATCH_SIZE = int(os.getenv("STATUS_SWEEP_BATCH_SIZE", 500))
+
+# Статистика платформы (/stats/): период по умолчанию и максимальный, дни;
+# время жизни ответа в кэше, секунды
+STATS_DAYS = int(os.getenv("STATS_DAYS", 30))
+STATS_MAX_DAYS = int(os.getenv("STATS_MAX_DAYS", 366))
+STATS_CACHE_TIMEOUT = int(os.getenv("STATS_CACHE_TIMEOUT", 60))
+
+# Сколько строк удалять одним запросом при фоновом удалении сбора
+DELETION_BATCH_SIZE = int(os.getenv("DELETION_BATCH_SIZE", 1000))
+
+# Адрес сайта для абсолютных ссылок в снимках завершённых сборов
+SITE_URL = os.getenv("SITE_URL", "http://127.0.0.1:8000")
+# Cache-Control max-age для ответов из снимков, секунды
+SNAPSHOT_CACHE_MAX_AGE = int(os.getenv("SNAPSHOT_CACHE_MAX_AGE", 60 * 60 * 24))
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Максимальный размер обложки в пикселях, который соглашается декодировать Pillow
+COVER_MAX_PIXELS = int(os.getenv("COVER_MAX_PIXELS", 50_000_000))
+# То же для форматов, которые декодируются целиком (все, кроме JPEG)
+COVER_MAX_DECODED_PIXELS = int(os.getenv("COVER_MAX_DECODED_PIXELS", 16_000_000))
+
 
 LANGUAGE_CODE = 'en-us'
 
@@ -126,6 +260,16 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'static/'
 
+# Заранее собранная OpenAPI-схема (core.openapi): версия кода (по умолчанию —
+# хэш исходников), каталог артефактов и время кэширования ответа, секунды
+APP_VERSION = os.getenv("APP_VERSION", "")
+OPENAPI_SCHEMA_DIR = os.getenv("OPENAPI_SCHEMA_DIR", STATIC_ROOT / 'openapi')
+OPENAPI_SCHEMA_MAX_AGE = int(os.getenv("OPENAPI_SCHEMA_MAX_AGE", 300))
+
+SWAGGER_SETTINGS = {
+    'SPEC_URL': 'openapi-schema',
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
@@ -0,0 +1,34 @@
+"""
+Профиль настроек для Celery-воркеров и beat.
+
+Воркеры не обслуживают HTTP-запросы, поэтому из общего профиля убраны
+админка, Swagger, фильтры, сессии, сообщения, статика и middleware.
+Задачам нужны только модели, кэш, почта и (для снимков) API-представления.
+Используется через DJANGO_SETTINGS_MODULE=config.settings_worker.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, REST_FRAMEWORK
+
+WORKER_EXCLUDED_APPS = (
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'drf_yasg',
+    'django_filters',
+)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in WORKER_EXCLUDED_APPS]
+
+MIDDLEWARE = []
+
+# Только маршруты API: по ним задачи строят ссылки в снимках сборов.
+ROOT_URLCONF = 'config.urls_worker'
+
+TEMPLATES = []
+
+# Снимки рендерятся только в JSON; BrowsableAPIRenderer тянет шаблоны и формы.
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ('core.renderers.ORJSONRenderer',),
+}
@@ -1,23 +1,13 @@
 from django.contrib import admin
 from django.urls import path, include
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from rest_framework.permissions import AllowAny
 
+from core.openapi import openapi_schema, swagger_ui
 from core.views import redirect_short_link
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Donation API",
-        default_version='v1',
-    ),
-    public=True,
-    permission_classes=[AllowAny],
-)
-
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/', include('core.urls')),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
+    path('swagger/', swagger_ui, name='schema-swagger-ui'),
+    path('swagger/openapi.json', openapi_schema, name='openapi-schema'),
     path('r/<str:short_link>/', redirect_short_link, name='short_link'),
 ]
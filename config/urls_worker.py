@@ -0,0 +1,12 @@
+"""
+URLconf профиля `config.settings_worker`: только маршруты, которые
+задачи разрешают через `reverse`, без админки и Swagger.
+"""
+from django.urls import path, include
+
+from core.views import redirect_short_link
+
+urlpatterns = [
+    path('api/v1/', include('core.urls')),
+    path('r/<str:short_link>/', redirect_short_link, name='short_link'),
+]
@@ -1,8 +1,35 @@
 from django.contrib import admin
 
+from .deletion import schedule_collect_deletion
 from .models import Collect, Payment, PaymentLike, PaymentComment
 
-admin.site.register(Collect)
+
+@admin.register(Collect)
+class CollectAdmin(admin.ModelAdmin):
+    """
+    Сборы удаляются в фоне (см. `core.deletion`): админка только скрывает
+    их и ставит задачу, не собирая связанные объекты каскадом.
+    """
+    list_display = ('title', 'author', 'end_datetime', 'is_hidden')
+    list_filter = ('is_hidden',)
+
+    def get_deleted_objects(self, objs, request):
+        # Страница подтверждения не перечисляет платежи, лайки и комментарии:
+        # для этого пришлось бы загрузить их все.
+        objs = list(objs)
+        perms_needed = set()
+        if not self.has_delete_permission(request):
+            perms_needed.add(self.opts.verbose_name)
+        return [str(obj) for obj in objs], {self.opts.verbose_name_plural: len(objs)}, perms_needed, []
+
+    def delete_model(self, request, obj):
+        schedule_collect_deletion(obj.id)
+
+    def delete_queryset(self, request, queryset):
+        for collect_id in queryset.values_list('id', flat=True):
+            schedule_collect_deletion(collect_id)
+
+
 admin.site.register(Payment)
 admin.site.register(PaymentLike)
 admin.site.register(PaymentComment)
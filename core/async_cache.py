@@ -0,0 +1,69 @@
+"""
+Асинхронный клиент Redis для кэша ASGI-представлений.
+
+Ключи строятся через `cache.make_key`, поэтому живут в том же пространстве
+имён, что и ключи django-кэша. Значения — готовые байты JSON-ответа.
+"""
+import asyncio
+import logging
+import weakref
+
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.core.cache import cache
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Клиент на каждый цикл событий: соединения пула привязаны к циклу,
+# в котором созданы, и не могут использоваться из другого.
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_client():
+    """
+    Возвращает асинхронный клиент Redis для текущего цикла событий.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = aioredis.from_url(settings.CACHE_REDIS_URL)
+    return client
+
+
+async def get(key):
+    """
+    Читает значение из кэша. Недоступность Redis трактуется как промах.
+    """
+    try:
+        return await get_client().get(cache.make_key(key))
+    except RedisError:
+        logger.warning('Redis недоступен, читаем без кэша', exc_info=True)
+        return None
+
+
+async def set(key, value, timeout=None):
+    """
+    Записывает значение в кэш. Ошибки Redis не прерывают запрос.
+    """
+    try:
+        await get_client().set(
+            cache.make_key(key), value, ex=timeout or settings.ASYNC_CACHE_TIMEOUT
+        )
+    except RedisError:
+        logger.warning('Redis недоступен, ответ не закэширован', exc_info=True)
+
+
+async def add(key, value, timeout=None):
+    """
+    Записывает значение, только если ключа ещё нет (без срока жизни при
+    `timeout=None`).
+
+    Возвращает:
+        bool: True, если значение записано.
+    """
+    try:
+        return bool(await get_client().set(cache.make_key(key), value, ex=timeout, nx=True))
+    except RedisError:
+        logger.warning('Redis недоступен, значение не записано', exc_info=True)
+        return False
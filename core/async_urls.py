@@ -0,0 +1,13 @@
+from django.urls import path
+
+from . import async_views
+
+# Асинхронные (ASGI) варианты эндпоинтов чтения
+urlpatterns = [
+    path('collects/', async_views.collect_list, name='async-collect-list'),
+    path('collects/<int:pk>/', async_views.collect_detail, name='async-collect-detail'),
+    path('collects/<int:pk>/events/', async_views.collect_events, name='async-collect-events'),
+    path('collects/<int:collect_id>/payments/', async_views.payment_list,
+         name='async-collect-payments'),
+    path('r/<str:short_link>/', async_views.redirect_short_link, name='async-short-link'),
+]
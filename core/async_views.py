@@ -0,0 +1,249 @@
+"""
+Асинхронные представления для чтения сборов и платежей.
+
+Предназначены для запуска под ASGI-сервером (`config.asgi`) и подключены
+только в его URLconf (`config.asgi_urls`). Используют
+асинхронный ORM Django и асинхронный клиент Redis, поэтому один процесс
+может обслуживать тысячи одновременных медленных клиентов. Ответы
+совпадают с быстрым путём синхронных ViewSet-ов (`core.fast_serializers`).
+"""
+import asyncio
+import math
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_http_methods
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from . import async_cache
+from .cache import COLLECTS_PAGES_VERSION_KEY, collects_page_key
+from .events import hub
+from .fast_serializers import FastCollectSerializer, FastPaymentSerializer
+from .models import Collect, Payment
+from .pagination import Pagination
+from .renderers import ORJSONRenderer
+
+renderer = ORJSONRenderer()
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        renderer.render(data), status=status, content_type=renderer.media_type
+    )
+
+
+def not_found(detail='Not found.'):
+    return json_response({'detail': detail}, status=404)
+
+
+def get_page_size(request):
+    """
+    Размер страницы из параметра `limit`, как в `core.pagination.Pagination`.
+    """
+    try:
+        limit = int(request.GET[Pagination.page_size_query_param])
+    except (KeyError, ValueError):
+        return Pagination.page_size
+    if limit <= 0:
+        return Pagination.page_size
+    return min(limit, Pagination.max_page_size)
+
+
+async def paginate(request, rows, url=None):
+    """
+    Асинхронный аналог PageNumberPagination.
+
+    Ссылки на соседние страницы строятся от `url` (по умолчанию — от
+    адреса запроса).
+
+    Возвращает:
+        tuple: (строки страницы, функция сборки ответа) или (None, None),
+        если номер страницы некорректен.
+    """
+    page_size = get_page_size(request)
+    count = await rows.acount()
+    num_pages = max(1, math.ceil(count / page_size))
+    try:
+        page = int(request.GET.get('page') or 1)
+    except ValueError:
+        return None, None
+    if page < 1 or page > num_pages:
+        return None, None
+
+    offset = (page - 1) * page_size
+    page_rows = [row async for row in rows[offset:offset + page_size]]
+
+    def paginated(results):
+        base_url = url or request.build_absolute_uri()
+        previous = None
+        if page > 1:
+            previous = (remove_query_param(base_url, 'page') if page == 2
+                        else replace_query_param(base_url, 'page', page - 1))
+        return {
+            'count': count,
+            'next': replace_query_param(base_url, 'page', page + 1) if page < num_pages else None,
+            'previous': previous,
+            'results': results,
+        }
+
+    return page_rows, paginated
+
+
+async def serialize_collects(serializer, rows):
+    payment_rows = [
+        row async for row in serializer.get_payment_rows([row['id'] for row in rows])
+    ]
+    comment_rows = [
+        row async for row in serializer.payment_serializer.get_comment_rows(
+            [row['id'] for row in payment_rows]
+        )
+    ]
+    return serializer.build(rows, payment_rows, comment_rows)
+
+
+async def serialize_payments(serializer, rows):
+    comment_rows = [
+        row async for row in serializer.get_comment_rows([row['id'] for row in rows])
+    ]
+    return serializer.build(rows, comment_rows)
+
+
+async def collects_pages_version():
+    """
+    Асинхронный аналог `core.cache.collects_pages_version`: страницы
+    ASGI-списка сбрасываются той же инвалидацией, что и синхронные.
+
+    Возвращает:
+        int или None, если Redis недоступен (тогда ответ не кэшируется).
+    """
+    version = await async_cache.get(COLLECTS_PAGES_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not await async_cache.add(COLLECTS_PAGES_VERSION_KEY, version):
+            version = await async_cache.get(COLLECTS_PAGES_VERSION_KEY)
+    return None if version is None else int(version)
+
+
+@require_http_methods(["GET"])
+async def collect_list(request):
+    """
+    Список сборов с пагинацией. Готовый JSON кэшируется в Redis.
+
+    Ключ кэша и ссылки на страницы строятся только из поддерживаемых
+    параметров (page, limit, status), поэтому произвольные строки запроса
+    не размножают записи в кэше. Ключ содержит версию страниц списка
+    сборов, общую с синхронным списком.
+    """
+    collect_status = request.GET.get('status') or None
+    if collect_status and collect_status not in dict(Collect.STATUS_CHOICES):
+        return json_response({'status': [f"Неизвестный статус '{collect_status}'."]}, status=400)
+    page = request.GET.get('page') or '1'
+    if not page.isdigit():
+        return not_found('Invalid page.')
+    page_size = get_page_size(request)
+
+    version = await collects_pages_version()
+    cache_key = None
+    if version is not None:
+        cache_key = f"async:{collects_page_key(int(page), page_size, collect_status, version=version)}"
+        cached = await async_cache.get(cache_key)
+        if cached is not None:
+            return HttpResponse(cached, content_type=renderer.media_type)
+
+    queryset = Collect.objects.visible()
+    if collect_status:
+        queryset = queryset.filter(status=collect_status)
+    params = {'status': collect_status}
+    if Pagination.page_size_query_param in request.GET:
+        params[Pagination.page_size_query_param] = page_size
+    query = urlencode({name: value for name, value in params.items() if value})
+    url = request.build_absolute_uri(f'{request.path}?{query}' if query else request.path)
+
+    serializer = FastCollectSerializer(context={'request': request})
+    rows, paginated = await paginate(request, serializer.get_rows(queryset), url)
+    if rows is None:
+        return not_found('Invalid page.')
+
+    response = json_response(paginated(await serialize_collects(serializer, rows)))
+    if cache_key is not None:
+        await async_cache.set(cache_key, response.content)
+    return response
+
+
+@require_http_methods(["GET"])
+async def collect_detail(request, pk):
+    """
+    Детальная информация о сборе вместе с платежами.
+    """
+    serializer = FastCollectSerializer(context={'request': request})
+    row = await serializer.get_rows(Collect.objects.visible().filter(pk=pk)).afirst()
+    if row is None:
+        return not_found('No Collect matches the given query.')
+    return json_response((await serialize_collects(serializer, [row]))[0])
+
+
+@require_http_methods(["GET"])
+async def payment_list(request, collect_id):
+    """
+    Список платежей сбора с пагинацией.
+    """
+    if not await Collect.objects.visible().filter(pk=collect_id).aexists():
+        return not_found('No Collect matches the given query.')
+
+    serializer = FastPaymentSerializer(context={'request': request})
+    rows, paginated = await paginate(
+        request, serializer.get_rows(Payment.objects.filter(collect_id=collect_id))
+    )
+    if rows is None:
+        return not_found('Invalid page.')
+    return json_response(paginated(await serialize_payments(serializer, rows)))
+
+
+@require_http_methods(["GET"])
+async def redirect_short_link(request, short_link):
+    """
+    Асинхронный аналог `core.views.redirect_short_link`.
+
+    Короткая ссылка после выдачи не меняется, поэтому её соответствие
+    сбору кэшируется в Redis.
+    """
+    cache_key = f"async:short_link_{short_link}"
+    collect_id = await async_cache.get(cache_key)
+    if collect_id is None:
+        collect_id = await Collect.objects.visible().filter(
+            short_link=short_link
+        ).values_list('id', flat=True).afirst()
+        if collect_id is None:
+            return not_found('No Collect matches the given query.')
+        await async_cache.set(cache_key, collect_id, timeout=settings.SHORT_LINK_CACHE_TIMEOUT)
+    return HttpResponseRedirect(reverse('collect-detail', kwargs={'pk': int(collect_id)}))
+
+
+@require_http_methods(["GET"])
+async def collect_events(request, pk):
+    """
+    Поток Server-Sent Events сбора: новые платежи, суммы, лайки и комментарии.
+
+    Подписчик только ждёт в очереди, поэтому один ASGI-процесс держит
+    тысячи открытых соединений. Раз в SSE_HEARTBEAT_SECONDS отправляется
+    комментарий-пинг, чтобы прокси не закрывали соединение.
+    """
+    if not await Collect.objects.visible().filter(pk=pk).aexists():
+        return not_found('No Collect matches the given query.')
+
+    async def stream():
+        async with hub.subscribe(pk) as queue:
+            yield b'retry: 5000\n\n'
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b': ping\n\n'
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
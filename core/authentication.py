@@ -0,0 +1,84 @@
+"""
+JWT-аутентификация без запроса пользователя из БД на каждый запрос.
+
+Пользователь строится из claims access-токена (`ClaimsUser`), остальные
+поля загружаются лениво. Отзыв токенов — через компактный deny-list
+в кэше: ключ на jti отозванного токена и ключ «все токены пользователя,
+выпущенные раньше момента T». Обе записи живут не дольше самих токенов.
+"""
+import time
+
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import ClaimsUser
+
+
+def deny_key(jti):
+    return f"jwt_deny_{jti}"
+
+
+def user_deny_key(user_id):
+    return f"jwt_deny_user_{user_id}"
+
+
+def revoke_token(token):
+    """
+    Отзывает один токен (access или refresh) до конца срока его жизни.
+    """
+    ttl = int(token['exp'] - time.time())
+    if ttl > 0:
+        cache.set(deny_key(token[api_settings.JTI_CLAIM]), 1, timeout=ttl)
+
+
+def revoke_user_tokens(user_id):
+    """
+    Отзывает все токены пользователя, выпущенные до текущего момента.
+
+    Вызывается сигналами `core.signals` после смены пароля, username или
+    is_staff (они хранятся в токене), деактивации и удаления пользователя.
+    """
+    lifetime = max(api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME)
+    cache.set(user_deny_key(user_id), int(time.time()), timeout=int(lifetime.total_seconds()))
+
+
+def is_token_revoked(token):
+    """
+    Проверяет deny-list за один запрос к кэшу.
+    """
+    keys = [deny_key(token.get(api_settings.JTI_CLAIM)),
+            user_deny_key(token.get(api_settings.USER_ID_CLAIM))]
+    denied = cache.get_many(keys)
+    if keys[0] in denied:
+        return True
+    revoked_before = denied.get(keys[1])
+    # iat — в целых секундах: токен, выпущенный в ту же секунду, что и
+    # отзыв (например, вход с новым паролем), остаётся действительным.
+    return revoked_before is not None and token.get('iat', 0) < revoked_before
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, которая не загружает пользователя из БД.
+
+    Токены без claims пользователя (выпущенные до включения этого режима)
+    обрабатываются как обычно — с запросом в БД.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if is_token_revoked(validated_token):
+            raise InvalidToken({'detail': 'Токен отозван.', 'code': 'token_revoked'})
+        return validated_token
+
+    def get_user(self, validated_token):
+        claims = {'id': validated_token.get(api_settings.USER_ID_CLAIM)}
+        for name in ClaimsUser.claim_fields[1:]:
+            if name not in validated_token:
+                return super().get_user(validated_token)
+            claims[name] = validated_token[name]
+        if claims['id'] is None:
+            raise InvalidToken('Token contained no recognizable user identification')
+        return ClaimsUser.from_claims(claims)
@@ -0,0 +1,93 @@
+"""
+Пакетное чтение сборов по списку id (`/collects/batch/`).
+
+Клиенты ленты и уведомлений заранее знают нужные id. Вместо отдельного
+`GET /collects/{id}/` на каждый сбор они получают все сборы одним
+запросом. Представления сборов берутся из кэша одним `get_many`. Промахи
+загружаются быстрым сериализатором: один запрос `id__in` по сборам и по
+одному — по их платежам и комментариям. Затем они кладутся в кэш одним
+`set_many`.
+
+Записи, меняющие представление сбора, удаляют его из кэша
+(`core.cache.invalidate_collects`). COLLECT_CACHE_TIMEOUT ограничивает
+устаревание на случай гонки записи с загрузкой.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+
+from .cache import collect_key
+from .fast_serializers import FastCollectSerializer
+from .models import Collect
+from .snapshots import snapshot_request
+
+NOT_FOUND = 'Не найдено.'
+
+
+def parse_collect_ids(raw):
+    """
+    Разбирает список id: строку `1,2,3` или JSON-массив.
+
+    Исключения:
+        ValidationError: Если список пуст, длиннее COLLECTS_BATCH_MAX_IDS
+            или содержит не положительные целые числа.
+    """
+    if isinstance(raw, str):
+        raw = [part.strip() for part in raw.split(',') if part.strip()]
+    if not isinstance(raw, list) or not raw:
+        raise ValidationError({'ids': "Ожидается непустой список id: '1,2,3' или [1, 2, 3]."})
+    if len(raw) > settings.COLLECTS_BATCH_MAX_IDS:
+        raise ValidationError({'ids': f'Не больше {settings.COLLECTS_BATCH_MAX_IDS} id за запрос.'})
+
+    ids = []
+    for value in raw:
+        if isinstance(value, bool) or not (
+            isinstance(value, int) or isinstance(value, str) and value.isdigit()
+        ) or int(value) <= 0:
+            raise ValidationError({'ids': f"Некорректный id '{value}'."})
+        ids.append(int(value))
+    return ids
+
+
+def load_collects(collect_ids):
+    """
+    Загружает представления видимых сборов из базы и кладёт их в кэш.
+
+    Ссылки строятся от SITE_URL, как в снимках, поэтому закэшированное
+    представление не зависит от хоста запроса.
+
+    Возвращает:
+        dict: id сбора → представление (как у `CollectSerializer`).
+    """
+    request = snapshot_request(reverse('collect-list'))
+    serializer = FastCollectSerializer(context={'request': request})
+    rows = serializer.get_rows(Collect.objects.visible().filter(id__in=collect_ids))
+    collects = {item['id']: item for item in serializer.serialize(rows)}
+    if collects:
+        cache.set_many(
+            {collect_key(collect_id): data for collect_id, data in collects.items()},
+            timeout=settings.COLLECT_CACHE_TIMEOUT,
+        )
+    return collects
+
+
+def get_collects(collect_ids):
+    """
+    Представления сборов в порядке `collect_ids`.
+
+    Возвращает:
+        list: Для каждого id — представление сбора или
+        `{'id': ..., 'detail': 'Не найдено.'}`.
+    """
+    keys = {collect_id: collect_key(collect_id) for collect_id in collect_ids}
+    cached = cache.get_many(keys.values())
+    collects = {collect_id: cached[key] for collect_id, key in keys.items() if key in cached}
+
+    misses = [collect_id for collect_id in keys if collect_id not in collects]
+    if misses:
+        collects.update(load_collects(misses))
+    return [
+        collects.get(collect_id, {'id': collect_id, 'detail': NOT_FOUND})
+        for collect_id in collect_ids
+    ]
@@ -0,0 +1,184 @@
+"""
+Cache-aside с защитой от «лавины» промахов (cache stampede).
+
+- Пересчёт выполняет один процесс: он берёт короткую блокировку через
+  `cache.add`, остальные в это время получают старое значение или ждут.
+- Вероятностное раннее обновление (XFetch): чем ближе истечение и чем
+  дороже пересчёт, тем выше шанс, что один из запросов обновит значение
+  заранее, до того как его одновременно потеряют все.
+- Stale-while-revalidate: значение хранится дольше своего срока свежести,
+  и после инвалидации его продолжают отдавать, пока идёт пересчёт.
+"""
+import math
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def lock_key(key):
+    return f"lock:{key}"
+
+
+def get_or_compute(key, compute, timeout, stale_timeout=None, lock_timeout=None, beta=1.0,
+                   stale_key=None):
+    """
+    Возвращает значение из кэша или вычисляет его, не допуская
+    одновременного пересчёта в нескольких процессах.
+
+    Аргументы:
+        key (str): Ключ кэша.
+        compute (callable): Функция без аргументов, вычисляющая значение.
+        timeout (int): Срок свежести значения, секунды.
+        stale_timeout (int): Сколько секунд после срока свежести (или после
+            `invalidate`) отдавать устаревшее значение, пока оно пересчитывается.
+            По умолчанию CACHE_STALE_TIMEOUT; 0 — не отдавать устаревшее.
+        lock_timeout (int): Время жизни блокировки пересчёта, секунды.
+            По умолчанию CACHE_LOCK_TIMEOUT.
+        beta (float): Коэффициент раннего обновления; 0 — выключить.
+        stale_key (str): Ключ прежней версии значения: пока `key` ещё
+            пересчитывается, отдаётся значение из него.
+
+    Возвращает:
+        Значение из кэша или результат `compute()`.
+    """
+    if stale_timeout is None:
+        stale_timeout = settings.CACHE_STALE_TIMEOUT
+    if lock_timeout is None:
+        lock_timeout = settings.CACHE_LOCK_TIMEOUT
+
+    entry = cache.get(key)
+    if entry is not None:
+        value, delta, expires_at = entry
+        # XFetch: -log(random()) > 0, поэтому сдвиг «текущего времени» вперёд
+        # пропорционален длительности пересчёта.
+        if time.time() - delta * beta * math.log(1 - random.random()) < expires_at:
+            return value
+
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key(key), token, timeout=lock_timeout):
+        # Пересчётом уже занят другой процесс.
+        if entry is not None:
+            return entry[0]
+        if stale_key is not None and stale_timeout:
+            stale_entry = cache.get(stale_key)
+            if stale_entry is not None:
+                return stale_entry[0]
+        entry = wait_for_value(key, lock_timeout)
+        if entry is not None:
+            return entry[0]
+
+    try:
+        started = time.monotonic()
+        value = compute()
+        delta = time.monotonic() - started
+        cache.set(key, (value, delta, time.time() + timeout), timeout=timeout + stale_timeout)
+    finally:
+        if cache.get(lock_key(key)) == token:
+            cache.delete(lock_key(key))
+    return value
+
+
+def wait_for_value(key, lock_timeout, interval=0.05):
+    """
+    Ждёт, пока процесс-владелец блокировки положит значение в кэш.
+
+    Возвращает запись кэша или None, если блокировка освободилась или
+    истекла без результата (тогда значение вычисляется самостоятельно).
+    """
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(interval)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+        if cache.get(lock_key(key)) is None:
+            return None
+    return None
+
+
+def invalidate(key, stale_timeout=None):
+    """
+    Помечает значение устаревшим.
+
+    Значение остаётся в кэше ещё `stale_timeout` секунд: первый запрос
+    пересчитает его, остальные в это время получат устаревшие данные.
+    При `stale_timeout=0` значение удаляется.
+    """
+    if stale_timeout is None:
+        stale_timeout = settings.CACHE_STALE_TIMEOUT
+    entry = cache.get(key) if stale_timeout else None
+    if entry is None:
+        cache.delete(key)
+        return
+    cache.set(key, (entry[0], entry[1], 0), timeout=stale_timeout)
+
+
+# Ключ версии страниц списка сборов (вне префикса ближнего кэша, чтобы
+# смена версии сразу была видна всем процессам).
+COLLECTS_PAGES_VERSION_KEY = 'collects_pages_version'
+
+
+def collects_pages_version():
+    """
+    Текущая версия закэшированных страниц списка сборов.
+    """
+    version = cache.get(COLLECTS_PAGES_VERSION_KEY)
+    if version is None:
+        # Начальная версия — от времени: если ключ версии вытеснили,
+        # новая не совпадёт ни с одной из прежних.
+        version = time.time_ns()
+        if not cache.add(COLLECTS_PAGES_VERSION_KEY, version, timeout=None):
+            version = cache.get(COLLECTS_PAGES_VERSION_KEY, version)
+    return version
+
+
+def collects_page_key(page=1, limit=10, status=None, selection=None, version=None):
+    """
+    Ключ кэша страницы списка сборов (с фильтром по статусу и выбором
+    полей `core.field_selection.FieldSelection`, если они заданы).
+
+    Страниц, размеров и вариантов выбора полей слишком много, чтобы
+    перечислить их при инвалидации, поэтому все ключи содержат версию
+    (по умолчанию текущую `collects_pages_version`), которую сдвигает
+    `invalidate_collects_pages`.
+    """
+    if version is None:
+        version = collects_pages_version()
+    key = f"collects_page_v{version}_{page}_limit_{limit}"
+    if status:
+        key = f"{key}_status_{status}"
+    if selection is not None:
+        key = f"{key}_{selection.cache_key()}"
+    return key
+
+
+def invalidate_collects_pages():
+    """
+    Сбрасывает все закэшированные страницы списка сборов сменой версии.
+
+    Прежние значения не удаляются: пока страница новой версии
+    пересчитывается, остальные запросы получают прежнюю (см. `stale_key`
+    в `get_or_compute`), а затем они истекают сами.
+    """
+    try:
+        cache.incr(COLLECTS_PAGES_VERSION_KEY)
+    except ValueError:
+        # Версии ещё нет: её создаст первое чтение.
+        pass
+
+
+def collect_key(collect_id):
+    """
+    Ключ кэша представления одного сбора (см. `core.batch`).
+    """
+    return f"collect_{collect_id}"
+
+
+def invalidate_collects(*collect_ids):
+    """
+    Удаляет закэшированные представления сборов.
+    """
+    cache.delete_many([collect_key(collect_id) for collect_id in collect_ids])
@@ -0,0 +1,62 @@
+"""
+Превью комментариев в платежах.
+
+Платёж в ответах API несёт не все комментарии, а только последние
+COMMENTS_PREVIEW_SIZE (новые первыми) и их общее число `comments_count`.
+Полная лента комментариев — на маршруте `/comments/` с пагинацией.
+Поэтому размер страницы сборов и платежей не зависит от популярности
+одного платежа.
+
+Превью всей страницы платежей загружается одним запросом с оконной
+функцией ROW_NUMBER() по платежу, число комментариев — подзапросом
+по индексу `(payment, created_at)`.
+"""
+from django.conf import settings
+from django.db.models import F, Prefetch, Window
+from django.db.models.functions import RowNumber
+
+from .models import PaymentComment
+from .querysets import count_subquery
+
+PREVIEW_ORDERING = ('-created_at', '-id')
+# Атрибут, который читает `Payment.latest_comments`.
+PREVIEW_ATTR = 'prefetched_latest_comments'
+
+
+def comments_count():
+    """
+    Выражение для аннотации платежей числом их комментариев.
+
+    Подзапрос вместо Count('comments'), чтобы не умножать строки
+    при одновременном подсчёте лайков.
+    """
+    return count_subquery(PaymentComment)
+
+
+def latest_comments(payment_ids):
+    """
+    Последние COMMENTS_PREVIEW_SIZE комментариев каждого платежа из
+    `payment_ids` одним запросом.
+    """
+    return PaymentComment.objects.filter(payment_id__in=payment_ids).annotate(
+        preview_rank=Window(
+            RowNumber(),
+            partition_by=F('payment_id'),
+            order_by=[F('created_at').desc(), F('id').desc()],
+        )
+    ).filter(preview_rank__lte=settings.COMMENTS_PREVIEW_SIZE).order_by(*PREVIEW_ORDERING)
+
+
+def preview_prefetch():
+    """
+    Prefetch превью комментариев для queryset платежей
+    (см. `Payment.latest_comments`).
+
+    Срез в Prefetch Django выполняет той же оконной функцией — одним
+    запросом на страницу.
+    """
+    return Prefetch(
+        'comments',
+        queryset=PaymentComment.objects.order_by(*PREVIEW_ORDERING)[:settings.COMMENTS_PREVIEW_SIZE],
+        to_attr=PREVIEW_ATTR,
+    )
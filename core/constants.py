@@ -1 +1,9 @@
-SHORT_LINK_MAX_LENGTH = 128
\ No newline at end of file
+SHORT_LINK_MAX_LENGTH = 128
+
+# Ширины (px) вариантов обложки сбора и их форматы
+COVER_RENDITION_WIDTHS = (1280, 640, 320)
+COVER_RENDITION_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+COVER_RENDITIONS_DIR = 'covers/renditions'
@@ -0,0 +1,179 @@
+"""
+Маршрутизация запросов к БД между основной базой и репликами.
+
+Чтения в рамках безопасных (GET/HEAD/OPTIONS) API-запросов уходят на одну из
+реплик из DATABASE_REPLICAS, всё остальное — в `default`. После записи клиент
+на REPLICA_PIN_SECONDS «прилипает» к основной базе (read-your-writes), а реплики
+с отставанием больше REPLICA_MAX_LAG_SECONDS временно исключаются.
+"""
+import contextvars
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = 'db_pin'
+
+_request_state = contextvars.ContextVar('db_routing_state', default=None)
+_replica_lag = {}
+
+
+def pin_cache_key(user_id):
+    return f"db_pin_user_{user_id}"
+
+
+class RoutingState:
+    """
+    Состояние маршрутизации для одного HTTP-запроса.
+    """
+    def __init__(self, request):
+        self.request = request
+        self.use_replica = (
+            request.method in SAFE_METHODS
+            and request.path.startswith(settings.REPLICA_PATH_PREFIXES)
+            and PIN_COOKIE not in request.COOKIES
+        )
+        self.pinned = None
+        self.resolving = False
+
+    def is_pinned(self):
+        """
+        Проверяет, писал ли пользователь недавно (лениво, один раз за запрос).
+        """
+        if self.pinned is not None:
+            return self.pinned
+
+        # Пользователь загружается из основной базы, пока идёт проверка.
+        self.resolving = True
+        try:
+            user = getattr(self.request, 'user', None)
+            if user is None or not user.is_authenticated:
+                # JWT-аутентификация DRF могла ещё не выполниться — проверим позже.
+                return False
+            self.pinned = bool(cache.get(pin_cache_key(user.pk)))
+        finally:
+            self.resolving = False
+        return self.pinned
+
+
+def replica_lag(alias):
+    """
+    Отставание реплики в секундах с кэшированием на REPLICA_LAG_CHECK_INTERVAL.
+
+    Для PostgreSQL берётся время последней применённой транзакции,
+    для остальных СУБД отставание считается нулевым. Недоступная реплика
+    получает бесконечное отставание.
+    """
+    checked_at, lag = _replica_lag.get(alias, (0, 0.0))
+    now = time.monotonic()
+    if now - checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+        return lag
+
+    connection = connections[alias]
+    try:
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+                    " WHERE pg_is_in_recovery()"
+                )
+                row = cursor.fetchone()
+                lag = float(row[0]) if row else 0.0
+        else:
+            lag = 0.0
+    except DatabaseError:
+        logger.warning('Реплика %s недоступна', alias, exc_info=True)
+        lag = float('inf')
+
+    _replica_lag[alias] = (now, lag)
+    return lag
+
+
+class ReplicaRouter:
+    """
+    Роутер БД: чтения безопасных API-запросов — на реплики, остальное — в `default`.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or not state.use_replica or state.resolving or state.is_pinned():
+            return DEFAULT_DB_ALIAS
+
+        replicas = [
+            alias for alias in settings.DATABASE_REPLICAS
+            if replica_lag(alias) <= settings.REPLICA_MAX_LAG_SECONDS
+        ]
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и основная база.
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Включает чтение с реплик для безопасных запросов и закрепляет
+    клиента за основной базой после успешной записи.
+
+    Работает и в синхронной, и в асинхронной цепочке middleware: под ASGI
+    состояние маршрутизации передаётся в `sync_to_async` вместе с контекстом.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        token = _request_state.set(RoutingState(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            self.pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = _request_state.set(RoutingState(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            await sync_to_async(self.pin)(request, response)
+        return response
+
+    def pin(self, request, response):
+        """
+        Закрепляет клиента за основной базой на REPLICA_PIN_SECONDS.
+
+        Cookie работает и для анонимных клиентов, ключ в кэше — для
+        авторизованных по JWT клиентов, которые не хранят cookie.
+        """
+        response.set_cookie(
+            PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax'
+        )
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            cache.set(pin_cache_key(user.pk), 1, timeout=settings.REPLICA_PIN_SECONDS)
@@ -0,0 +1,111 @@
+"""
+Фоновое удаление сборов вместе с платежами, лайками и комментариями.
+
+Каскад Django перед удалением загружает в память все связанные объекты,
+и для сбора с сотнями тысяч платежей запрос не укладывается в таймаут.
+Поэтому удаление в два шага:
+
+1. `schedule_collect_deletion` сразу помечает сбор скрытым (`is_hidden`) —
+   он пропадает из API — и после коммита ставит задачу `delete_collect`.
+2. `delete_collect_tree` удаляет дерево снизу вверх пачками по
+   DELETION_BATCH_SIZE строк, каждая пачка — отдельная короткая
+   транзакция. Лайки, комментарии и снимки удаляются одним DELETE без
+   загрузки объектов; платежи к этому моменту уже без зависимых строк,
+   и каскад загружает не больше одной пачки. Кэши сбрасываются один раз
+   в конце.
+"""
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from .cache import invalidate_collects, invalidate_collects_pages
+from .donors import invalidate_donor_totals
+from .models import Collect, CollectSnapshot, Payment, PaymentComment, PaymentLike
+from .snapshots import invalidate_collect_snapshots
+
+logger = logging.getLogger(__name__)
+
+
+def schedule_collect_deletion(collect_id):
+    """
+    Скрывает сбор и ставит удаление его дерева в очередь.
+
+    Повторный вызов для уже скрытого сбора снова ставит задачу — так
+    можно дозапустить удаление, если предыдущая задача упала.
+    """
+    from .tasks import delete_collect
+
+    if Collect.objects.filter(id=collect_id, is_hidden=False).update(is_hidden=True):
+        invalidate_collect_snapshots(collect_id)
+        invalidate_collects(collect_id)
+        invalidate_collects_pages()
+    transaction.on_commit(lambda: delete_collect.delay(collect_id))
+
+
+def delete_in_batches(queryset, batch_size):
+    """
+    Удаляет строки выборки пачками по первичному ключу.
+
+    Каждая пачка удаляется через `QuerySet.delete()`: для моделей без
+    сигналов удаления и зависимых связей Django выполняет один DELETE
+    (fast delete), а каскад в остальных случаях ограничен размером пачки.
+
+    Возвращает:
+        int: Количество удалённых строк самой модели (без каскада).
+    """
+    model = queryset.model
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        _, per_model = model.objects.using(queryset.db).filter(pk__in=ids).delete()
+        deleted += per_model.get(model._meta.label, 0)
+
+
+def delete_collect_tree(collect_id, batch_size=None, progress=None):
+    """
+    Удаляет скрытый сбор и всё, что на него ссылается.
+
+    Аргументы:
+        collect_id (int): ID сбора.
+        batch_size (int): Размер пачки. По умолчанию DELETION_BATCH_SIZE.
+        progress (callable): Вызывается после каждого этапа с именем
+            этапа и словарём удалённых строк по этапам.
+
+    Возвращает:
+        dict: Количество удалённых строк по этапам; пустой, если сбор
+        не найден или не скрыт.
+    """
+    batch_size = batch_size or settings.DELETION_BATCH_SIZE
+    if not Collect.objects.filter(id=collect_id, is_hidden=True).exists():
+        return {}
+
+    donor_ids = set(
+        Payment.objects.filter(collect_id=collect_id, donor__isnull=False)
+        .order_by().values_list('donor_id', flat=True).distinct()
+    )
+    stages = (
+        ('likes', PaymentLike.objects.filter(payment__collect_id=collect_id)),
+        ('comments', PaymentComment.objects.filter(payment__collect_id=collect_id)),
+        ('payments', Payment.objects.filter(collect_id=collect_id)),
+        ('snapshots', CollectSnapshot.objects.filter(collect_id=collect_id)),
+    )
+    deleted = {}
+    for stage, queryset in stages:
+        deleted[stage] = delete_in_batches(queryset, batch_size)
+        if progress is not None:
+            progress(stage, deleted)
+
+    # К этому моменту дерево пустое, и каскад Django удалит только сам сбор
+    # и то, что успело появиться во время удаления.
+    deleted['collect'] = Collect.objects.filter(id=collect_id).delete()[0]
+    if progress is not None:
+        progress('collect', deleted)
+
+    invalidate_collects_pages()
+    for donor_id in donor_ids:
+        invalidate_donor_totals(donor_id)
+    logger.info('Сбор %s удалён: %s', collect_id, deleted)
+    return deleted
@@ -0,0 +1,76 @@
+"""
+Итоги пожертвований пользователя: сколько всего пожертвовано и сколько
+сборов поддержано.
+
+Итоги хранятся в кэше двумя целыми счётчиками (сумма — в копейках), чтобы
+новый платёж мог атомарно увеличить их через `cache.incr` без пересчёта.
+При промахе итоги один раз считаются агрегатом по индексу
+`(donor, created_at)`. Изменение или удаление платежа сбрасывает итоги.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Payment
+from .money import column_to_minor, format_minor, money_sum, to_minor
+
+
+def amount_key(user_id):
+    return f'donor_amount_{user_id}'
+
+
+def collects_key(user_id):
+    return f'donor_collects_{user_id}'
+
+
+def get_donor_totals(user_id):
+    """
+    Итоги пожертвований пользователя.
+
+    Возвращает:
+        dict: donated_amount — сумма всех платежей (строкой, как DecimalField
+        в DRF), collects_supported — число разных сборов с его платежами.
+    """
+    keys = (amount_key(user_id), collects_key(user_id))
+    cached = cache.get_many(keys)
+    if len(cached) == len(keys):
+        cents, collects = cached[keys[0]], cached[keys[1]]
+    else:
+        totals = Payment.objects.filter(donor_id=user_id).aggregate(
+            amount=money_sum('amount'), collects=Count('collect', distinct=True)
+        )
+        cents, collects = column_to_minor(totals['amount'] or 0), totals['collects']
+        cache.set_many(
+            {keys[0]: cents, keys[1]: collects}, timeout=settings.DONOR_TOTALS_CACHE_TIMEOUT
+        )
+    return {
+        'donated_amount': format_minor(cents),
+        'collects_supported': collects,
+    }
+
+
+def record_donation(user_id, amount, new_collect):
+    """
+    Учитывает новый платёж в итогах донора после коммита транзакции.
+
+    Аргументы:
+        user_id (int): Донор.
+        amount (Decimal): Сумма платежа.
+        new_collect (bool): Первый ли это платёж донора в этот сбор.
+    """
+    def apply():
+        try:
+            cache.incr(amount_key(user_id), to_minor(amount))
+            if new_collect:
+                cache.incr(collects_key(user_id))
+        except ValueError:
+            # Итогов нет в кэше (или один счётчик уже вытеснен) — посчитаем при чтении.
+            invalidate_donor_totals(user_id)
+
+    transaction.on_commit(apply)
+
+
+def invalidate_donor_totals(user_id):
+    if user_id is not None:
+        cache.delete_many([amount_key(user_id), collects_key(user_id)])
@@ -0,0 +1,138 @@
+"""
+События сборов в реальном времени через Redis pub/sub.
+
+Синхронный код (ViewSet-ы) публикует небольшие дельта-события после коммита
+транзакции, а ASGI-процесс держит одно подключение к Redis на всех
+подписчиков и раздаёт события их очередям (`CollectEventHub`).
+"""
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = 'collect_events:'
+
+_publisher = None
+
+
+def get_publisher():
+    global _publisher
+    if _publisher is None:
+        _publisher = redis.Redis.from_url(settings.EVENTS_REDIS_URL)
+    return _publisher
+
+
+def publish_collect_events(collect_id, *events):
+    """
+    Публикует события сбора после коммита текущей транзакции.
+
+    Аргументы:
+        collect_id (int): ID сбора.
+        events: Пары (тип события, данные).
+
+    Ошибки Redis логируются и не влияют на запрос.
+    """
+    channel = f'{CHANNEL_PREFIX}{collect_id}'
+    messages = [
+        json.dumps({'event': event, 'data': data}, ensure_ascii=False, default=str)
+        for event, data in events
+    ]
+
+    def publish():
+        try:
+            pipeline = get_publisher().pipeline(transaction=False)
+            for message in messages:
+                pipeline.publish(channel, message)
+            pipeline.execute()
+        except redis.RedisError:
+            logger.warning('Не удалось опубликовать события сбора %s', collect_id, exc_info=True)
+
+    transaction.on_commit(publish)
+
+
+def sse_frame(event, data):
+    """
+    Кадр Server-Sent Events в байтах.
+    """
+    data = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return f'event: {event}\ndata: {data}\n\n'.encode()
+
+
+class CollectEventHub:
+    """
+    Раздаёт события из Redis подписчикам внутри одного ASGI-процесса.
+
+    Одно pub/sub-подключение на процесс (подписка по шаблону на все сборы)
+    и ограниченная очередь на каждого клиента: медленный клиент теряет
+    события, но не тормозит остальных.
+    """
+    queue_size = 100
+
+    def __init__(self):
+        self.subscribers = {}
+        self.reader = None
+
+    @asynccontextmanager
+    async def subscribe(self, collect_id):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.setdefault(collect_id, set()).add(queue)
+        if self.reader is None or self.reader.done():
+            self.reader = asyncio.create_task(self.read())
+        try:
+            yield queue
+        finally:
+            queues = self.subscribers.get(collect_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self.subscribers[collect_id]
+
+    def dispatch(self, channel, message):
+        """
+        Собирает SSE-кадр один раз и кладёт его в очереди подписчиков сбора.
+        """
+        try:
+            collect_id = int(channel.decode().removeprefix(CHANNEL_PREFIX))
+        except ValueError:
+            return
+        queues = self.subscribers.get(collect_id)
+        if not queues:
+            return
+
+        payload = json.loads(message)
+        frame = sse_frame(payload['event'], payload['data'])
+        for queue in queues:
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                pass
+
+    async def read(self):
+        """
+        Читает сообщения из Redis, переподключаясь при ошибках.
+        """
+        while self.subscribers:
+            client = aioredis.from_url(settings.EVENTS_REDIS_URL)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.psubscribe(f'{CHANNEL_PREFIX}*')
+                while self.subscribers:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1)
+                    if message is not None:
+                        self.dispatch(message['channel'], message['data'])
+            except redis.RedisError:
+                logger.warning('Потеряно подключение к Redis pub/sub', exc_info=True)
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+
+
+hub = CollectEventHub()
@@ -0,0 +1,321 @@
+"""
+Быстрые read-only сериализаторы для списков сборов и платежей.
+
+Строят словари напрямую из строк `.values()`, минуя пополевый
+`to_representation` ModelSerializer. Результат совпадает с выводом
+`CollectSerializer` и `PaymentSerializer` для тех же полей.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from .comments import comments_count, latest_comments
+from .images import cover_rendition_urls
+from .models import Collect, Payment, PaymentComment
+from .money import format_minor, money_column
+
+CENT = Decimal('0.01')
+MONEY_FIELDS = ('amount', 'goal_amount', 'collected_amount')
+
+
+def format_decimal(value):
+    """
+    Представление DecimalField(decimal_places=2), как в DRF.
+    """
+    if value is None:
+        return None
+    return f'{value.quantize(CENT):f}'
+
+
+def row_values(values):
+    """
+    Поля для `.values()`: при MONEY_MINOR_UNITS суммы читаются
+    из колонок в копейках (см. `core.money`).
+    """
+    return tuple(money_column(name) if name in MONEY_FIELDS else name for name in values)
+
+
+def format_money(row, name):
+    """
+    Представление суммы `name` из строки, загруженной с `row_values`.
+    """
+    if settings.MONEY_MINOR_UNITS:
+        return format_minor(row[f'{name}_minor'])
+    return format_decimal(row[name])
+
+
+def format_datetime(value, tz):
+    """
+    Представление DateTimeField в формате ISO 8601, как в DRF.
+    """
+    if value is None:
+        return None
+    value = value.astimezone(tz).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def select_fields(serializer, path):
+    """
+    Поля ответа быстрого сериализатора с учётом `context['field_selection']`.
+    """
+    fields = tuple(serializer.field_values)
+    selection = serializer.context.get('field_selection')
+    if selection is None:
+        return fields
+    return selection.output_fields(path, fields, serializer.expandable_fields)
+
+
+def field_columns(serializer, required):
+    """
+    Колонки `.values()` для выбранных полей и обязательных `required`.
+    """
+    columns = dict.fromkeys(required)
+    for name in serializer.fields:
+        columns.update(dict.fromkeys(serializer.field_values[name]))
+    return tuple(columns)
+
+
+class FastPaymentSerializer:
+    """
+    Быстрый сериализатор платежей (поля `PaymentSerializer`).
+
+    Лайки и комментарии считаются в том же запросе, последние
+    комментарии всей страницы загружаются одним дополнительным запросом
+    с оконной функцией (`core.comments`). При выборе
+    полей (`core.field_selection`) загружаются только нужные колонки,
+    агрегат и комментарии.
+    """
+    field_values = {
+        'id': ('id',),
+        'amount': ('amount',),
+        'created_at': ('created_at',),
+        'donor': ('donor_id', 'donor__username', 'donor__first_name', 'donor__last_name'),
+        'likes_count': ('likes_count',),
+        'comments_count': ('comments_count',),
+        'comments': (),
+    }
+    expandable_fields = ('comments',)
+    comment_values = ('id', 'payment_id', 'user_id', 'text', 'created_at')
+
+    def __init__(self, context=None, path=''):
+        self.context = context or {}
+        self.fields = select_fields(self, path)
+        self.values = field_columns(self, ('id', 'collect_id'))
+        self.getters = [(name, getattr(self, f'get_{name}')) for name in self.fields]
+
+    def get_rows(self, queryset):
+        """
+        Превращает queryset платежей в queryset строк `.values()`.
+
+        Meta.ordering не применяется к запросам с GROUP BY,
+        поэтому сортировка задаётся явно.
+        """
+        ordering = queryset.query.order_by or Payment._meta.ordering
+        queryset = queryset.prefetch_related(None)
+        if 'likes_count' in self.fields:
+            queryset = queryset.annotate(likes_count=Count('likes'))
+        if 'comments_count' in self.fields:
+            queryset = queryset.annotate(comments_count=comments_count())
+        return queryset.order_by(*ordering).values(*row_values(self.values))
+
+    def get_comment_rows(self, payment_ids):
+        """
+        Queryset строк последних комментариев для набора платежей.
+        """
+        if 'comments' not in self.fields:
+            return PaymentComment.objects.none()
+        return latest_comments(payment_ids).values(*self.comment_values)
+
+    def get_id(self, row, comments, tz):
+        return row['id']
+
+    def get_amount(self, row, comments, tz):
+        return format_money(row, 'amount')
+
+    def get_created_at(self, row, comments, tz):
+        return format_datetime(row['created_at'], tz)
+
+    def get_donor(self, row, comments, tz):
+        if row['donor_id'] is None:
+            return None
+        return {
+            'id': row['donor_id'],
+            'username': row['donor__username'],
+            'first_name': row['donor__first_name'],
+            'last_name': row['donor__last_name'],
+        }
+
+    def get_likes_count(self, row, comments, tz):
+        return row['likes_count']
+
+    def get_comments_count(self, row, comments, tz):
+        return row['comments_count']
+
+    def get_comments(self, row, comments, tz):
+        return comments.get(row['id'], [])
+
+    def to_representation(self, row, comments, tz):
+        return {name: getter(row, comments, tz) for name, getter in self.getters}
+
+    def build(self, rows, comment_rows):
+        """
+        Собирает представления платежей из уже загруженных строк.
+        """
+        tz = timezone.get_current_timezone()
+        comments = defaultdict(list)
+        for comment in comment_rows:
+            comments[comment['payment_id']].append({
+                'id': comment['id'],
+                'user': comment['user_id'],
+                'text': comment['text'],
+                'created_at': format_datetime(comment['created_at'], tz),
+            })
+        return [self.to_representation(row, comments, tz) for row in rows]
+
+    def serialize(self, rows):
+        """
+        Сериализует строки платежей, догружая их комментарии.
+        """
+        rows = list(rows)
+        comment_rows = self.get_comment_rows([row['id'] for row in rows])
+        return self.build(rows, comment_rows)
+
+
+class FastCollectSerializer:
+    """
+    Быстрый сериализатор сборов (поля `CollectSerializer`).
+
+    Вложенные платежи всей страницы загружаются одним запросом,
+    их последние комментарии — ещё одним.
+    """
+    field_values = {
+        'id': ('id',),
+        'author': ('author_id', 'author__username', 'author__first_name', 'author__last_name'),
+        'title': ('title',),
+        'occasion': ('occasion',),
+        'description': ('description',),
+        'goal_amount': ('goal_amount',),
+        'collected_amount': ('collected_amount',),
+        'donors_count': ('donors_count',),
+        'status': ('status',),
+        'cover_image': ('cover_image',),
+        'cover_renditions': ('cover_renditions',),
+        'end_datetime': ('end_datetime',),
+        'created_at': ('created_at',),
+        'payments': (),
+    }
+    expandable_fields = ('payments',)
+    payment_serializer_class = FastPaymentSerializer
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.fields = select_fields(self, '')
+        self.values = field_columns(self, ('id',))
+        self.getters = [(name, getattr(self, f'get_{name}')) for name in self.fields]
+        self.payment_serializer = self.payment_serializer_class(context=self.context, path='payments')
+        self.cover_storage = Collect._meta.get_field('cover_image').storage
+
+    def get_rows(self, queryset):
+        """
+        Превращает queryset сборов в queryset строк `.values()`.
+        """
+        return queryset.prefetch_related(None).values(*row_values(self.values))
+
+    def get_payment_rows(self, collect_ids):
+        """
+        Queryset строк платежей для набора сборов.
+        """
+        payments = Payment.objects.filter(collect_id__in=collect_ids)
+        if 'payments' not in self.fields:
+            payments = payments.none()
+        return self.payment_serializer.get_rows(payments)
+
+    def get_cover_url(self, name):
+        if not name:
+            return None
+        url = self.cover_storage.url(name)
+        request = self.context.get('request')
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+    def get_id(self, row, payments, tz):
+        return row['id']
+
+    def get_author(self, row, payments, tz):
+        return {
+            'id': row['author_id'],
+            'username': row['author__username'],
+            'first_name': row['author__first_name'],
+            'last_name': row['author__last_name'],
+        }
+
+    def get_title(self, row, payments, tz):
+        return row['title']
+
+    def get_occasion(self, row, payments, tz):
+        return row['occasion']
+
+    def get_description(self, row, payments, tz):
+        return row['description']
+
+    def get_goal_amount(self, row, payments, tz):
+        return format_money(row, 'goal_amount')
+
+    def get_collected_amount(self, row, payments, tz):
+        return format_money(row, 'collected_amount')
+
+    def get_donors_count(self, row, payments, tz):
+        return row['donors_count']
+
+    def get_status(self, row, payments, tz):
+        return row['status']
+
+    def get_cover_image(self, row, payments, tz):
+        return self.get_cover_url(row['cover_image'])
+
+    def get_cover_renditions(self, row, payments, tz):
+        return cover_rendition_urls(
+            row['cover_renditions'], self.context.get('request'), self.cover_storage
+        )
+
+    def get_end_datetime(self, row, payments, tz):
+        return format_datetime(row['end_datetime'], tz)
+
+    def get_created_at(self, row, payments, tz):
+        return format_datetime(row['created_at'], tz)
+
+    def get_payments(self, row, payments, tz):
+        return payments.get(row['id'], [])
+
+    def to_representation(self, row, payments, tz):
+        return {name: getter(row, payments, tz) for name, getter in self.getters}
+
+    def build(self, rows, payment_rows, comment_rows):
+        """
+        Собирает представления сборов из уже загруженных строк.
+        """
+        tz = timezone.get_current_timezone()
+        payment_rows = list(payment_rows)
+        payments = defaultdict(list)
+        for row, payment in zip(
+            payment_rows, self.payment_serializer.build(payment_rows, comment_rows)
+        ):
+            payments[row['collect_id']].append(payment)
+        return [self.to_representation(row, payments, tz) for row in rows]
+
+    def serialize(self, rows):
+        """
+        Сериализует строки сборов, догружая платежи и комментарии.
+        """
+        rows = list(rows)
+        payment_rows = list(self.get_payment_rows([row['id'] for row in rows]))
+        comment_rows = self.payment_serializer.get_comment_rows(
+            [row['id'] for row in payment_rows]
+        )
+        return self.build(rows, payment_rows, comment_rows)
@@ -0,0 +1,149 @@
+"""
+Выбор полей ответа: `?fields=` и `?expand=`.
+
+Без этих параметров ответ прежний — со всеми полями и вложенными данными.
+Если передан хотя бы один из них:
+
+- `fields=id,title,collected_amount` — оставляет только перечисленные
+  поля верхнего уровня (по умолчанию — все, кроме вложенных);
+- `expand=payments,payments.comments` — добавляет вложенные данные;
+  `payments.comments` подразумевает `payments`.
+
+Представления подстраивают queryset под выбор, чтобы не загружать
+невыбранные связи и агрегаты, а кэши учитывают выбор в ключе.
+"""
+from collections import namedtuple
+
+from rest_framework.exceptions import ValidationError
+
+
+class FieldSelection(namedtuple('FieldSelection', ['fields', 'expand'])):
+    """
+    Выбранные поля верхнего уровня (в порядке сериализатора) и пути
+    раскрытых вложенных полей.
+    """
+    __slots__ = ()
+
+    def nested_fields(self, path, expandable):
+        """
+        Вложенные поля из `expandable`, раскрытые на уровне `path`.
+        """
+        prefix = f'{path}.' if path else ''
+        return tuple(name for name in expandable if prefix + name in self.expand)
+
+    def output_fields(self, path, fields, expandable):
+        """
+        Поля ответа на уровне `path`: на верхнем уровне — выбранные,
+        глубже — все невложенные; плюс раскрытые вложенные.
+        """
+        nested = self.nested_fields(path, expandable)
+        return tuple(
+            name for name in fields
+            if name in nested or name not in expandable and (path or name in self.fields)
+        )
+
+    def cache_key(self):
+        return f"fields_{','.join(self.fields)}_expand_{','.join(sorted(self.expand))}"
+
+
+def split_param(value):
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def parse_field_selection(query_params, serializer_class):
+    """
+    Разбирает `?fields=` и `?expand=` для сериализатора с атрибутом
+    `expandable_fields` (пути вложенных полей).
+
+    Возвращает:
+        FieldSelection или None, если параметры не переданы.
+
+    Исключения:
+        ValidationError: Неизвестное поле или путь.
+    """
+    if 'fields' not in query_params and 'expand' not in query_params:
+        return None
+
+    expandable = serializer_class.expandable_fields
+    nested = {path.split('.')[0] for path in expandable}
+    plain = [name for name in serializer_class.Meta.fields if name not in nested]
+
+    fields = plain
+    if 'fields' in query_params:
+        requested = split_param(query_params['fields'])
+        unknown = [name for name in requested if name not in plain]
+        if unknown:
+            raise ValidationError({'fields': (
+                f"Неизвестные поля: {', '.join(unknown)}. Допустимые: {', '.join(plain)}; "
+                f"вложенные данные запрашиваются через expand."
+            )})
+        fields = [name for name in plain if name in requested]
+
+    expand = set()
+    for path in split_param(query_params.get('expand', '')):
+        if path not in expandable:
+            raise ValidationError({'expand': (
+                f"Неизвестный путь '{path}'. Допустимые: {', '.join(expandable)}."
+            )})
+        parts = path.split('.')
+        expand.update('.'.join(parts[:depth]) for depth in range(1, len(parts) + 1))
+
+    return FieldSelection(tuple(fields), frozenset(expand))
+
+
+def trim_representation(data, selection, expandable, path=''):
+    """
+    Оставляет в готовом представлении (например, из кэша) только
+    выбранные поля. Маркеры ошибок (`detail`) не меняются.
+
+    Аргументы:
+        expandable (Iterable[str]): Пути вложенных полей корневого сериализатора.
+    """
+    if 'detail' in data:
+        return data
+    prefix = f'{path}.' if path else ''
+    nested = {
+        name[len(prefix):].split('.')[0] for name in expandable if name.startswith(prefix)
+    }
+    result = {name: data[name] for name in selection.output_fields(path, list(data), nested)}
+    for name in nested.intersection(result):
+        result[name] = [
+            trim_representation(item, selection, expandable, prefix + name) for item in result[name]
+        ]
+    return result
+
+
+def serializer_path(serializer):
+    """
+    Путь сериализатора от корня: '' для корня, 'payments' для платежей
+    внутри сбора.
+    """
+    names = []
+    node = serializer
+    while getattr(node, 'parent', None) is not None:
+        if node.field_name:
+            names.append(node.field_name)
+        node = node.parent
+    return '.'.join(reversed(names))
+
+
+class SelectableFieldsMixin:
+    """
+    Миксин ModelSerializer: оставляет поля по `FieldSelection` из
+    `context['field_selection']`, если он задан.
+
+    Вложенные сериализаторы с этим миксином определяют свой уровень по
+    пути от корня, поэтому раскрытие `payments.comments` работает внутри
+    сбора так же, как `comments` у списка платежей.
+    """
+    expandable_fields = ()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.context.get('field_selection')
+        if selection is None:
+            return fields
+        path = serializer_path(self)
+        expandable = {name.split('.')[0] for name in self.expandable_fields}
+        names = selection.output_fields(path, list(fields), expandable)
+        return {name: fields[name] for name in names}
@@ -0,0 +1,122 @@
+"""
+Идемпотентное создание объектов по заголовку `Idempotency-Key`.
+
+Клиент с нестабильной сетью повторяет POST с тем же ключом. Первый
+успешный ответ после коммита транзакции сохраняется в кэше (Redis) по
+пользователю, пути и ключу на IDEMPOTENCY_KEY_TTL секунд, и повторы
+получают его без обращения к базе и Celery.
+
+Одновременные дубликаты ждут на блокировке, пока первый запрос не
+завершится. Повтор ключа с другим телом запроса отклоняется. Неуспешные
+ответы не сохраняются: исправленный запрос можно повторить с тем же
+ключом.
+"""
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .cache import lock_key, wait_for_value
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def idempotency_cache_key(user_id, path, key):
+    digest = hashlib.sha256(f'{path}\n{key}'.encode()).hexdigest()
+    return f'idempotency:{user_id}:{digest}'
+
+
+def describe_value(value):
+    # Загруженные файлы сравниваются по имени и размеру.
+    return f'{getattr(value, "name", "")}:{getattr(value, "size", "")}'
+
+
+def request_fingerprint(request):
+    """
+    Отпечаток тела запроса: sha256 от данных в каноническом виде.
+    """
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    payload = json.dumps(data, sort_keys=True, default=describe_value)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def release_lock(cache_key, token):
+    if cache.get(lock_key(cache_key)) == token:
+        cache.delete(lock_key(cache_key))
+
+
+def store_response(cache_key, entry, token):
+    """
+    Сохраняет ответ для повторов и снимает блокировку.
+
+    Вызывается после коммита: если транзакция откатится, ответ не
+    сохранится, а блокировка истечёт через IDEMPOTENCY_LOCK_TIMEOUT.
+    """
+    cache.set(cache_key, entry, timeout=settings.IDEMPOTENCY_KEY_TTL)
+    release_lock(cache_key, token)
+
+
+class IdempotentCreateMixin:
+    """
+    Поддержка `Idempotency-Key` для `create` ViewSet-а.
+
+    Без заголовка (и для анонимов) `create` работает как обычно.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None or not request.user.is_authenticated:
+            return super().create(request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise ValidationError({
+                IDEMPOTENCY_HEADER: f'Ожидается непустая строка до {MAX_KEY_LENGTH} символов.'
+            })
+
+        cache_key = idempotency_cache_key(request.user.pk, request.path, key)
+        fingerprint = request_fingerprint(request)
+        entry = cache.get(cache_key)
+        if entry is None:
+            token = uuid.uuid4().hex
+            lock_timeout = settings.IDEMPOTENCY_LOCK_TIMEOUT
+            if not cache.add(lock_key(cache_key), token, timeout=lock_timeout):
+                # Такой же запрос уже выполняется — ждём его ответ.
+                entry = wait_for_value(cache_key, lock_timeout)
+                if entry is None and not cache.add(lock_key(cache_key), token, timeout=lock_timeout):
+                    return Response(
+                        {'detail': f'Запрос с этим {IDEMPOTENCY_HEADER} ещё выполняется.'},
+                        status=status.HTTP_409_CONFLICT,
+                    )
+            if entry is None:
+                stored = False
+                try:
+                    response = super().create(request, *args, **kwargs)
+                    if status.is_success(response.status_code):
+                        entry = {
+                            'fingerprint': fingerprint,
+                            'status': response.status_code,
+                            'data': response.data,
+                        }
+                        # Блокировка держится до коммита, чтобы дубликат не
+                        # выполнил запрос повторно, пока ответа ещё нет в кэше.
+                        transaction.on_commit(lambda: store_response(cache_key, entry, token))
+                        stored = True
+                    return response
+                finally:
+                    if not stored:
+                        release_lock(cache_key, token)
+
+        if entry['fingerprint'] != fingerprint:
+            return Response(
+                {'detail': f'{IDEMPOTENCY_HEADER} уже использован с другим телом запроса.'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        return Response(entry['data'], status=entry['status'], headers={'Idempotent-Replayed': 'true'})
@@ -0,0 +1,119 @@
+"""
+Обработка обложек сборов: варианты разных размеров в WebP и JPEG.
+
+Pillow импортируется только внутри функций обработки, чтобы сериализаторы,
+которым нужны лишь URL вариантов, не тянули его при импорте.
+"""
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from .constants import COVER_RENDITION_FORMATS, COVER_RENDITION_WIDTHS, COVER_RENDITIONS_DIR
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def cover_storage():
+    from .models import Collect
+    return Collect._meta.get_field('cover_image').storage
+
+
+def cover_rendition_urls(renditions, request=None, storage=None):
+    """
+    Преобразует сохранённые пути вариантов обложки в URL.
+
+    Аргументы:
+        renditions (dict): {формат: {ширина: путь в хранилище}}.
+        request (HttpRequest): Если передан, URL будут абсолютными.
+
+    Возвращает:
+        dict: {формат: {ширина: URL}}.
+    """
+    storage = storage or cover_storage()
+    urls = {}
+    for fmt, sizes in renditions.items():
+        urls[fmt] = {}
+        for width, name in sizes.items():
+            url = storage.url(name)
+            urls[fmt][width] = request.build_absolute_uri(url) if request is not None else url
+    return urls
+
+
+def hash_file(file):
+    """
+    Считает sha256 файла потоково, не читая его целиком в память.
+    """
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def open_cover(file, max_width):
+    """
+    Открывает изображение с ограничением по памяти.
+
+    Только JPEG `draft` декодирует сразу в уменьшенном масштабе (DCT scaling).
+    Остальные форматы декодируются целиком, и `reduce` уменьшает уже
+    загруженную картинку, поэтому для них действует более строгий лимит
+    COVER_MAX_DECODED_PIXELS (для JPEG — COVER_MAX_PIXELS).
+    """
+    from PIL import Image, ImageOps
+
+    Image.MAX_IMAGE_PIXELS = settings.COVER_MAX_PIXELS
+    image = Image.open(file)
+    if image.format != 'JPEG' and image.width * image.height > settings.COVER_MAX_DECODED_PIXELS:
+        raise Image.DecompressionBombError(
+            f'Обложка {image.format} {image.width}x{image.height} больше '
+            f'COVER_MAX_DECODED_PIXELS ({settings.COVER_MAX_DECODED_PIXELS}).'
+        )
+    image.draft('RGB', (max_width, max_width))
+    image = ImageOps.exif_transpose(image)
+
+    factor = image.width // max_width
+    if factor > 1:
+        image = image.reduce(factor)
+
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image
+
+
+def build_cover_renditions(file, digest):
+    """
+    Генерирует варианты обложки и сохраняет их под именами с хэшем содержимого.
+
+    Метаданные (EXIF и пр.) в варианты не переносятся. Ширины больше
+    исходной пропускаются (картинка не увеличивается); если исходник уже
+    самой малой ширины, он сохраняется как её вариант. Уже существующие
+    файлы с тем же именем не перезаписываются.
+
+    Возвращает:
+        dict: {формат: {ширина: путь в хранилище}}.
+    """
+    from PIL import Image
+
+    storage = cover_storage()
+    renditions = {fmt: {} for fmt in COVER_RENDITION_FORMATS}
+    image = open_cover(file, max(COVER_RENDITION_WIDTHS))
+
+    widths = [width for width in COVER_RENDITION_WIDTHS if width <= image.width]
+    # Ширины идут по убыванию: каждый следующий вариант уменьшается из предыдущего.
+    for width in sorted(widths or [min(COVER_RENDITION_WIDTHS)], reverse=True):
+        if image.width > width:
+            image = image.resize(
+                (width, max(1, round(image.height * width / image.width))),
+                Image.Resampling.LANCZOS,
+            )
+        for fmt, (pil_format, save_options) in COVER_RENDITION_FORMATS.items():
+            name = f'{COVER_RENDITIONS_DIR}/{digest[:32]}_{width}.{fmt}'
+            if not storage.exists(name):
+                buffer = BytesIO()
+                image.save(buffer, pil_format, **save_options)
+                name = storage.save(name, ContentFile(buffer.getvalue()))
+            renditions[fmt][str(width)] = name
+    return renditions
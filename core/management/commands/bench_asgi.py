@@ -0,0 +1,77 @@
+import asyncio
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность WSGI- и ASGI-эндпоинтов чтения '
+            'при большом числе одновременных клиентов. Серверы должны быть запущены, '
+            'данные — сгенерированы generate_mock_data.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', default='http://127.0.0.1:8000/api/v1')
+        parser.add_argument('--asgi-url', default='http://127.0.0.1:8001/api/v1/async')
+        parser.add_argument('--concurrency', type=int, default=200,
+                            help='Количество одновременных клиентов')
+        parser.add_argument('--requests', type=int, default=2000,
+                            help='Общее количество запросов на сервер')
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Путь относительно базового URL (можно несколько раз)')
+
+    def handle(self, *args, **options):
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            raise CommandError('Для бенчмарка нужен httpx (poetry install --with dev).')
+
+        paths = options['paths'] or ['/collects/', '/collects/1/', '/collects/1/payments/']
+        for name, base_url in (('WSGI', options['wsgi_url']), ('ASGI', options['asgi_url'])):
+            stats = asyncio.run(self.run(
+                base_url, paths, options['concurrency'], options['requests']
+            ))
+            self.report(name, stats)
+
+    async def run(self, base_url, paths, concurrency, total):
+        import httpx
+
+        latencies = []
+        errors = 0
+        counter = iter(range(total))
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+        async def client_loop(client):
+            nonlocal errors
+            for i in counter:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(base_url + paths[i % len(paths)])
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+
+        return {'elapsed': elapsed, 'latencies': sorted(latencies), 'errors': errors}
+
+    def report(self, name, stats):
+        latencies = stats['latencies']
+        if not latencies:
+            self.stdout.write(self.style.WARNING(f'{name}: нет ответов'))
+            return
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{name}: {len(latencies) / stats["elapsed"]:.1f} запр/с, '
+            f'p50={percentile(0.5):.1f}мс p95={percentile(0.95):.1f}мс '
+            f'p99={percentile(0.99):.1f}мс, '
+            f'среднее={statistics.mean(latencies) * 1000:.1f}мс, ошибок: {stats["errors"]}'
+        ))
@@ -0,0 +1,85 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Sum
+from django.test import RequestFactory, override_settings
+
+from core.fast_serializers import FastCollectSerializer, FastPaymentSerializer, format_decimal
+from core.models import Collect, Payment
+from core.money import format_minor, to_minor
+from core.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает хранение денег в Decimal и в копейках (MONEY_MINOR_UNITS): '
+            'агрегацию сумм платежей по сборам, форматирование сумм '
+            'и быстрый путь сериализации списков. Перед замером проверяет, '
+            'что результаты совпадают.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100, help='Сборов/платежей на страницу')
+        parser.add_argument('--iterations', type=int, default=20, help='Количество повторов')
+
+    def handle(self, *args, **options):
+        if Payment.objects.filter(amount_minor__isnull=True).exists():
+            raise CommandError('Колонки в копейках не заполнены — выполните migrate.')
+
+        limit = options['limit']
+        iterations = options['iterations']
+        host = next((h for h in settings.ALLOWED_HOSTS if h and h != '*'), 'localhost')
+        context = {'request': RequestFactory().get('/api/v1/collects/', HTTP_HOST=host)}
+
+        def aggregate(column, to_result):
+            def run():
+                return {
+                    row['collect_id']: (to_result(row['total']), row['count'])
+                    for row in Payment.objects.order_by().values('collect_id').annotate(
+                        total=Sum(column), count=Count('id')
+                    )
+                }
+            return run
+
+        decimal_rows = list(Payment.objects.values_list('amount', flat=True)[:100000])
+        minor_rows = list(Payment.objects.values_list('amount_minor', flat=True)[:100000])
+
+        def render(serializer_class, queryset, minor_units):
+            def run():
+                with override_settings(MONEY_MINOR_UNITS=minor_units):
+                    serializer = serializer_class(context=context)
+                    return ORJSONRenderer().render(
+                        serializer.serialize(serializer.get_rows(queryset.all()))
+                    )
+            return run
+
+        collects = Collect.objects.select_related('author')[:limit]
+        # FastPaymentSerializer задаёт сортировку сам, поэтому страница — по id, а не срезом.
+        payments = Payment.objects.filter(id__in=list(Payment.objects.values_list('id', flat=True)[:limit]))
+        cases = (
+            ('Агрегация сумм платежей по сборам',
+             aggregate('amount', to_minor), aggregate('amount_minor', int), 'запросов'),
+            (f'Форматирование {len(decimal_rows)} сумм',
+             lambda: [format_decimal(value) for value in decimal_rows],
+             lambda: [format_minor(value) for value in minor_rows], 'проходов'),
+            (f'Быстрый путь: {limit} сборов с платежами',
+             render(FastCollectSerializer, collects, False),
+             render(FastCollectSerializer, collects, True), 'страниц'),
+            (f'Быстрый путь: {limit} платежей',
+             render(FastPaymentSerializer, payments, False),
+             render(FastPaymentSerializer, payments, True), 'страниц'),
+        )
+
+        for title, decimal_case, minor_case, unit in cases:
+            if decimal_case() != minor_case():
+                raise CommandError(f'❌ {title}: результаты Decimal и копеек различаются.')
+
+            timings = []
+            for func in (decimal_case, minor_case):
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    func()
+                timings.append(iterations / (time.perf_counter() - started))
+            self.stdout.write(
+                f'{title}: Decimal {timings[0]:.1f} {unit}/с, копейки {timings[1]:.1f} {unit}/с '
+                f'(×{timings[1] / timings[0]:.2f})'
+            )
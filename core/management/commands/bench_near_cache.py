@@ -0,0 +1,66 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django_redis.cache import RedisCache
+
+from core.models import Collect
+from core.near_cache import NearCache
+from core.serializers import CollectSerializer
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает задержку повторного чтения горячей страницы сборов: '
+            'RedisCache против NearCache (локальный LRU перед Redis)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10, help='Сборов на страницу')
+        parser.add_argument('--iterations', type=int, default=2000, help='Количество чтений')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        default = caches['default']
+        if not isinstance(default, RedisCache):
+            raise CommandError('Бенчмарк требует кэш django_redis в CACHES["default"].')
+
+        host = next((h for h in settings.ALLOWED_HOSTS if h and h != '*'), 'localhost')
+        request = RequestFactory().get('/api/v1/collects/', HTTP_HOST=host)
+        queryset = Collect.objects.select_related('author').prefetch_related('payments')
+        data = CollectSerializer(
+            queryset[:options['limit']], many=True, context={'request': request}
+        ).data
+
+        params = {**default._params, 'OPTIONS': dict(default._params.get('OPTIONS', {}))}
+        params['OPTIONS'].pop('NEAR_CACHE', None)
+        redis_cache = RedisCache(default._server, params)
+        near_cache = NearCache(default._server, {
+            **params,
+            'OPTIONS': {**params['OPTIONS'], 'NEAR_CACHE': {'KEY_PREFIXES': ('collects_page_',)}},
+        })
+
+        key = 'collects_page_bench'
+        redis_cache.set(key, data, timeout=60)
+        near_cache.get(key)
+        if not near_cache.subscribed.wait(5):
+            raise CommandError('Не удалось подписаться на канал инвалидаций.')
+
+        for name, backend in (('RedisCache', redis_cache), ('NearCache', near_cache)):
+            backend.get(key)
+            latencies = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                backend.get(key)
+                latencies.append(time.perf_counter() - started)
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2] * 1e6
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6
+            self.stdout.write(f'{name}: p50={p50:.1f} мкс, p99={p99:.1f} мкс')
+
+        stats = near_cache.near_stats()
+        self.stdout.write(
+            f"NearCache: попаданий {stats['hits']}, промахов {stats['misses']}, "
+            f"hit rate {stats['hit_rate']:.1%}, в памяти {stats['bytes']} байт"
+        )
+        redis_cache.delete(key)
@@ -0,0 +1,53 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from core.fast_serializers import FastCollectSerializer
+from core.models import Collect
+from core.renderers import ORJSONRenderer
+from core.serializers import CollectSerializer
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает скорость сериализации списка сборов: '
+            'CollectSerializer + JSONRenderer против быстрого пути + ORJSONRenderer')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10, help='Сборов на страницу')
+        parser.add_argument('--iterations', type=int, default=50, help='Количество повторов')
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        iterations = options['iterations']
+
+        host = next((h for h in settings.ALLOWED_HOSTS if h and h != '*'), 'localhost')
+        request = RequestFactory().get('/api/v1/collects/', HTTP_HOST=host)
+        context = {'request': request}
+        queryset = Collect.objects.select_related('author').prefetch_related('payments')[:limit]
+
+        def standard():
+            data = CollectSerializer(queryset.all(), many=True, context=context).data
+            return JSONRenderer().render(data)
+
+        def fast():
+            fast_serializer = FastCollectSerializer(context=context)
+            data = fast_serializer.serialize(fast_serializer.get_rows(queryset.all()))
+            return ORJSONRenderer().render(data)
+
+        if standard() != fast():
+            raise CommandError('❌ Вывод быстрого пути отличается от CollectSerializer.')
+        self.stdout.write(self.style.SUCCESS('✅ Вывод совпадает побайтно.'))
+
+        for name, func in (('CollectSerializer + JSONRenderer', standard),
+                           ('FastCollectSerializer + ORJSONRenderer', fast)):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{name}: {iterations / elapsed:.1f} страниц/с, '
+                f'{iterations * limit / elapsed:.1f} сборов/с'
+            )
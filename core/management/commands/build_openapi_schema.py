@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.openapi import build_schema_artifact, schema_version
+
+
+class Command(BaseCommand):
+    help = ('Генерирует OpenAPI-схему и сохраняет сжатый артефакт для текущей версии кода. '
+            'Запускается при деплое; без него схема соберётся при первом запросе.')
+
+    def handle(self, *args, **options):
+        path = build_schema_artifact()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Схема версии {schema_version()} сохранена: {path} ({path.stat().st_size} байт)'
+        ))
@@ -0,0 +1,116 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+BUDGET_PATH = Path(settings.BASE_DIR) / 'config' / 'startup_budget.json'
+
+# Что импортирует процесс при старте в каждом профиле.
+PROFILES = {
+    'worker': {
+        'settings': 'config.settings_worker',
+        # Как в docker-compose: системные проверки уже выполнил веб-процесс.
+        'env': {'CELERY_SKIP_CHECKS': '1'},
+        'code': (
+            'import django; django.setup(); '
+            'from config.celery import app; app.loader.import_default_modules()'
+        ),
+    },
+    'web': {
+        'settings': 'config.settings',
+        'code': (
+            'from config.wsgi import application; '
+            'from django.urls import get_resolver; get_resolver().url_patterns'
+        ),
+    },
+}
+
+
+def parse_importtime(stderr):
+    """
+    Разбирает вывод `python -X importtime`.
+
+    Возвращает:
+        tuple: (суммарное время импортов верхнего уровня в мс, множество модулей).
+    """
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|', 2)
+        name = name.rstrip()
+        modules.add(name.strip())
+        # Вложенные импорты сдвинуты на два пробела на каждый уровень.
+        if not name[1:].startswith(' '):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def measure(profile, runs):
+    env = {**os.environ, **profile.get('env', {}), 'DJANGO_SETTINGS_MODULE': profile['settings']}
+    import_times = []
+    wall_times = []
+    modules = set()
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', profile['code']],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        wall_times.append((time.perf_counter() - started) * 1000)
+        if result.returncode != 0:
+            raise CommandError(f'Процесс завершился с ошибкой:\n{result.stderr[-2000:]}')
+        import_ms, modules = parse_importtime(result.stderr)
+        import_times.append(import_ms)
+    return statistics.median(import_times), statistics.median(wall_times), modules
+
+
+class Command(BaseCommand):
+    help = ('Измеряет время импорта при старте воркера и веб-процесса (python -X importtime) '
+            'и сравнивает с бюджетом из config/startup_budget.json. Завершается с ошибкой, '
+            'если бюджет превышен или загружен запрещённый для профиля модуль.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Запусков на профиль (берётся медиана)')
+        parser.add_argument('--profile', choices=sorted(PROFILES), action='append', dest='profiles')
+        parser.add_argument('--update', action='store_true',
+                            help='Записать текущие значения с запасом --headroom в бюджет')
+        parser.add_argument('--headroom', type=float, default=0.5,
+                            help='Запас при --update (0.5 — плюс 50%%)')
+
+    def handle(self, *args, **options):
+        budget = json.loads(BUDGET_PATH.read_text()) if BUDGET_PATH.exists() else {}
+        failures = []
+
+        for name in options['profiles'] or sorted(PROFILES):
+            import_ms, wall_ms, modules = measure(PROFILES[name], options['runs'])
+            limits = budget.setdefault(name, {})
+            self.stdout.write(
+                f'{name}: импорт {import_ms:.0f} мс, старт процесса {wall_ms:.0f} мс, '
+                f'модулей {len(modules)} (бюджет импорта: {limits.get("max_import_ms", "—")} мс)'
+            )
+
+            if options['update']:
+                limits['max_import_ms'] = round(import_ms * (1 + options['headroom']))
+                continue
+
+            if 'max_import_ms' in limits and import_ms > limits['max_import_ms']:
+                failures.append(f'{name}: импорт {import_ms:.0f} мс > {limits["max_import_ms"]} мс')
+            for module in limits.get('forbidden_modules', ()):
+                if module in modules:
+                    failures.append(f'{name}: при старте загружается {module}')
+
+        if options['update']:
+            BUDGET_PATH.write_text(json.dumps(budget, indent=2, ensure_ascii=False) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Бюджет обновлён: {BUDGET_PATH}'))
+            return
+        if failures:
+            raise CommandError('❌ Регрессия времени старта:\n' + '\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('✅ Время старта в пределах бюджета.'))
@@ -0,0 +1,266 @@
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_COLLECTION = Path(settings.BASE_DIR) / 'Postman_Collections' / 'donation_project.postman_collection.json'
+
+# Веса по умолчанию: преобладают чтения, удаления выключены.
+DEFAULT_WEIGHTS = {
+    'GET': 10,
+    'POST': 2,
+    'DELETE': 0,
+}
+
+# Конкретные id из коллекции заменяются на id из пула, набранного во время теста.
+ID_PATTERNS = (
+    (re.compile(r'/collects/\d+'), '/collects/{collect_id}'),
+    (re.compile(r'/payments/\d+'), '/payments/{payment_id}'),
+)
+PAYMENTS_PATH = re.compile(r'/collects/(\d+)/payments/$')
+
+
+def load_requests(path):
+    """
+    Превращает коллекцию Postman в список шаблонов запросов.
+
+    Возвращает:
+        tuple: (базовый URL, шаблоны {name, method, path, data, json, auth}).
+    """
+    collection = json.loads(Path(path).read_text(encoding='utf-8'))
+    collection_auth = (collection.get('auth') or {}).get('type')
+    templates = []
+    base_url = None
+
+    def walk(items, inherited_auth):
+        nonlocal base_url
+        for item in items:
+            auth = (item.get('auth') or {}).get('type', inherited_auth)
+            if 'item' in item:
+                walk(item['item'], auth)
+                continue
+            request = item['request']
+            url = request['url'] if isinstance(request['url'], str) else request['url']['raw']
+            parts = urlsplit(url)
+            base_url = base_url or f'{parts.scheme}://{parts.netloc}'
+            path = parts.path if parts.path.endswith('/') else parts.path + '/'
+            for pattern, replacement in ID_PATTERNS:
+                path = pattern.sub(replacement, path)
+
+            body = request.get('body') or {}
+            data = json_body = None
+            if body.get('mode') == 'raw' and body.get('raw', '').strip():
+                json_body = json.loads(body['raw'])
+            elif body.get('mode') in ('formdata', 'urlencoded'):
+                # Файлы из коллекции ссылаются на локальные пути автора — пропускаем их.
+                data = {
+                    field['key'].strip(): field.get('value', '')
+                    for field in body[body['mode']]
+                    if field.get('type', 'text') == 'text' and not field.get('disabled')
+                }
+            templates.append({
+                'name': item['name'],
+                'method': request['method'],
+                'path': path,
+                'data': data or None,
+                'json': json_body,
+                'auth': (request.get('auth') or {}).get('type', auth),
+            })
+
+    walk(collection['item'], collection_auth)
+    return base_url, templates
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный тест по коллекции Postman: каждый виртуальный пользователь '
+            'регистрируется, получает JWT и выполняет запросы коллекции '
+            'в случайном порядке согласно весам. Сервер должен быть запущен, данные — '
+            'сгенерированы generate_mock_data. Для большого числа пользователей '
+            'поднимите лимиты THROTTLE_* на сервере.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--collection', default=str(DEFAULT_COLLECTION))
+        parser.add_argument('--base-url', default=None,
+                            help='Базовый URL сервера (по умолчанию — из коллекции)')
+        parser.add_argument('--users', type=int, default=50,
+                            help='Количество одновременных виртуальных пользователей')
+        parser.add_argument('--duration', type=float, default=60, help='Длительность теста, секунды')
+        parser.add_argument('--weight', action='append', default=[], metavar='ИМЯ=ВЕС',
+                            help='Вес запроса коллекции по имени (можно несколько раз)')
+        parser.add_argument('--user-prefix', default='loadtest',
+                            help='Префикс имён пользователей; существующие пользователи переиспользуются')
+        parser.add_argument('--password', default='Loadtest-Pa55')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            raise CommandError('Для нагрузочного теста нужен httpx (poetry install --with dev).')
+
+        base_url, templates = load_requests(options['collection'])
+        base_url = (options['base_url'] or base_url).rstrip('/')
+
+        weights = {}
+        for item in options['weight']:
+            name, _, weight = item.rpartition('=')
+            try:
+                weights[name] = float(weight)
+            except ValueError:
+                raise CommandError(f'Некорректный вес: {item}')
+        unknown = set(weights) - {t['name'] for t in templates}
+        if unknown:
+            raise CommandError(f'В коллекции нет запросов: {", ".join(sorted(unknown))}')
+
+        auth_names = {self.find(templates, '/register/')['name'], self.find(templates, '/login/')['name']}
+        scenario = [
+            (template, weights.get(template['name'], DEFAULT_WEIGHTS.get(template['method'], 1)))
+            for template in templates if template['name'] not in auth_names
+        ]
+        scenario = [(template, weight) for template, weight in scenario if weight > 0]
+        if not scenario:
+            raise CommandError('Все запросы сценария имеют нулевой вес.')
+
+        self.stdout.write('Сценарий: ' + ', '.join(f"{t['name']}={w:g}" for t, w in scenario))
+        random.seed(options['seed'])
+        stats = asyncio.run(self.run(base_url, templates, scenario, options))
+        self.report(stats)
+
+    @staticmethod
+    def find(templates, suffix):
+        for template in templates:
+            if template['path'].endswith(suffix):
+                return template
+        raise CommandError(f'В коллекции нет запроса {suffix}')
+
+    async def run(self, base_url, templates, scenario, options):
+        import httpx
+
+        register = self.find(templates, '/register/')
+        login = self.find(templates, '/login/')
+        stats = defaultdict(lambda: {'latencies': [], 'errors': 0, 'statuses': defaultdict(int)})
+        pools = {'collects': [], 'payments': []}
+        deadline = None
+        run_id = uuid.uuid4().hex[:6]
+
+        async def send(client, template, path, token=None, **kwargs):
+            headers = {'Authorization': f'Bearer {token}'} if token and template['auth'] != 'noauth' else {}
+            started = time.perf_counter()
+            try:
+                response = await client.request(template['method'], base_url + path, headers=headers, **kwargs)
+                status = response.status_code
+            except httpx.HTTPError:
+                response, status = None, 'error'
+            entry = stats[template['name']]
+            entry['latencies'].append(time.perf_counter() - started)
+            entry['statuses'][status] += 1
+            if status == 'error' or status >= 400:
+                entry['errors'] += 1
+            return response
+
+        async def authenticate(client, number):
+            username = f"{options['user_prefix']}_{number}"
+            credentials = {'username': username, 'password': options['password']}
+            # Пользователь мог остаться от прошлого запуска — тогда регистрация вернёт 400.
+            await send(client, register, register['path'], json={
+                **(register['json'] or {}), **credentials,
+                'password2': options['password'],
+                'email': f'{username}_{run_id}@loadtest.local',
+            })
+            response = await send(client, login, login['path'], json=credentials)
+            if response is None or response.status_code != 200:
+                return None
+            return response.json()['access']
+
+        def fill(template):
+            values = {}
+            if '{collect_id}' in template['path'] or '{payment_id}' in template['path']:
+                if '{payment_id}' in template['path']:
+                    if not pools['payments']:
+                        return None
+                    values['collect_id'], values['payment_id'] = random.choice(pools['payments'])
+                else:
+                    if not pools['collects']:
+                        return None
+                    values['collect_id'] = random.choice(pools['collects'])
+            return template['path'].format(**values)
+
+        def request_kwargs(template):
+            data = dict(template['data'] or {})
+            if template['path'].endswith('/collects/') and template['method'] == 'POST':
+                # Дата завершения из коллекции уже в прошлом.
+                end = datetime.now(timezone.utc) + timedelta(days=30)
+                data['end_datetime'] = end.isoformat()
+            if template['json'] is not None:
+                return {'json': template['json']}
+            return {'data': data} if data else {}
+
+        def remember(template, path, response):
+            if response is None or response.status_code != 201 or template['method'] != 'POST':
+                return
+            body = response.json()
+            if path.endswith('/collects/'):
+                pools['collects'].append(body['id'])
+            elif match := PAYMENTS_PATH.search(path):
+                pools['payments'].append((int(match.group(1)), body['id']))
+
+        async def virtual_user(client, number):
+            token = await authenticate(client, number)
+            if token is None:
+                return
+            templates_, weights_ = zip(*scenario)
+            while time.perf_counter() < deadline:
+                template = random.choices(templates_, weights_)[0]
+                path = fill(template)
+                if path is None:
+                    continue
+                response = await send(client, template, path, token, **request_kwargs(template))
+                if response is not None and response.status_code == 401:
+                    token = await authenticate(client, number) or token
+                remember(template, path, response)
+
+        limits = httpx.Limits(max_connections=options['users'], max_keepalive_connections=options['users'])
+        async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+            # Пул существующих сборов и платежей для запросов с id в пути.
+            response = await client.get(f'{base_url}/api/v1/collects/', params={'limit': 100})
+            if response.status_code != 200:
+                raise CommandError(f'Сервер недоступен: {base_url} ответил {response.status_code}')
+            for collect in response.json()['results']:
+                pools['collects'].append(collect['id'])
+                pools['payments'].extend((collect['id'], payment['id']) for payment in collect['payments'])
+
+            started = time.perf_counter()
+            deadline = started + options['duration']
+            await asyncio.gather(*(virtual_user(client, number) for number in range(options['users'])))
+            elapsed = time.perf_counter() - started
+
+        return {'elapsed': elapsed, 'endpoints': stats}
+
+    def report(self, stats):
+        elapsed = stats['elapsed']
+        total = sum(len(entry['latencies']) for entry in stats['endpoints'].values())
+        self.stdout.write(f'Всего запросов: {total} за {elapsed:.1f}с ({total / elapsed:.1f} запр/с)')
+        for name, entry in sorted(stats['endpoints'].items()):
+            latencies = sorted(entry['latencies'])
+
+            def percentile(p):
+                return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+            statuses = ', '.join(f'{status}: {count}' for status, count in sorted(
+                entry['statuses'].items(), key=lambda item: str(item[0])
+            ))
+            style = self.style.SUCCESS if not entry['errors'] else self.style.WARNING
+            self.stdout.write(style(
+                f'{name}: {len(latencies)} запр., {len(latencies) / elapsed:.1f} запр/с, '
+                f'p50={percentile(0.5):.1f}мс p95={percentile(0.95):.1f}мс p99={percentile(0.99):.1f}мс, '
+                f'ошибок {entry["errors"] / len(latencies):.1%} ({statuses})'
+            ))
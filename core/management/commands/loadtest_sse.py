@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.events import CHANNEL_PREFIX, get_publisher
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный тест SSE-потока сбора: открывает N одновременных подписок '
+            'на ASGI-сервере, публикует события и измеряет задержку доставки. '
+            'Для 10k подписчиков поднимите лимит файлов: ulimit -n 65536.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8001/api/v1/async',
+                            help='Базовый URL ASGI-сервера')
+        parser.add_argument('--collect-id', type=int, default=1)
+        parser.add_argument('--clients', type=int, default=10000)
+        parser.add_argument('--events', type=int, default=10,
+                            help='Сколько событий опубликовать после подключения всех клиентов')
+        parser.add_argument('--connect-timeout', type=float, default=120)
+
+    def handle(self, *args, **options):
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            raise CommandError('Для нагрузочного теста нужен httpx (poetry install --with dev).')
+        asyncio.run(self.run(options))
+
+    async def run(self, options):
+        import httpx
+
+        url = f"{options['url']}/collects/{options['collect_id']}/events/"
+        clients = options['clients']
+        total_events = options['events']
+        connected = asyncio.Event()
+        done = asyncio.Event()
+        state = {'connected': 0, 'failed': 0, 'delivered': 0}
+        latencies = []
+
+        async def subscriber(client):
+            try:
+                async with client.stream('GET', url) as response:
+                    response.raise_for_status()
+                    state['connected'] += 1
+                    if state['connected'] + state['failed'] == clients:
+                        connected.set()
+                    received = 0
+                    async for line in response.aiter_lines():
+                        if line.startswith('data: {"sent_at"'):
+                            sent_at = float(line[len('data: {"sent_at":'):-1])
+                            latencies.append(time.time() - sent_at)
+                            state['delivered'] += 1
+                            received += 1
+                            if received == total_events:
+                                return
+            except httpx.HTTPError:
+                state['failed'] += 1
+                if state['connected'] + state['failed'] == clients:
+                    connected.set()
+
+        limits = httpx.Limits(max_connections=clients, max_keepalive_connections=0)
+        timeout = httpx.Timeout(None, connect=options['connect_timeout'])
+        async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+            started = time.perf_counter()
+            tasks = [asyncio.create_task(subscriber(client)) for _ in range(clients)]
+            try:
+                await asyncio.wait_for(connected.wait(), options['connect_timeout'])
+            except asyncio.TimeoutError:
+                pass
+            self.stdout.write(
+                f"Подключено: {state['connected']} из {clients}, ошибок: {state['failed']}, "
+                f"за {time.perf_counter() - started:.1f}с"
+            )
+
+            channel = f"{CHANNEL_PREFIX}{options['collect_id']}"
+            publisher = get_publisher()
+            for _ in range(total_events):
+                publisher.publish(channel, f'{{"event": "ping", "data": {{"sent_at": {time.time()}}}}}')
+                await asyncio.sleep(0.5)
+
+            await asyncio.wait(tasks, timeout=30)
+            for task in tasks:
+                task.cancel()
+
+        expected = state['connected'] * total_events
+        latencies.sort()
+        if latencies:
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+            self.stdout.write(f'Задержка доставки: p50={p50:.1f}мс p99={p99:.1f}мс')
+        style = self.style.SUCCESS if state['delivered'] == expected and not state['failed'] else self.style.ERROR
+        self.stdout.write(style(f"Доставлено событий: {state['delivered']} из {expected}"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from core.reconcile import reconcile_collect_totals
+
+
+class Command(BaseCommand):
+    help = ('Сверяет collected_amount и donors_count сборов с платежами и исправляет '
+            'расхождения. Продолжает с сохранённого водяного знака, если не задан --start-id.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=None, help='Размер окна по id')
+        parser.add_argument('--max-chunks', type=int, default=None,
+                            help='Сколько окон обработать (по умолчанию — до конца таблицы)')
+        parser.add_argument('--start-id', type=int, default=None, help='Начать с этого id')
+        parser.add_argument('--dry-run', action='store_true', help='Только показать расхождения')
+
+    def handle(self, *args, **options):
+        result = reconcile_collect_totals(
+            chunk_size=options['chunk_size'],
+            max_chunks=options['max_chunks'],
+            start_id=options['start_id'],
+            dry_run=options['dry_run'],
+        )
+        action = 'Найдено' if options['dry_run'] else 'Исправлено'
+        self.stdout.write(f"{action} расхождений: {len(result['drifted'])}")
+        if result['drifted'] and options['verbosity'] > 1:
+            self.stdout.write(f"ID сборов: {result['drifted']}")
+        if result['finished']:
+            self.stdout.write(self.style.SUCCESS('✅ Проверены все сборы.'))
+        else:
+            self.stdout.write(f"Проверено до id {result['checked_up_to']}, следующий запуск продолжит с него.")
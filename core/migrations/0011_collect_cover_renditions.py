@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_alter_paymentcomment_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collect',
+            name='cover_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='Хэш обложки'),
+        ),
+        migrations.AddField(
+            model_name='collect',
+            name='cover_renditions',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Варианты обложки'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_collect_cover_renditions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, verbose_name='Ключ')),
+                ('body', models.BinaryField(verbose_name='Тело ответа (gzip)')),
+                ('etag', models.CharField(max_length=64, verbose_name='ETag')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+            ],
+            options={
+                'verbose_name': 'снимок сбора',
+                'verbose_name_plural': 'Снимки сборов',
+            },
+        ),
+        migrations.AddField(
+            model_name='collect',
+            name='finalized_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата заморозки'),
+        ),
+        migrations.AddIndex(
+            model_name='collect',
+            index=models.Index(condition=models.Q(('finalized_at__isnull', True)), fields=['end_datetime'], name='collect_unfinalized_end_idx'),
+        ),
+        migrations.AddField(
+            model_name='collectsnapshot',
+            name='collect',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='core.collect', verbose_name='Сбор'),
+        ),
+        migrations.AddConstraint(
+            model_name='collectsnapshot',
+            constraint=models.UniqueConstraint(fields=('collect', 'key'), name='unique_collect_snapshot'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_claims_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['donor', '-created_at', '-id'], name='payment_donor_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_payment_donor_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collect',
+            name='is_hidden',
+            field=models.BooleanField(default=False, verbose_name='Скрыт (удаляется)'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:53
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def fill_status(apps, schema_editor):
+    """
+    Проставляет статус существующим сборам двумя UPDATE вместо обхода строк.
+    """
+    Collect = apps.get_model('core', 'Collect')
+    Collect.objects.filter(end_datetime__lte=timezone.now()).update(status='ended')
+    Collect.objects.filter(
+        status='active', goal_amount__isnull=False, collected_amount__gte=F('goal_amount')
+    ).update(status='goal_reached')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_collect_is_hidden'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collect',
+            name='status',
+            field=models.CharField(choices=[('active', 'Идёт'), ('goal_reached', 'Цель достигнута'), ('ended', 'Завершён')], default='active', max_length=16, verbose_name='Статус'),
+        ),
+        migrations.RunPython(fill_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='collect',
+            index=models.Index(condition=models.Q(('status__in', ('active', 'goal_reached'))), fields=['end_datetime'], name='collect_open_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collect',
+            index=models.Index(fields=['status', '-created_at'], name='collect_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_collect_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='Дата')),
+                ('donations_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Сумма платежей')),
+                ('donations_count', models.IntegerField(default=0, verbose_name='Количество платежей')),
+                ('new_collects', models.IntegerField(default=0, verbose_name='Новых сборов')),
+                ('new_users', models.IntegerField(default=0, verbose_name='Новых пользователей')),
+            ],
+            options={
+                'verbose_name': 'статистика за день',
+                'verbose_name_plural': 'Статистика по дням',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='OccasionStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occasion', models.CharField(choices=[('birthday', 'День рождения'), ('wedding', 'Свадьба'), ('new_year', 'Новый год'), ('other', 'Другое')], max_length=50, unique=True, verbose_name='Повод')),
+                ('collects_count', models.IntegerField(default=0, verbose_name='Количество сборов')),
+                ('active_collects', models.IntegerField(default=0, verbose_name='Незавершённых сборов')),
+                ('donations_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Сумма платежей')),
+                ('donations_count', models.IntegerField(default=0, verbose_name='Количество платежей')),
+            ],
+            options={
+                'verbose_name': 'статистика по поводу',
+                'verbose_name_plural': 'Статистика по поводам',
+                'ordering': ['occasion'],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:57
+
+import core.money
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_stats_tables'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collect',
+            name='collected_amount_minor',
+            field=core.money.MinorUnitsField(editable=False, null=True, source='collected_amount', verbose_name='Собранная сумма, коп.'),
+        ),
+        migrations.AddField(
+            model_name='collect',
+            name='goal_amount_minor',
+            field=core.money.MinorUnitsField(editable=False, null=True, source='goal_amount', verbose_name='Целевая сумма, коп.'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='amount_minor',
+            field=core.money.MinorUnitsField(editable=False, null=True, source='amount', verbose_name='Сумма, коп.'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations, models
+from django.db.models import F, Max
+from django.db.models.functions import Cast
+
+BATCH_SIZE = 10000
+
+# Модель → пары (десятичное поле, колонка в копейках).
+MONEY_COLUMNS = {
+    'Payment': (('amount', 'amount_minor'),),
+    'Collect': (('goal_amount', 'goal_amount_minor'), ('collected_amount', 'collected_amount_minor')),
+}
+
+
+def backfill(apps, schema_editor):
+    """
+    Заполняет колонки в копейках окнами по id.
+
+    Миграция не атомарная: каждое окно — отдельный короткий UPDATE, поэтому
+    таблицы не блокируются целиком, а работающий код тем временем уже
+    заполняет колонки сам (MinorUnitsField.pre_save). Повторный запуск
+    безопасен: обновляются только строки с незаполненными колонками.
+    """
+    for model_name, columns in MONEY_COLUMNS.items():
+        model = apps.get_model('core', model_name)
+        max_id = model.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        for start in range(0, max_id + 1, BATCH_SIZE):
+            window = model.objects.filter(id__gte=start, id__lt=start + BATCH_SIZE)
+            for source, target in columns:
+                window.filter(**{f'{target}__isnull': True, f'{source}__isnull': False}).update(
+                    **{target: Cast(F(source) * 100, models.BigIntegerField())}
+                )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('core', '0018_money_minor'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
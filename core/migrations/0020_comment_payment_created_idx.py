@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_money_minor_backfill'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='paymentcomment',
+            index=models.Index(fields=['payment', '-created_at', '-id'], name='comment_payment_created_idx'),
+        ),
+    ]
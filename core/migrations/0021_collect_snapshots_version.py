@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_comment_payment_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collect',
+            name='snapshots_version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Версия данных для снимков'),
+        ),
+    ]
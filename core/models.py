@@ -1,10 +1,22 @@
 import uuid
 
-from django.db import models
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, models
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.utils import timezone
 
 from core.constants import SHORT_LINK_MAX_LENGTH
+from core.money import MinorUnitsField
+
+
+class CollectQuerySet(models.QuerySet):
+    def visible(self):
+        """
+        Сборы, не помеченные на удаление (см. `core.deletion`).
+        """
+        return self.filter(is_hidden=False)
 
 
 class Collect(models.Model):
@@ -21,6 +33,17 @@ class Collect(models.Model):
         ('other', 'Другое'),
     ]
 
+    STATUS_ACTIVE = 'active'
+    STATUS_GOAL_REACHED = 'goal_reached'
+    STATUS_ENDED = 'ended'
+    STATUS_CHOICES = [
+        (STATUS_ACTIVE, 'Идёт'),
+        (STATUS_GOAL_REACHED, 'Цель достигнута'),
+        (STATUS_ENDED, 'Завершён'),
+    ]
+    # Статусы сборов, которые ещё принимают платежи и ждут завершения.
+    OPEN_STATUSES = (STATUS_ACTIVE, STATUS_GOAL_REACHED)
+
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -52,6 +75,14 @@ class Collect(models.Model):
         default=0,
         verbose_name='Собранная сумма'
     )
+    goal_amount_minor = MinorUnitsField(
+        source='goal_amount',
+        verbose_name='Целевая сумма, коп.'
+    )
+    collected_amount_minor = MinorUnitsField(
+        source='collected_amount',
+        verbose_name='Собранная сумма, коп.'
+    )
     donors_count = models.PositiveIntegerField(
         default=0,
         verbose_name='Количество доноров'
@@ -62,6 +93,17 @@ class Collect(models.Model):
         blank=True,
         verbose_name='Обложка'
     )
+    cover_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        verbose_name='Хэш обложки'
+    )
+    cover_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Варианты обложки'
+    )
     end_datetime = models.DateTimeField(
         verbose_name='Дата завершения сбора'
     )
@@ -75,6 +117,27 @@ class Collect(models.Model):
         unique=True,
         null=True,
     )
+    finalized_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата заморозки'
+    )
+    snapshots_version = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Версия данных для снимков'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=STATUS_ACTIVE,
+        verbose_name='Статус'
+    )
+    is_hidden = models.BooleanField(
+        default=False,
+        verbose_name='Скрыт (удаляется)'
+    )
+
+    objects = CollectQuerySet.as_manager()
 
     def __str__(self):
         return self.title
@@ -83,6 +146,30 @@ class Collect(models.Model):
         verbose_name = 'сбор'
         verbose_name_plural = 'Сборы'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['end_datetime'],
+                condition=models.Q(finalized_at__isnull=True),
+                name='collect_unfinalized_end_idx'
+            ),
+            # Незавершённые сборы по дате окончания — для `expire_collects`.
+            models.Index(
+                fields=['end_datetime'],
+                condition=models.Q(status__in=('active', 'goal_reached')),
+                name='collect_open_end_idx'
+            ),
+            models.Index(fields=['status', '-created_at'], name='collect_status_created_idx'),
+        ]
+
+    def current_status(self, now=None):
+        """
+        Статус, вычисленный по дате окончания и собранной сумме.
+        """
+        if self.end_datetime <= (now or timezone.now()):
+            return self.STATUS_ENDED
+        if self.goal_amount is not None and self.collected_amount >= self.goal_amount:
+            return self.STATUS_GOAL_REACHED
+        return self.STATUS_ACTIVE
 
     def generate_unique_short_url(self):
         """
@@ -131,6 +218,10 @@ class Payment(models.Model):
         decimal_places=2,
         verbose_name='Сумма'
     )
+    amount_minor = MinorUnitsField(
+        source='amount',
+        verbose_name='Сумма, коп.'
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Дата платежа'
@@ -139,10 +230,26 @@ class Payment(models.Model):
     def __str__(self):
         return f'{self.amount} by {self.donor}'
 
+    @property
+    def latest_comments(self):
+        """
+        Последние COMMENTS_PREVIEW_SIZE комментариев, новые первыми.
+
+        Для страницы платежей загружаются заранее одним запросом
+        (`core.comments.preview_prefetch`), иначе — отдельным запросом.
+        """
+        if hasattr(self, 'prefetched_latest_comments'):
+            return self.prefetched_latest_comments
+        return list(self.comments.order_by('-created_at', '-id')[:settings.COMMENTS_PREVIEW_SIZE])
+
     class Meta:
         verbose_name = 'платеж'
         verbose_name_plural = 'Платежи'
         ordering = ['-created_at']
+        indexes = [
+            # Платежи пользователя от новых к старым (/me/payments/).
+            models.Index(fields=['donor', '-created_at', '-id'], name='payment_donor_created_idx'),
+        ]
 
 
 class PaymentInteractionBase(models.Model):
@@ -188,5 +295,182 @@ class PaymentComment(PaymentInteractionBase):
         constraints = [
             models.UniqueConstraint(fields=['payment', 'user'], name='unique_comment')
         ]
+        indexes = [
+            # Последние комментарии платежа и их число (core.comments).
+            models.Index(fields=['payment', '-created_at', '-id'], name='comment_payment_created_idx'),
+        ]
         verbose_name = 'комментарий на платеж'
         verbose_name_plural = 'Комментарии на платежи'
+
+
+class CollectSnapshot(models.Model):
+    """
+    Замороженный снимок ответа API для завершённого сбора.
+
+    Хранит готовый JSON (в gzip) детальной страницы сбора или одной страницы
+    его платежей, чтобы отдавать его без запросов к основным таблицам.
+    """
+    collect = models.ForeignKey(
+        Collect,
+        on_delete=models.CASCADE,
+        related_name='snapshots',
+        verbose_name='Сбор'
+    )
+    key = models.CharField(
+        max_length=64,
+        verbose_name='Ключ'
+    )
+    body = models.BinaryField(
+        verbose_name='Тело ответа (gzip)'
+    )
+    etag = models.CharField(
+        max_length=64,
+        verbose_name='ETag'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+
+    def __str__(self):
+        return f'{self.collect_id}:{self.key}'
+
+    class Meta:
+        verbose_name = 'снимок сбора'
+        verbose_name_plural = 'Снимки сборов'
+        constraints = [
+            models.UniqueConstraint(fields=['collect', 'key'], name='unique_collect_snapshot')
+        ]
+
+
+class DailyStats(models.Model):
+    """
+    Итоги платформы за день (см. `core.stats`).
+
+    Обновляются инкрементально при платежах, создании сборов и регистрации
+    пользователей и пересчитываются целиком раз в сутки.
+    """
+    date = models.DateField(
+        unique=True,
+        verbose_name='Дата'
+    )
+    donations_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='Сумма платежей'
+    )
+    donations_count = models.IntegerField(
+        default=0,
+        verbose_name='Количество платежей'
+    )
+    new_collects = models.IntegerField(
+        default=0,
+        verbose_name='Новых сборов'
+    )
+    new_users = models.IntegerField(
+        default=0,
+        verbose_name='Новых пользователей'
+    )
+
+    def __str__(self):
+        return str(self.date)
+
+    class Meta:
+        verbose_name = 'статистика за день'
+        verbose_name_plural = 'Статистика по дням'
+        ordering = ['-date']
+
+
+class OccasionStats(models.Model):
+    """
+    Итоги платформы по поводу сбора (см. `core.stats`).
+    """
+    occasion = models.CharField(
+        max_length=50,
+        choices=Collect.OCCASION_CHOICES,
+        unique=True,
+        verbose_name='Повод'
+    )
+    collects_count = models.IntegerField(
+        default=0,
+        verbose_name='Количество сборов'
+    )
+    active_collects = models.IntegerField(
+        default=0,
+        verbose_name='Незавершённых сборов'
+    )
+    donations_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='Сумма платежей'
+    )
+    donations_count = models.IntegerField(
+        default=0,
+        verbose_name='Количество платежей'
+    )
+
+    def __str__(self):
+        return self.occasion
+
+    class Meta:
+        verbose_name = 'статистика по поводу'
+        verbose_name_plural = 'Статистика по поводам'
+        ordering = ['occasion']
+
+
+class ClaimsUser(User):
+    """
+    Пользователь, восстановленный из claims access-токена без запроса к БД.
+
+    Заполнены только поля из токена (id, username, is_staff), остальные
+    отложены. При первом обращении к любому отложенному полю загружаются
+    сразу все поля пользователя — из кэша (на JWT_USER_CACHE_TIMEOUT секунд)
+    или из БД. Секретные поля (`uncached_fields`) в кэш не попадают и
+    читаются из БД отдельно, только когда к ним обращаются.
+    """
+    claim_fields = ('id', 'username', 'is_staff')
+    uncached_fields = ('password',)
+
+    class Meta:
+        proxy = True
+        verbose_name = 'пользователь из токена'
+        verbose_name_plural = 'Пользователи из токенов'
+
+    @classmethod
+    def from_claims(cls, claims):
+        """
+        Создаёт пользователя из словаря claims без обращения к БД.
+        """
+        fields = [field for field in cls._meta.concrete_fields if field.attname in cls.claim_fields]
+        return cls.from_db(
+            DEFAULT_DB_ALIAS,
+            [field.attname for field in fields],
+            [field.to_python(claims[field.attname]) for field in fields],
+        )
+
+    @staticmethod
+    def cache_key(user_id):
+        return f"user_row_{user_id}"
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # Ленивая загрузка срабатывает только при обращении к отложенному полю.
+        deferred = self.get_deferred_fields()
+        if fields is None or using is not None or from_queryset is not None \
+                or not set(fields) <= deferred or set(fields) & set(self.uncached_fields):
+            return super().refresh_from_db(using, fields, from_queryset)
+
+        cache_key = self.cache_key(self.pk)
+        row = cache.get(cache_key)
+        if row is None:
+            row = User.objects.filter(pk=self.pk).values(
+                *(field.attname for field in self._meta.concrete_fields
+                  if field.attname not in self.uncached_fields)
+            ).first()
+            if row is None:
+                raise User.DoesNotExist('Пользователь из токена не найден.')
+            cache.set(cache_key, row, timeout=settings.JWT_USER_CACHE_TIMEOUT)
+
+        for attname in deferred - set(self.uncached_fields):
+            setattr(self, attname, row[attname])
@@ -0,0 +1,103 @@
+"""
+Денежные суммы в копейках (minor units).
+
+Суммы платежей и сборов хранятся как DecimalField(12, 2), а рядом — в
+целочисленных колонках `<поле>_minor` (`MinorUnitsField`), которые
+вычисляются из десятичного значения при каждом сохранении модели. При
+включённой настройке MONEY_MINOR_UNITS горячие пути — быстрые
+сериализаторы, выгрузка, агрегаты — читают и суммируют целые копейки
+вместо `Decimal`, а API по-прежнему отдаёт те же строки вида "100.00".
+
+Включать настройку можно только после миграции, заполняющей колонки
+для существующих строк (`0019_money_minor_backfill`).
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Sum
+
+MINOR_PER_UNIT = 100
+
+
+def to_minor(value):
+    """
+    Decimal (или число) с двумя знаками после запятой → целые копейки.
+    """
+    if value is None:
+        return None
+    if isinstance(value, float):
+        value = str(value)
+    return int(Decimal(value).quantize(Decimal('0.01')) * MINOR_PER_UNIT)
+
+
+def from_minor(value):
+    if value is None:
+        return None
+    return Decimal(value) / MINOR_PER_UNIT
+
+
+def format_minor(value):
+    """
+    Копейки → строка, как DecimalField(decimal_places=2) в DRF, без Decimal.
+    """
+    if value is None:
+        return None
+    if value < 0:
+        return '-' + format_minor(-value)
+    # Срез строки дешевле divmod и форматирования двух чисел.
+    digits = str(value).rjust(3, '0')
+    return f'{digits[:-2]}.{digits[-2:]}'
+
+
+def money_column(name):
+    """
+    Колонка, из которой читать сумму `name` при текущей настройке.
+    """
+    return f'{name}_minor' if settings.MONEY_MINOR_UNITS else name
+
+
+def money_sum(name):
+    """
+    Sum по сумме `name`: по целым копейкам при MONEY_MINOR_UNITS.
+    """
+    return Sum(money_column(name))
+
+
+def column_to_decimal(value):
+    """
+    Значение из колонки `money_column` (или `money_sum`) → Decimal.
+    """
+    return from_minor(value) if settings.MONEY_MINOR_UNITS else value
+
+
+def column_to_minor(value):
+    """
+    Значение из колонки `money_column` (или `money_sum`) → копейки.
+    """
+    return value if settings.MONEY_MINOR_UNITS else to_minor(value)
+
+
+class MinorUnitsField(models.BigIntegerField):
+    """
+    Сумма в копейках, производная от десятичного поля `source`.
+
+    Значение пересчитывается из `source` при каждом `save()` и
+    `bulk_create()`; массовые `update()` должны обновлять обе колонки.
+    """
+
+    def __init__(self, source, *args, **kwargs):
+        self.source = source
+        kwargs.setdefault('null', True)
+        kwargs.setdefault('editable', False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = to_minor(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
@@ -0,0 +1,282 @@
+"""
+Двухуровневый кэш: LRU в памяти процесса перед `django_redis`.
+
+Горячие ключи (по префиксам из настроек) после первого чтения из Redis
+хранятся в памяти процесса, и следующие чтения обходятся без сетевого
+запроса. Любая запись или удаление такого ключа публикуется
+в канал Redis pub/sub, и остальные процессы выбрасывают его локальную копию.
+
+Настройка в CACHES:
+
+    "BACKEND": "core.near_cache.NearCache",
+    "OPTIONS": {
+        "NEAR_CACHE": {
+            "KEY_PREFIXES": ("collects_page_",),
+            "MAX_BYTES": 32 * 1024 * 1024,
+            "TIMEOUT": 60,
+        },
+        ...
+    }
+
+Локальный уровень хранит сырые байты из Redis и распаковывает их при каждом
+чтении, поэтому вызывающий код, как и с обычным кэшем, получает свою копию
+значения и может её изменять.
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis.cache import RedisCache
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+CLEAR_ALL = '*'
+
+
+class LocalLRU:
+    """
+    LRU-словарь, ограниченный суммарным размером значений в байтах.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[2] < time.monotonic():
+                if entry is not None:
+                    self._pop(key)
+                self.stats['misses'] += 1
+                return MISSING
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[0]
+
+    def put(self, key, value, size, timeout, generation):
+        """
+        Кладёт значение, если с момента `generation` не было инвалидаций:
+        иначе прочитанное из Redis значение могло уже устареть.
+        """
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if generation != self.generation:
+                return
+            self._pop(key)
+            self.entries[key] = (value, size, time.monotonic() + timeout)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._pop(next(iter(self.entries)))
+                self.stats['evictions'] += 1
+
+    def discard(self, key):
+        with self.lock:
+            self.generation += 1
+            self.stats['invalidations'] += 1
+            self._pop(key)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+            self.size = 0
+
+    def _pop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+
+class NearCache(RedisCache):
+    """
+    RedisCache с локальным LRU-уровнем для ключей с заданными префиксами.
+
+    Локальный уровень включается только когда процесс подписан на канал
+    инвалидаций; при потере подписки он очищается и отключается до
+    переподключения. После fork (воркеры gunicorn/celery) локальные данные
+    и поток подписки создаются заново.
+    """
+
+    def __init__(self, server, params):
+        params = dict(params)
+        options = dict(params.get('OPTIONS', {}))
+        near_options = options.pop('NEAR_CACHE', {})
+        params['OPTIONS'] = options
+        super().__init__(server, params)
+
+        self.near_prefixes = tuple(near_options.get('KEY_PREFIXES', ()))
+        self.near_max_bytes = near_options.get('MAX_BYTES', 32 * 1024 * 1024)
+        self.near_timeout = near_options.get('TIMEOUT', 60)
+        self.near_channel = near_options.get('CHANNEL', 'near_cache_invalidation')
+        self.origin = uuid.uuid4().hex
+        self.pid = None
+        self.local = None
+        self.subscribed = threading.Event()
+
+    def is_near(self, key):
+        return bool(self.near_prefixes) and str(key).startswith(self.near_prefixes)
+
+    def get_local(self):
+        """
+        Локальный уровень текущего процесса; запускает подписку при первом обращении.
+        """
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.local = LocalLRU(self.near_max_bytes)
+            self.subscribed = threading.Event()
+            threading.Thread(target=self.listen, daemon=True, name='near-cache').start()
+        return self.local
+
+    def listen(self):
+        """
+        Принимает инвалидации других процессов, переподключаясь при ошибках.
+        """
+        local = self.local
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.client.get_client(write=True).pubsub()
+                pubsub.subscribe(self.near_channel)
+                for message in pubsub.listen():
+                    if message['type'] == 'subscribe':
+                        local.clear()
+                        self.subscribed.set()
+                    elif message['type'] == 'message':
+                        origin, _, key = message['data'].decode().partition(':')
+                        if origin == self.origin:
+                            continue
+                        if key == CLEAR_ALL:
+                            local.clear()
+                        else:
+                            local.discard(key)
+            except RedisError:
+                logger.warning('Потеряна подписка на инвалидации near-cache', exc_info=True)
+            self.subscribed.clear()
+            local.clear()
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except RedisError:
+                    pass
+            time.sleep(1)
+
+    def invalidate_local(self, keys, version=None):
+        """
+        Удаляет ключи из локального уровня и сообщает об этом другим процессам.
+        """
+        full_keys = [self.make_key(key, version=version) for key in keys if self.is_near(key)]
+        if not full_keys:
+            return
+        local = self.get_local()
+        for full_key in full_keys:
+            local.discard(full_key)
+        try:
+            pipeline = self.client.get_client(write=True).pipeline(transaction=False)
+            for full_key in full_keys:
+                pipeline.publish(self.near_channel, f'{self.origin}:{full_key}')
+            pipeline.execute()
+        except RedisError:
+            logger.warning('Не удалось разослать инвалидацию near-cache', exc_info=True)
+
+    def clear_local(self):
+        if self.local is None:
+            return
+        self.get_local().clear()
+        try:
+            self.client.get_client(write=True).publish(self.near_channel, f'{self.origin}:{CLEAR_ALL}')
+        except RedisError:
+            logger.warning('Не удалось разослать инвалидацию near-cache', exc_info=True)
+
+    def near_stats(self):
+        """
+        Статистика локального уровня текущего процесса.
+        """
+        local = self.get_local()
+        with local.lock:
+            stats = dict(local.stats, entries=len(local.entries), bytes=local.size)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def get(self, key, default=None, version=None, client=None):
+        if client is not None or not self.is_near(key):
+            return super().get(key, default, version, client)
+
+        local = self.get_local()
+        if not self.subscribed.is_set():
+            return super().get(key, default, version, client)
+
+        full_key = self.make_key(key, version=version)
+        raw = local.get(full_key)
+        if raw is not MISSING:
+            return self.client.decode(raw)
+
+        generation = local.generation
+        try:
+            raw = self.client.get_client(write=False).get(full_key)
+        except RedisError:
+            # Ошибку обработает RedisCache (с учётом IGNORE_EXCEPTIONS).
+            return super().get(key, default, version, client)
+        if raw is None:
+            return default
+        local.put(full_key, raw, len(raw), self.near_timeout, generation)
+        return self.client.decode(raw)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, *args, **kwargs):
+        result = super().set(key, value, timeout, version, *args, **kwargs)
+        self.invalidate_local([key], version)
+        return result
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, *args, **kwargs):
+        result = super().add(key, value, timeout, version, *args, **kwargs)
+        if result:
+            self.invalidate_local([key], version)
+        return result
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, *args, **kwargs):
+        result = super().set_many(data, timeout, version, *args, **kwargs)
+        self.invalidate_local(list(data), version)
+        return result
+
+    def delete(self, key, version=None, *args, **kwargs):
+        result = super().delete(key, version, *args, **kwargs)
+        self.invalidate_local([key], version)
+        return result
+
+    def delete_many(self, keys, version=None, *args, **kwargs):
+        keys = list(keys)
+        result = super().delete_many(keys, version, *args, **kwargs)
+        self.invalidate_local(keys, version)
+        return result
+
+    def incr(self, key, delta=1, version=None, *args, **kwargs):
+        result = super().incr(key, delta, version, *args, **kwargs)
+        self.invalidate_local([key], version)
+        return result
+
+    def decr(self, key, delta=1, version=None, *args, **kwargs):
+        result = super().decr(key, delta, version, *args, **kwargs)
+        self.invalidate_local([key], version)
+        return result
+
+    def delete_pattern(self, *args, **kwargs):
+        result = super().delete_pattern(*args, **kwargs)
+        self.clear_local()
+        return result
+
+    def clear(self):
+        result = super().clear()
+        self.clear_local()
+        return result
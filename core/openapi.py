@@ -0,0 +1,121 @@
+"""
+Заранее собранная OpenAPI-схема API.
+
+Схема генерируется один раз на версию кода — командой
+`build_openapi_schema` при деплое или при первом запросе — и хранится
+файлом `openapi-<версия>.json.gz` в OPENAPI_SCHEMA_DIR. Запросы отдают
+готовые сжатые байты с ETag без интроспекции ViewSet-ов и сериализаторов.
+"""
+import gzip
+import hashlib
+import os
+import tempfile
+from functools import cache
+from pathlib import Path
+
+from django.conf import settings
+
+from .snapshots import compressed_response
+
+SOURCE_DIRS = ('config', 'core')
+# Права на файл артефакта
+ARTIFACT_MODE = 0o644
+
+
+@cache
+def schema_version():
+    """
+    Версия кода: APP_VERSION из окружения или хэш исходников проекта.
+    """
+    if settings.APP_VERSION:
+        return settings.APP_VERSION
+    digest = hashlib.sha256()
+    for directory in SOURCE_DIRS:
+        for path in sorted((Path(settings.BASE_DIR) / directory).rglob('*.py')):
+            digest.update(str(path.relative_to(settings.BASE_DIR)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def schema_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(title="Donation API", default_version='v1')
+
+
+def generate_schema():
+    """
+    Генерирует схему drf_yasg для всех эндпоинтов и возвращает JSON в байтах.
+    """
+    from drf_yasg.codecs import OpenAPICodecJson
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    schema = OpenAPISchemaGenerator(schema_info()).get_schema(request=None, public=True)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def artifact_path(version):
+    return Path(settings.OPENAPI_SCHEMA_DIR) / f'openapi-{version}.json.gz'
+
+
+def build_schema_artifact(version=None):
+    """
+    Генерирует схему и атомарно записывает сжатый артефакт.
+
+    Возвращает:
+        Path: Путь к артефакту.
+    """
+    path = artifact_path(version or schema_version())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    body = gzip.compress(generate_schema(), mtime=0)
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+        file.write(body)
+    # NamedTemporaryFile создаёт файл с правами 0600, а артефакт читают
+    # веб-сервер и другие пользователи.
+    os.chmod(file.name, ARTIFACT_MODE)
+    os.replace(file.name, path)
+    return path
+
+
+@cache
+def load_schema_artifact(version):
+    """
+    Сжатое тело схемы и его ETag; при отсутствии артефакт собирается.
+    """
+    path = artifact_path(version)
+    if not path.exists():
+        build_schema_artifact(version)
+    body = path.read_bytes()
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
+
+def openapi_schema(request):
+    """
+    Готовая OpenAPI-схема (JSON).
+    """
+    body, etag = load_schema_artifact(schema_version())
+    return compressed_response(request, body, etag, settings.OPENAPI_SCHEMA_MAX_AGE)
+
+
+def swagger_ui(request):
+    """
+    Swagger UI, загружающий схему из `openapi_schema`.
+
+    Страница рендерится без генерации схемы: рендереру drf_yasg передаётся
+    пустая схема только с заголовком, а адрес спецификации берётся из
+    SWAGGER_SETTINGS['SPEC_URL']. Старые клиенты, запрашивающие
+    `?format=openapi`, получают готовую схему.
+    """
+    from django.http import HttpResponse
+    from drf_yasg import openapi
+    from drf_yasg.renderers import SwaggerUIRenderer
+
+    if request.GET.get('format') == 'openapi':
+        return openapi_schema(request)
+
+    info = schema_info()
+    swagger = openapi.Swagger(
+        info=info, _prefix='/', _version=info._default_version, paths=openapi.Paths(paths={})
+    )
+    html = SwaggerUIRenderer().render(swagger, renderer_context={'request': request})
+    return HttpResponse(html, content_type='text/html; charset=utf-8')
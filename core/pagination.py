@@ -1,8 +1,20 @@
 from django.conf import settings
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 
 class Pagination(PageNumberPagination):
     page_size = settings.PAGE_SIZE  # Значение по умолчанию
     page_size_query_param = 'limit'
     max_page_size = 100
+
+
+class CreatedCursorPagination(CursorPagination):
+    """
+    Keyset-пагинация от новых записей к старым: страница выбирается
+    условием по `created_at` вместо OFFSET, поэтому глубокие страницы
+    не дороже первой.
+    """
+    page_size = settings.PAGE_SIZE
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
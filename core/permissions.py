@@ -30,6 +30,11 @@ class IsDonatorOfCollect(BasePermission):
         if not user.is_authenticated:
             return False
 
+        # Представления с вложенными маршрутами уже знают сбор и запоминают проверку
+        is_collect_donor = getattr(view, 'is_collect_donor', None)
+        if is_collect_donor is not None:
+            return is_collect_donor(user)
+
         # Получаем сбор, связанный с этим платежом
         collect = obj.payment.collect
         return collect.payments.filter(donor=user).exists()
@@ -0,0 +1,20 @@
+"""
+Общие выражения для аннотаций queryset-ов.
+"""
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(model):
+    """
+    Число строк `model`, ссылающихся на платёж, подзапросом.
+
+    В отличие от Count по связи, не умножает строки при нескольких
+    таких аннотациях в одном запросе.
+    """
+    return Coalesce(Subquery(
+        model.objects.filter(payment=OuterRef('pk')).order_by().values('payment').annotate(
+            count=Count('*')
+        ).values('count'),
+        output_field=IntegerField(),
+    ), 0)
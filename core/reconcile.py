@@ -0,0 +1,128 @@
+"""
+Сверка агрегатов сборов (`collected_amount`, `donors_count`) с платежами.
+
+Сборы обходятся окнами по id. На окно — один сгруппированный по сбору
+запрос к платежам и один запрос к самим сборам; расхождения ищутся в
+Python. Расходящиеся сборы блокируются, их суммы пересчитываются
+под блокировкой и записываются одним `bulk_update`. Каждое окно —
+отдельная короткая транзакция, поэтому таблицы не блокируются надолго.
+Прогресс сохраняется в кэше (водяной знак — последний обработанный id),
+и обход продолжается с него.
+"""
+import logging
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+
+from .cache import invalidate_collects, invalidate_collects_pages
+from .models import Collect, Payment
+from .snapshots import invalidate_collect_snapshots
+from .status import status_for_amount
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_CACHE_KEY = 'reconcile_collect_totals_watermark'
+TOTALS_FIELDS = ('collected_amount', 'collected_amount_minor', 'donors_count')
+# Агрегаты сбора без платежей
+NO_PAYMENTS = (Decimal(0), 0, 0)
+
+
+def real_totals(**filters):
+    """
+    Фактические агрегаты сборов по их платежам одним запросом.
+
+    Аргументы:
+        filters: Условия на платежи, например `collect_id__in=[...]`.
+
+    Возвращает:
+        dict: id сбора → (сумма, сумма в копейках, число платежей); сборов
+        без платежей в словаре нет.
+    """
+    rows = Payment.objects.filter(**filters).order_by().values('collect_id').annotate(
+        amount=Sum('amount'), amount_minor=Sum('amount_minor'), count=Count('*'),
+    ).values_list('collect_id', 'amount', 'amount_minor', 'count')
+    return {collect_id: tuple(totals) for collect_id, *totals in rows}
+
+
+def fix_totals(collect_ids):
+    """
+    Записывает сборам `collect_ids` фактические агрегаты.
+
+    Строки сборов блокируются, а агрегаты пересчитываются под блокировкой,
+    поэтому платёж, созданный между сверкой и исправлением, не потеряется.
+    """
+    with transaction.atomic():
+        collects = list(Collect.objects.select_for_update().filter(id__in=collect_ids).only('id'))
+        totals = real_totals(collect_id__in=collect_ids)
+        for collect in collects:
+            amount, amount_minor, count = totals.get(collect.id, NO_PAYMENTS)
+            collect.collected_amount = amount
+            collect.collected_amount_minor = amount_minor
+            collect.donors_count = count
+            collect.status = status_for_amount(amount)
+        Collect.objects.bulk_update(collects, [*TOTALS_FIELDS, 'status'])
+
+
+def reconcile_window(start_id, stop_id, dry_run=False):
+    """
+    Сверяет сборы с id в [start_id, stop_id) и исправляет расхождения.
+
+    Возвращает:
+        list: ID сборов, агрегаты которых расходились с платежами.
+    """
+    totals = real_totals(collect_id__gte=start_id, collect_id__lt=stop_id)
+    stored = Collect.objects.filter(id__gte=start_id, id__lt=stop_id).order_by().values_list(
+        'id', *TOTALS_FIELDS
+    )
+    drifted_ids = [
+        collect_id for collect_id, *values in stored
+        if tuple(values) != totals.get(collect_id, NO_PAYMENTS)
+    ]
+    if drifted_ids and not dry_run:
+        fix_totals(drifted_ids)
+        for collect_id in drifted_ids:
+            invalidate_collect_snapshots(collect_id)
+        invalidate_collects(*drifted_ids)
+        invalidate_collects_pages()
+    return drifted_ids
+
+
+def reconcile_collect_totals(chunk_size=None, max_chunks=None, start_id=None, dry_run=False):
+    """
+    Обходит сборы окнами по id, начиная с водяного знака (или `start_id`).
+
+    Аргументы:
+        chunk_size (int): Размер окна по id. По умолчанию RECONCILE_CHUNK_SIZE.
+        max_chunks (int): Сколько окон обработать за вызов; None — до конца.
+        start_id (int): Начать с этого id вместо сохранённого водяного знака.
+        dry_run (bool): Только найти расхождения, не исправляя их.
+
+    Возвращает:
+        dict: checked_up_to — последний обработанный id, drifted — найденные
+        расхождения, finished — дошёл ли обход до конца таблицы.
+    """
+    chunk_size = chunk_size or settings.RECONCILE_CHUNK_SIZE
+    watermark = start_id - 1 if start_id is not None else cache.get(WATERMARK_CACHE_KEY, 0)
+    max_id = Collect.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+
+    drifted = []
+    chunks = 0
+    while watermark < max_id and (max_chunks is None or chunks < max_chunks):
+        stop_id = watermark + 1 + chunk_size
+        window_drifted = reconcile_window(watermark + 1, stop_id, dry_run=dry_run)
+        if window_drifted:
+            logger.info('Расхождения агрегатов в сборах %s', window_drifted)
+        drifted.extend(window_drifted)
+        watermark = stop_id - 1
+        chunks += 1
+        if not dry_run:
+            cache.set(WATERMARK_CACHE_KEY, watermark, timeout=None)
+
+    finished = watermark >= max_id
+    if finished and not dry_run:
+        # Следующий обход начнётся сначала.
+        cache.delete(WATERMARK_CACHE_KEY)
+    return {'checked_up_to': min(watermark, max_id), 'drifted': drifted, 'finished': finished}
@@ -1,9 +1,42 @@
 from datetime import timezone, datetime
 
+from django.conf import settings
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
-from .models import Collect, Payment, PaymentLike, PaymentComment
+from .authentication import is_token_revoked
+from .field_selection import SelectableFieldsMixin
+from .images import cover_rendition_urls
+from .money import format_minor
+from .models import Collect, DailyStats, OccasionStats, Payment, PaymentLike, PaymentComment
+
+
+class MoneyField(serializers.DecimalField):
+    """
+    Денежная сумма (DecimalField(12, 2)).
+
+    При MONEY_MINOR_UNITS значение для ответа берётся из колонки в копейках
+    `<поле>_minor` и форматируется без Decimal (см. `core.money`); запись
+    по-прежнему идёт через десятичное поле модели.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(max_digits=12, decimal_places=2, **kwargs)
+
+    def get_attribute(self, instance):
+        if settings.MONEY_MINOR_UNITS:
+            minor = getattr(instance, f'{self.source}_minor', None)
+            if minor is not None:
+                return minor
+        return super().get_attribute(instance)
+
+    def to_representation(self, value):
+        if isinstance(value, int):
+            return format_minor(value)
+        return super().to_representation(value)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -58,48 +91,104 @@ class PaymentCommentSerializer(serializers.ModelSerializer):
         user = self.context['request'].user
         payment = self.context['view'].get_payment()
 
-        if PaymentComment.objects.filter(user=user, payment=payment).exists():
+        comments = PaymentComment.objects.filter(user=user, payment=payment)
+        if self.instance is not None:
+            comments = comments.exclude(pk=self.instance.pk)
+        if comments.exists():
             raise serializers.ValidationError("Вы уже оставили комментарий к этому платежу.")
         return attrs
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для отображения информации о платеже.
 
-    Включает количество лайков и список комментариев.
+    Включает количество лайков и комментариев и последние
+    COMMENTS_PREVIEW_SIZE комментариев (при выборе полей — только
+    с `expand=comments`); полная лента — на маршруте `/comments/`.
     """
+    expandable_fields = ('comments',)
+    amount = MoneyField()
     donor = UserSerializer(read_only=True)
     likes_count = serializers.SerializerMethodField()
-    comments = PaymentCommentSerializer(many=True, read_only=True)
+    comments_count = serializers.SerializerMethodField()
+    comments = PaymentCommentSerializer(many=True, read_only=True, source='latest_comments')
 
     class Meta:
         model = Payment
-        fields = ['id', 'amount', 'created_at', 'donor', 'likes_count', 'comments']
+        fields = ['id', 'amount', 'created_at', 'donor', 'likes_count', 'comments_count', 'comments']
 
     def get_likes_count(self, obj):
         """
-        Возвращает количество лайков для данного платежа.
+        Возвращает количество лайков для данного платежа
+        (из аннотации queryset, если она есть).
         """
+        if hasattr(obj, 'likes_count'):
+            return obj.likes_count
         return obj.likes.count()
 
+    def get_comments_count(self, obj):
+        """
+        Возвращает количество комментариев к платежу
+        (из аннотации queryset, если она есть).
+        """
+        if hasattr(obj, 'comments_count'):
+            return obj.comments_count
+        return obj.comments.count()
+
+
+class CollectSummarySerializer(serializers.ModelSerializer):
+    """
+    Краткое представление сбора для вложения в другие ответы.
+    """
+    goal_amount = MoneyField(read_only=True)
+    collected_amount = MoneyField(read_only=True)
+
+    class Meta:
+        model = Collect
+        fields = ['id', 'title', 'occasion', 'goal_amount', 'collected_amount', 'status', 'end_datetime']
+
+
+class MyPaymentSerializer(serializers.ModelSerializer):
+    """
+    Платёж текущего пользователя с краткими данными сбора.
+    """
+    amount = MoneyField(read_only=True)
+    collect = CollectSummarySerializer(read_only=True)
+
+    class Meta:
+        model = Payment
+        fields = ['id', 'amount', 'created_at', 'collect']
+
 
-class CollectSerializer(serializers.ModelSerializer):
+class CollectSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     """
     Сериализатор для создания и отображения сборов.
 
     Проверяет положительность сумм и то, что дата окончания не в прошлом.
+    Платежи при выборе полей выводятся только с `expand=payments`.
     """
+    expandable_fields = ('payments', 'payments.comments')
     author = UserSerializer(read_only=True)
+    goal_amount = MoneyField(required=False, allow_null=True)
+    collected_amount = MoneyField(required=False)
     payments = PaymentSerializer(many=True, read_only=True)
+    cover_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Collect
         fields = [
             'id', 'author', 'title', 'occasion', 'description',
-            'goal_amount', 'collected_amount', 'donors_count',
-            'cover_image', 'end_datetime', 'created_at', 'payments'
+            'goal_amount', 'collected_amount', 'donors_count', 'status',
+            'cover_image', 'cover_renditions', 'end_datetime', 'created_at', 'payments'
         ]
+        read_only_fields = ['status']
+
+    def get_cover_renditions(self, obj):
+        """
+        Возвращает URL обработанных вариантов обложки по форматам и ширинам.
+        """
+        return cover_rendition_urls(obj.cover_renditions, self.context.get('request'))
 
     def validate(self, data):
         """
@@ -121,6 +210,18 @@ class CollectSerializer(serializers.ModelSerializer):
         return data
 
 
+class DailyStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailyStats
+        fields = ['date', 'donations_amount', 'donations_count', 'new_collects', 'new_users']
+
+
+class OccasionStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OccasionStats
+        fields = ['occasion', 'collects_count', 'active_collects', 'donations_amount', 'donations_count']
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     """
     Сериализатор для регистрации нового пользователя.
@@ -158,3 +259,38 @@ class RegisterSerializer(serializers.ModelSerializer):
         validated_data.pop('password2')
         user = User.objects.create_user(**validated_data)
         return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Выдаёт токены с полями пользователя, нужными API (username, is_staff).
+
+    По ним `core.authentication.StatelessJWTAuthentication` восстанавливает
+    пользователя без запроса к БД.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['username'] = user.username
+        token['is_staff'] = user.is_staff
+        return token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Обновление токенов с проверкой deny-list: отозванный refresh-токен
+    не может выпустить новый access-токен.
+    """
+
+    def validate(self, attrs):
+        if is_token_revoked(RefreshToken(attrs['refresh'])):
+            raise InvalidToken({'detail': 'Токен отозван.', 'code': 'token_revoked'})
+        return super().validate(attrs)
+
+
+class LogoutSerializer(serializers.Serializer):
+    """
+    Необязательный refresh-токен, который нужно отозвать вместе с access-токеном.
+    """
+    refresh = serializers.CharField(required=False)
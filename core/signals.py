@@ -0,0 +1,57 @@
+"""
+Сигналы моделей приложения.
+
+Access-токены проверяются без запроса пользователя из БД
+(`core.authentication.StatelessJWTAuthentication`), поэтому при
+деактивации пользователя, смене пароля или полей из claims все его
+выпущенные токены отзываются явно, а строка пользователя в кэше
+(`ClaimsUser`) сбрасывается при каждом сохранении.
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .authentication import revoke_user_tokens
+from .models import ClaimsUser
+
+# Поля, изменение которых делает выпущенные токены недействительными
+TOKEN_FIELDS = ('password', 'is_active', 'username', 'is_staff')
+
+
+def credentials_changed(previous, user):
+    if previous['is_active'] and not user.is_active:
+        return True
+    return any(previous[name] != getattr(user, name) for name in ('password', 'username', 'is_staff'))
+
+
+@receiver(pre_save, sender=User, dispatch_uid='core.revoke_tokens_on_credentials_change')
+@receiver(pre_save, sender=ClaimsUser, dispatch_uid='core.revoke_claims_user_tokens_on_credentials_change')
+def revoke_tokens_on_credentials_change(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    Отзывает токены пользователя после коммита, если при сохранении
+    сменился пароль, username или is_staff либо пользователь деактивирован.
+    """
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not set(TOKEN_FIELDS) & set(update_fields):
+        # Например, обновление last_login при входе.
+        return
+    previous = User.objects.filter(pk=instance.pk).values(*TOKEN_FIELDS).first()
+    if previous is not None and credentials_changed(previous, instance):
+        user_id = instance.pk
+        transaction.on_commit(lambda: revoke_user_tokens(user_id))
+
+
+@receiver(post_save, sender=User, dispatch_uid='core.drop_cached_user_row')
+@receiver(post_save, sender=ClaimsUser, dispatch_uid='core.drop_cached_claims_user_row')
+def drop_cached_user_row(sender, instance, **kwargs):
+    cache.delete(ClaimsUser.cache_key(instance.pk))
+
+
+@receiver(post_delete, sender=User, dispatch_uid='core.revoke_tokens_on_delete')
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    user_id = instance.pk
+    cache.delete(ClaimsUser.cache_key(user_id))
+    transaction.on_commit(lambda: revoke_user_tokens(user_id))
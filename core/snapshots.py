@@ -0,0 +1,207 @@
+"""
+Замороженные снимки ответов API для завершённых сборов.
+
+После `end_datetime` платежи и суммы сбора практически не меняются, поэтому
+детальная страница сбора и страницы его платежей рендерятся один раз
+(задача `finalize_ended_collects`) и дальше отдаются готовыми байтами.
+Любая запись, затрагивающая сбор, удаляет его снимки.
+"""
+import gzip
+import hashlib
+import math
+from itertools import islice
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, prefetch_related_objects
+from django.http import HttpResponse, HttpResponseNotModified
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .models import Collect, CollectSnapshot, Payment
+from .pagination import Pagination
+from .renderers import ORJSONRenderer
+
+DETAIL_KEY = 'detail'
+# Порядок платежей в списке; `id` делает его однозначным для keyset-пагинации
+PAYMENTS_ORDERING = ('-created_at', '-id')
+# Сколько снимков сохраняется одним INSERT
+SNAPSHOT_WRITE_BATCH_SIZE = 50
+
+
+def payments_key(page):
+    return f'payments:{page}'
+
+
+def snapshot_request(path):
+    """
+    Запрос-заглушка для рендера: абсолютные ссылки строятся от SITE_URL.
+    """
+    url = urlsplit(settings.SITE_URL)
+    return Request(RequestFactory().get(
+        path, secure=url.scheme == 'https', HTTP_HOST=url.netloc
+    ))
+
+
+def make_snapshot(collect, key, data):
+    body = ORJSONRenderer().render(data)
+    return CollectSnapshot(
+        collect=collect,
+        key=key,
+        body=gzip.compress(body),
+        etag=hashlib.sha256(body).hexdigest()[:32],
+    )
+
+
+def page_links(url, page, num_pages):
+    """
+    Ссылки `next` и `previous` страницы, как у `PageNumberPagination`.
+    """
+    next_link = replace_query_param(url, 'page', page + 1) if page < num_pages else None
+    if page == 1:
+        previous_link = None
+    elif page == 2:
+        previous_link = remove_query_param(url, 'page')
+    else:
+        previous_link = replace_query_param(url, 'page', page - 1)
+    return next_link, previous_link
+
+
+def render_collect_snapshots(collect):
+    """
+    Рендерит детальную страницу сбора и по очереди все страницы его платежей.
+
+    Платежи читаются keyset-пагинацией по (created_at, id) от новых к
+    старым — в порядке списка платежей — с теми же связями и превью
+    комментариев, что и в `PaymentViewSet`, поэтому страница стоит
+    одинаково независимо от глубины.
+
+    Возвращает:
+        Iterator[CollectSnapshot]: Несохранённые снимки.
+    """
+    from .serializers import CollectSerializer, PaymentSerializer
+    from .views import payments_prefetch, payments_queryset
+
+    detail_path = reverse('collect-detail', kwargs={'pk': collect.pk})
+    request = snapshot_request(detail_path)
+    prefetch_related_objects([collect], payments_prefetch())
+    yield make_snapshot(
+        collect, DETAIL_KEY, CollectSerializer(collect, context={'request': request}).data
+    )
+
+    payments_path = reverse('collect-payments-list', kwargs={'collect_id': collect.pk})
+    payments_url = settings.SITE_URL.rstrip('/') + payments_path
+    page_size = Pagination.page_size
+    count = collect.payments.count()
+    num_pages = max(1, math.ceil(count / page_size))
+    queryset = payments_queryset(
+        Payment.objects.filter(collect=collect).order_by(*PAYMENTS_ORDERING),
+        PaymentSerializer.Meta.fields, True,
+    )
+    last = None
+    for page in range(1, num_pages + 1):
+        request = snapshot_request(payments_path if page == 1 else f'{payments_path}?page={page}')
+        page_queryset = queryset
+        if last is not None:
+            page_queryset = queryset.filter(
+                Q(created_at__lt=last.created_at) | Q(created_at=last.created_at, id__lt=last.id)
+            )
+        payments = list(page_queryset[:page_size])
+        if payments:
+            last = payments[-1]
+        next_link, previous_link = page_links(payments_url, page, num_pages)
+        yield make_snapshot(collect, payments_key(page), {
+            'count': count,
+            'next': next_link,
+            'previous': previous_link,
+            'results': PaymentSerializer(payments, many=True, context={'request': request}).data,
+        })
+
+
+def finalize_collect(collect_id):
+    """
+    Замораживает завершённый сбор: сохраняет его снимки и ставит `finalized_at`.
+
+    Снимки рендерятся без блокировки строки сбора и сохраняются пачками
+    по SNAPSHOT_WRITE_BATCH_SIZE; до заморозки их не отдают. Затем в
+    короткой транзакции сбор блокируется и сверяется `snapshots_version`:
+    если за время рендера данные сбора менялись, новые снимки удаляются
+    (сбор заморозит следующий запуск задачи).
+
+    Возвращает:
+        bool: True, если сбор заморожен.
+    """
+    eligible = Collect.objects.filter(
+        id=collect_id, finalized_at__isnull=True, end_datetime__lte=timezone.now(), is_hidden=False
+    )
+    collect = eligible.select_related('author').first()
+    if collect is None:
+        return False
+
+    version = collect.snapshots_version
+    collect.status = Collect.STATUS_ENDED
+    snapshot_ids = []
+    snapshots = render_collect_snapshots(collect)
+    while batch := list(islice(snapshots, SNAPSHOT_WRITE_BATCH_SIZE)):
+        snapshot_ids.extend(snapshot.pk for snapshot in CollectSnapshot.objects.bulk_create(batch))
+
+    with transaction.atomic():
+        if not eligible.select_for_update().filter(snapshots_version=version).exists():
+            CollectSnapshot.objects.filter(id__in=snapshot_ids).delete()
+            return False
+        CollectSnapshot.objects.filter(collect_id=collect_id).exclude(id__in=snapshot_ids).delete()
+        eligible.update(finalized_at=timezone.now(), status=Collect.STATUS_ENDED)
+    return True
+
+
+def invalidate_collect_snapshots(collect_id):
+    """
+    Сбрасывает заморозку сбора после изменения его данных.
+
+    Сдвигает `snapshots_version`, чтобы идущая в это время заморозка не
+    сохранила снимки, отрендеренные до изменения.
+    """
+    Collect.objects.filter(id=collect_id).update(
+        finalized_at=None, snapshots_version=F('snapshots_version') + 1
+    )
+    CollectSnapshot.objects.filter(collect_id=collect_id).delete()
+
+
+def snapshot_response(request, collect_id, key):
+    """
+    Возвращает готовый ответ из снимка или None, если снимка нет.
+    """
+    snapshot = CollectSnapshot.objects.filter(
+        collect_id=collect_id, key=key, collect__finalized_at__isnull=False
+    ).values_list('body', 'etag').first()
+    if snapshot is None:
+        return None
+
+    body, etag = snapshot
+    return compressed_response(request, bytes(body), etag, settings.SNAPSHOT_CACHE_MAX_AGE)
+
+
+def compressed_response(request, body, etag, max_age, content_type='application/json'):
+    """
+    Ответ из заранее сжатого gzip-тела с ETag и поддержкой 304.
+
+    Клиентам, принимающим gzip, тело отдаётся без распаковки.
+    """
+    etag = f'"{etag}"'
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+    elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = HttpResponse(body, content_type=content_type)
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(gzip.decompress(body), content_type=content_type)
+
+    response['ETag'] = etag
+    response['Cache-Control'] = f'public, max-age={max_age}'
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
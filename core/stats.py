@@ -0,0 +1,132 @@
+"""
+Статистика платформы в сводных таблицах `DailyStats` и `OccasionStats`.
+
+Дашборды читают только сводные таблицы (через кэш), а не GROUP BY по
+платежам и сборам. Таблицы поддерживаются двумя способами:
+
+- инкрементально: запись платежа, сбора или пользователя после коммита
+  прибавляет дельты к строкам дня и повода одним UPDATE с F(), создавая
+  строку при её отсутствии;
+- полным пересчётом раз в сутки (`recompute_stats`), который исправляет
+  накопившиеся расхождения — от удалённых и изменённых платежей, смены
+  повода сбора и гонок с пересчётом.
+"""
+from collections import defaultdict
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Collect, DailyStats, OccasionStats, Payment
+from .money import column_to_decimal, money_sum
+
+STATS_CACHE_KEY = 'stats'
+
+
+def bump(model, lookup, **deltas):
+    """
+    Атомарно прибавляет `deltas` к счётчикам строки `lookup`,
+    создавая строку, если её ещё нет.
+    """
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**lookup).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        # Строку только что создал параллельный запрос.
+        model.objects.filter(**lookup).update(**updates)
+
+
+def record_payment(occasion, amount, created_at):
+    def apply():
+        bump(DailyStats, {'date': timezone.localdate(created_at)},
+             donations_amount=amount, donations_count=1)
+        bump(OccasionStats, {'occasion': occasion}, donations_amount=amount, donations_count=1)
+
+    transaction.on_commit(apply)
+
+
+def record_collect(collect):
+    def apply():
+        bump(DailyStats, {'date': timezone.localdate(collect.created_at)}, new_collects=1)
+        bump(OccasionStats, {'occasion': collect.occasion}, collects_count=1, active_collects=1)
+
+    transaction.on_commit(apply)
+
+
+def record_user(user):
+    transaction.on_commit(
+        lambda: bump(DailyStats, {'date': timezone.localdate(user.date_joined)}, new_users=1)
+    )
+
+
+def record_active_collects(deltas):
+    """
+    Учитывает изменение числа незавершённых сборов.
+
+    Аргументы:
+        deltas (dict): Повод сбора → изменение числа незавершённых сборов.
+    """
+    def apply():
+        for occasion, delta in deltas.items():
+            if delta:
+                bump(OccasionStats, {'occasion': occasion}, active_collects=delta)
+
+    transaction.on_commit(apply)
+
+
+def recompute_stats():
+    """
+    Полностью пересчитывает сводные таблицы по платежам, сборам и
+    пользователям и заменяет их содержимое в одной транзакции.
+
+    Скрытые (удаляемые) сборы и их платежи не учитываются.
+
+    Возвращает:
+        dict: Количество строк по таблицам.
+    """
+    collects = Collect.objects.visible().order_by()
+    payments = Payment.objects.filter(collect__is_hidden=False).order_by()
+    daily = defaultdict(dict)
+
+    for row in payments.annotate(day=TruncDate('created_at')).values('day').annotate(
+        amount=money_sum('amount'), count=Count('id')
+    ):
+        daily[row['day']].update(
+            donations_amount=column_to_decimal(row['amount']), donations_count=row['count']
+        )
+    for row in collects.annotate(day=TruncDate('created_at')).values('day').annotate(count=Count('id')):
+        daily[row['day']]['new_collects'] = row['count']
+    for row in User.objects.order_by().annotate(day=TruncDate('date_joined')).values('day').annotate(
+        count=Count('id')
+    ):
+        daily[row['day']]['new_users'] = row['count']
+
+    occasions = {
+        row['occasion']: {
+            'collects_count': row['collects_count'], 'active_collects': row['active_collects'],
+        }
+        for row in collects.values('occasion').annotate(
+            collects_count=Count('id'),
+            active_collects=Count('id', filter=Q(status__in=Collect.OPEN_STATUSES)),
+        )
+    }
+    for row in payments.values('collect__occasion').annotate(amount=money_sum('amount'), count=Count('id')):
+        occasions.setdefault(row['collect__occasion'], {}).update(
+            donations_amount=column_to_decimal(row['amount']), donations_count=row['count']
+        )
+
+    with transaction.atomic():
+        DailyStats.objects.all().delete()
+        DailyStats.objects.bulk_create(
+            [DailyStats(date=day, **values) for day, values in daily.items()], batch_size=1000
+        )
+        OccasionStats.objects.all().delete()
+        OccasionStats.objects.bulk_create(
+            [OccasionStats(occasion=occasion, **values) for occasion, values in occasions.items()]
+        )
+    return {'daily': len(daily), 'occasions': len(occasions)}
@@ -0,0 +1,113 @@
+"""
+Статус сбора (`Collect.status`): идёт, цель достигнута, завершён.
+
+Статус хранится в таблице, чтобы выборки по нему шли по индексу, а не
+вычислялись на каждом чтении. Переходы:
+
+- `active` → `goal_reached` — в том же UPDATE, что прибавляет платёж
+  к собранной сумме (`add_payment`), без гонок между платежами;
+- незавершённые → `ended` — периодической задачей `expire_collects`,
+  которая находит истёкшие сборы по частичному индексу
+  `collect_open_end_idx` и переводит их пачками.
+
+Смена «незавершённый ↔ завершён» учитывается в статистике (`core.stats`).
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from .cache import invalidate_collects, invalidate_collects_pages
+from .models import Collect
+from .money import to_minor
+from .stats import record_active_collects
+
+
+def status_for_amount(amount):
+    """
+    Выражение статуса сбора после того, как собранная сумма станет `amount`.
+
+    Завершённые сборы не меняются; достижение цели переводит идущий сбор
+    в `goal_reached`, уменьшение суммы ниже цели — обратно в `active`.
+    """
+    return Case(
+        When(
+            status=Collect.STATUS_ACTIVE, goal_amount__isnull=False, goal_amount__lte=amount,
+            then=Value(Collect.STATUS_GOAL_REACHED),
+        ),
+        When(
+            status=Collect.STATUS_GOAL_REACHED, goal_amount__gt=amount,
+            then=Value(Collect.STATUS_ACTIVE),
+        ),
+        default=F('status'),
+    )
+
+
+def add_payment(collect, amount):
+    """
+    Атомарно прибавляет платёж к сумме и числу доноров сбора и при
+    достижении цели переводит его в `goal_reached`.
+
+    Поля `collected_amount` (и `collected_amount_minor`), `donors_count`
+    и `status` экземпляра обновляются значениями из базы.
+    """
+    collected_amount = F('collected_amount') + amount
+    Collect.objects.filter(id=collect.id).update(
+        collected_amount=collected_amount,
+        collected_amount_minor=F('collected_amount_minor') + to_minor(amount),
+        donors_count=F('donors_count') + 1,
+        status=status_for_amount(collected_amount),
+    )
+    collect.refresh_from_db(fields=['collected_amount', 'collected_amount_minor', 'donors_count', 'status'])
+
+
+def sync_status(collect):
+    """
+    Пересчитывает статус после изменения даты окончания или цели сбора.
+
+    Возвращает:
+        bool: True, если статус изменился.
+    """
+    current = collect.current_status()
+    if current == collect.status:
+        return False
+    was_open = collect.status in Collect.OPEN_STATUSES
+    collect.status = current
+    collect.save(update_fields=['status'])
+    if was_open != (current in Collect.OPEN_STATUSES):
+        record_active_collects({collect.occasion: -1 if was_open else 1})
+    return True
+
+
+def expire_collects(batch_size=None):
+    """
+    Переводит в `ended` все незавершённые сборы с прошедшей датой окончания.
+
+    Аргументы:
+        batch_size (int): Сборов в одном UPDATE. По умолчанию STATUS_SWEEP_BATCH_SIZE.
+
+    Возвращает:
+        int: Количество завершённых сборов.
+    """
+    batch_size = batch_size or settings.STATUS_SWEEP_BATCH_SIZE
+    now = timezone.now()
+    expired = 0
+    while True:
+        with transaction.atomic():
+            rows = list(Collect.objects.select_for_update().filter(
+                status__in=Collect.OPEN_STATUSES, end_datetime__lte=now
+            ).order_by().values_list('id', 'occasion')[:batch_size])
+            if not rows:
+                break
+            Collect.objects.filter(id__in=[row[0] for row in rows]).update(status=Collect.STATUS_ENDED)
+            record_active_collects(
+                {occasion: -count for occasion, count in Counter(row[1] for row in rows).items()}
+            )
+        invalidate_collects(*(row[0] for row in rows))
+        expired += len(rows)
+
+    if expired:
+        invalidate_collects_pages()
+    return expired
@@ -4,8 +4,6 @@ from email.header import Header
 from celery import shared_task
 from django.conf import settings
 from django.core.mail import EmailMessage
-import os
-print("📦 DJANGO_SETTINGS_MODULE =", os.getenv("DJANGO_SETTINGS_MODULE"))
 
 
 @shared_task
@@ -69,3 +67,130 @@ def send_collect_creation_email(author_email, collect_title):
         print("❌ Ошибка при отправке письма:")
         print(traceback.format_exc())
 
+
+
+@shared_task
+def process_cover_image(collect_id):
+    """
+    Генерирует варианты обложки сбора (WebP/JPEG нескольких размеров).
+
+    Одинаковые загрузки определяются по sha256 содержимого: если у другого
+    сбора уже есть варианты для того же хэша, они переиспользуются.
+
+    Аргументы:
+        collect_id (int): ID сбора.
+    """
+    from .cache import invalidate_collects
+    from .images import build_cover_renditions, hash_file
+    from .models import Collect
+
+    collect = Collect.objects.filter(id=collect_id).first()
+    if collect is None or not collect.cover_image:
+        return
+
+    with collect.cover_image.open('rb') as file:
+        digest = hash_file(file)
+        if digest == collect.cover_hash and collect.cover_renditions:
+            return
+
+        duplicate = Collect.objects.filter(
+            cover_hash=digest
+        ).exclude(cover_renditions={}).exclude(id=collect.id).values_list(
+            'cover_renditions', flat=True
+        ).first()
+        renditions = duplicate or build_cover_renditions(file, digest)
+
+    # Обложку могли заменить, пока шла обработка, — тогда результат устарел.
+    if Collect.objects.filter(
+        id=collect.id, cover_image=collect.cover_image.name
+    ).update(cover_hash=digest, cover_renditions=renditions):
+        invalidate_collects(collect.id)
+
+
+@shared_task
+def finalize_ended_collects(batch_size=100):
+    """
+    Замораживает завершённые сборы: рендерит их детальную страницу
+    и страницы платежей в снимки (см. `core.snapshots`).
+
+    Аргументы:
+        batch_size (int): Сколько сборов обработать за один запуск.
+
+    Возвращает:
+        int: Количество замороженных сборов.
+    """
+    from django.utils import timezone
+
+    from .models import Collect
+    from .snapshots import finalize_collect
+    from .status import expire_collects
+
+    # Статус снимков должен быть уже `ended`.
+    expire_collects()
+    collect_ids = list(Collect.objects.visible().filter(
+        finalized_at__isnull=True, end_datetime__lte=timezone.now()
+    ).order_by().values_list('id', flat=True)[:batch_size])
+    return sum(finalize_collect(collect_id) for collect_id in collect_ids)
+
+
+@shared_task
+def expire_collects():
+    """
+    Переводит сборы с прошедшей датой окончания в статус `ended`
+    (см. `core.status`).
+
+    Возвращает:
+        int: Количество завершённых сборов.
+    """
+    from .status import expire_collects as expire
+
+    return expire()
+
+
+@shared_task
+def reconcile_collect_totals(max_chunks=100):
+    """
+    Сверяет `collected_amount` и `donors_count` сборов с платежами
+    и исправляет расхождения (см. `core.reconcile`).
+
+    За запуск обрабатывается не больше `max_chunks` окон по id; следующий
+    запуск продолжит с сохранённого водяного знака.
+
+    Возвращает:
+        int: Количество исправленных сборов.
+    """
+    from .reconcile import reconcile_collect_totals as reconcile
+
+    return len(reconcile(max_chunks=max_chunks)['drifted'])
+
+
+@shared_task(bind=True)
+def delete_collect(self, collect_id):
+    """
+    Удаляет скрытый сбор вместе с платежами, лайками и комментариями
+    пачками (см. `core.deletion`). Прогресс публикуется состоянием
+    задачи PROGRESS с количеством удалённых строк по этапам.
+
+    Возвращает:
+        dict: Количество удалённых строк по этапам.
+    """
+    from .deletion import delete_collect_tree
+
+    def progress(stage, deleted):
+        if self.request.id:
+            self.update_state(state='PROGRESS', meta={'stage': stage, 'deleted': dict(deleted)})
+
+    return delete_collect_tree(collect_id, progress=progress)
+
+
+@shared_task
+def recompute_stats():
+    """
+    Полностью пересчитывает сводные таблицы статистики (см. `core.stats`).
+
+    Возвращает:
+        dict: Количество строк по таблицам.
+    """
+    from .stats import recompute_stats as recompute
+
+    return recompute()
@@ -0,0 +1,84 @@
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import ClaimsUser
+
+from .utils import LOCMEM_CACHES, auth_client, create_user
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TokenRevocationTests(TestCase):
+    url = reverse('my-payments')
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.client = auth_client(self.user)
+
+    def save_user_later(self):
+        """
+        Сохраняет пользователя через секунду после выдачи токена.
+        """
+        with mock.patch('core.authentication.time.time', return_value=time.time() + 1), \
+                self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+    def test_token_works_for_active_user(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_deactivated_user_token_is_rejected(self):
+        self.user.is_active = False
+        self.save_user_later()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_password_change_revokes_tokens(self):
+        self.user.set_password('N3w-passw0rd!')
+        self.save_user_later()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_token_issued_in_same_second_as_revocation_works(self):
+        now = int(time.time())
+        with mock.patch('core.authentication.time.time', return_value=now + 0.9):
+            self.user.set_password('N3w-passw0rd!')
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.save()
+        with mock.patch('rest_framework_simplejwt.tokens.aware_utcnow',
+                        return_value=datetime.fromtimestamp(now + 0.1, timezone.utc)):
+            client = auth_client(self.user)
+        self.assertEqual(client.get(self.url).status_code, 200)
+
+    def test_unrelated_update_keeps_tokens(self):
+        self.user.first_name = 'Имя'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ClaimsUserCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+
+    def claims_user(self):
+        return ClaimsUser.from_claims(
+            {'id': self.user.pk, 'username': self.user.username, 'is_staff': False}
+        )
+
+    def test_password_is_not_cached(self):
+        self.assertEqual(self.claims_user().email, self.user.email)
+        row = cache.get(ClaimsUser.cache_key(self.user.pk))
+        self.assertEqual(row['email'], self.user.email)
+        self.assertNotIn('password', row)
+
+        user = self.claims_user()
+        with self.assertNumQueries(0):
+            self.assertEqual(user.email, self.user.email)
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password('Passw0rd!42'))
@@ -0,0 +1,110 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+
+from core.cache import (
+    collects_page_key, collects_pages_version, get_or_compute, invalidate_collects_pages, lock_key,
+)
+
+from .utils import LOCMEM_CACHES, NO_THROTTLING, auth_client, create_collect, create_user
+
+
+@override_settings(CACHES=LOCMEM_CACHES, REST_FRAMEWORK=NO_THROTTLING)
+@mock.patch('core.views.publish_collect_events')
+@mock.patch('core.views.send_donation_emails')
+class CollectsPagesCacheTests(TestCase):
+    url = '/api/v1/collects/'
+
+    def setUp(self):
+        cache.clear()
+        author = create_user('author')
+        # Самый старый сбор попадает на вторую страницу по 10.
+        self.collect = create_collect(author)
+        for _ in range(11):
+            create_collect(author)
+
+    def collected(self, params):
+        results = self.client.get(self.url, params).json()['results']
+        return {item['id']: item['collected_amount'] for item in results}[self.collect.id]
+
+    def test_donation_refreshes_every_cached_page(self, *mocks):
+        variants = [{'page': 2}, {'limit': 5, 'page': 3}, {'status': 'active', 'page': 2}]
+        for params in variants:
+            self.assertEqual(self.collected(params), '0.00')
+
+        response = auth_client(create_user()).post(
+            f'{self.url}{self.collect.id}/payments/', {'amount': '12.00'}
+        )
+        self.assertEqual(response.status_code, 201)
+        for params in variants:
+            self.assertEqual(self.collected(params), '12.00')
+
+
+async def locmem_get(key):
+    return cache.get(key)
+
+
+async def locmem_set(key, value, timeout=None):
+    cache.set(key, value, timeout)
+
+
+async def locmem_add(key, value, timeout=None):
+    return cache.add(key, value, timeout)
+
+
+# Асинхронный кэш поверх того же LocMem вместо отдельного клиента Redis
+@mock.patch('core.async_cache.get', locmem_get)
+@mock.patch('core.async_cache.set', locmem_set)
+@mock.patch('core.async_cache.add', locmem_add)
+@override_settings(CACHES=LOCMEM_CACHES, REST_FRAMEWORK=NO_THROTTLING,
+                   ROOT_URLCONF='config.asgi_urls')
+@mock.patch('core.views.publish_collect_events')
+@mock.patch('core.views.send_donation_emails')
+class AsyncCollectsPagesCacheTests(TestCase):
+    url = '/api/v1/async/collects/'
+
+    def setUp(self):
+        cache.clear()
+        author = create_user('author')
+        self.collect = create_collect(author)
+        for _ in range(11):
+            create_collect(author)
+
+    def collected(self, params):
+        results = async_to_sync(AsyncClient().get)(self.url, params).json()['results']
+        return {item['id']: item['collected_amount'] for item in results}[self.collect.id]
+
+    def test_donation_refreshes_async_pages(self, *mocks):
+        variants = [{'page': 2}, {'limit': 5, 'page': 3}]
+        for params in variants:
+            self.assertEqual(self.collected(params), '0.00')
+
+        response = auth_client(create_user()).post(
+            f'/api/v1/collects/{self.collect.id}/payments/', {'amount': '12.00'}
+        )
+        self.assertEqual(response.status_code, 201)
+        for params in variants:
+            self.assertEqual(self.collected(params), '12.00')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class StaleVersionTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_previous_version_is_served_while_recomputing(self):
+        version = collects_pages_version()
+        old_key = collects_page_key(version=version)
+        get_or_compute(old_key, lambda: 'old', timeout=60)
+        invalidate_collects_pages()
+
+        new_key = collects_page_key()
+        self.assertNotEqual(new_key, old_key)
+        # Новую версию уже пересчитывает другой процесс.
+        cache.add(lock_key(new_key), 'other')
+        value = get_or_compute(new_key, lambda: 'new', timeout=60, stale_key=old_key)
+        self.assertEqual(value, 'old')
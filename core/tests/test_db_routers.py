@@ -0,0 +1,45 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.db_routers import PIN_COOKIE, ReplicaRouter, ReplicaRoutingMiddleware
+
+from .utils import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES, DATABASE_REPLICAS=['replica_1'])
+@mock.patch('core.db_routers.replica_lag', return_value=0.0)
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+        self.used = []
+
+    def read_alias(self):
+        self.used.append(self.router.db_for_read(None))
+        return HttpResponse()
+
+    def test_sync_chain(self, replica_lag):
+        middleware = ReplicaRoutingMiddleware(lambda request: self.read_alias())
+        self.assertFalse(iscoroutinefunction(middleware))
+        middleware(self.factory.get('/api/v1/collects/'))
+        response = middleware(self.factory.post('/api/v1/collects/'))
+        self.assertEqual(self.used, ['replica_1', 'default'])
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    def test_async_chain(self, replica_lag):
+        async def get_response(request):
+            # ORM вызывается из асинхронных представлений через sync_to_async.
+            return await sync_to_async(self.read_alias)()
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        async_to_sync(middleware)(self.factory.get('/api/v1/collects/'))
+        response = async_to_sync(middleware)(self.factory.post('/api/v1/collects/'))
+        self.assertEqual(self.used, ['replica_1', 'default'])
+        self.assertIn(PIN_COOKIE, response.cookies)
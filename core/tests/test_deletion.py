@@ -0,0 +1,35 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.deletion import delete_collect_tree, delete_in_batches
+from core.models import Collect, Payment, PaymentComment, PaymentLike
+
+from .utils import LOCMEM_CACHES, create_collect, create_user
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DeleteCollectTreeTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.collect = create_collect(create_user('author'), is_hidden=True)
+        for number in range(3):
+            user = create_user(f'donor{number}')
+            payment = Payment.objects.create(collect=self.collect, donor=user, amount='10.00')
+            PaymentLike.objects.create(payment=payment, user=user)
+            PaymentComment.objects.create(payment=payment, user=user, text='Спасибо')
+
+    def test_tree_is_deleted_in_batches(self):
+        deleted = delete_collect_tree(self.collect.id, batch_size=2)
+        self.assertEqual(
+            deleted, {'likes': 3, 'comments': 3, 'payments': 3, 'snapshots': 0, 'collect': 1}
+        )
+        self.assertFalse(Collect.objects.filter(id=self.collect.id).exists())
+        self.assertFalse(Payment.objects.exists())
+        self.assertFalse(PaymentComment.objects.exists())
+
+    def test_leaf_rows_are_deleted_without_loading_objects(self):
+        # На пачку — выборка id и один DELETE, плюс пустая выборка в конце.
+        with self.assertNumQueries(5):
+            deleted = delete_in_batches(PaymentLike.objects.filter(payment__collect=self.collect), 2)
+        self.assertEqual(deleted, 3)
@@ -0,0 +1,30 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.models import Payment
+
+from .utils import LOCMEM_CACHES, auth_client, create_collect, create_user
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PaymentExportTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = create_user('author')
+        self.collect = create_collect(self.author)
+        self.url = f'/api/v1/collects/{self.collect.id}/payments/export/'
+        self.client = auth_client(self.author)
+
+    def test_impossible_watermark_date_is_rejected(self):
+        response = self.client.get(self.url, {'after': '2026-13-45T00:00:00,1'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('after', response.json())
+
+    def test_csv_escapes_formulas_in_donor_names(self):
+        donor = create_user('=HYPERLINK("http://evil")', first_name='+1', last_name='@SUM(A1)')
+        Payment.objects.create(collect=self.collect, donor=donor, amount='10.00')
+        response = self.client.get(self.url)
+        row = b''.join(response.streaming_content).decode().splitlines()[1]
+        self.assertIn(''''=HYPERLINK(""http://evil"")''', row)
+        self.assertIn(",'+1,'@SUM(A1),", row)
@@ -0,0 +1,40 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from .utils import LOCMEM_CACHES, NO_THROTTLING, auth_client, create_collect, create_user
+
+
+@override_settings(CACHES=LOCMEM_CACHES, REST_FRAMEWORK=NO_THROTTLING, CACHE_STALE_TIMEOUT=0)
+@mock.patch('core.views.publish_collect_events')
+@mock.patch('core.views.send_donation_emails')
+class FieldSelectionCacheTests(TestCase):
+    url = '/api/v1/collects/'
+
+    def setUp(self):
+        cache.clear()
+        self.collect = create_collect(create_user('author'))
+        self.donor = create_user()
+
+    def donate(self, amount):
+        response = auth_client(self.donor).post(
+            f'{self.url}{self.collect.id}/payments/', {'amount': amount}
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def collected(self, params):
+        results = self.client.get(self.url, params).json()['results']
+        return [item['collected_amount'] for item in results]
+
+    def test_donation_refreshes_selected_fields_list(self, *mocks):
+        params = {'fields': 'id,collected_amount'}
+        self.assertEqual(self.collected(params), ['0.00'])
+        self.donate('15.00')
+        self.assertEqual(self.collected(params), ['15.00'])
+
+    def test_donation_refreshes_expanded_list(self, *mocks):
+        params = {'fields': 'id,collected_amount', 'expand': 'payments'}
+        self.assertEqual(self.collected(params), ['0.00'])
+        self.donate('7.50')
+        self.assertEqual(self.collected(params), ['7.50'])
@@ -0,0 +1,58 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.models import Payment
+
+from .utils import LOCMEM_CACHES, NO_THROTTLING, auth_client, create_collect, create_user
+
+
+@override_settings(CACHES=LOCMEM_CACHES, REST_FRAMEWORK=NO_THROTTLING)
+@mock.patch('core.views.publish_collect_events')
+@mock.patch('core.views.send_donation_emails')
+class IdempotentPaymentTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.collect = create_collect(create_user('author'))
+        self.url = f'/api/v1/collects/{self.collect.id}/payments/'
+        self.client = auth_client(create_user())
+
+    def pay(self, amount, key='payment-1'):
+        return self.client.post(self.url, {'amount': amount}, HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_first_response(self, send_donation_emails, publish_collect_events):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.pay('10.00')
+        retry = self.pay('10.00')
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Payment.objects.filter(collect=self.collect).count(), 1)
+        send_donation_emails.delay.assert_called_once()
+
+    def test_key_reuse_with_other_body_is_rejected(self, *mocks):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pay('10.00')
+        self.assertEqual(self.pay('20.00').status_code, 422)
+        self.assertEqual(Payment.objects.filter(collect=self.collect).count(), 1)
+
+    def test_other_key_creates_new_payment(self, *mocks):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pay('10.00')
+            second = self.pay('10.00', key='payment-2')
+        self.assertNotIn('Idempotent-Replayed', second)
+        self.assertEqual(Payment.objects.filter(collect=self.collect).count(), 2)
+
+    def test_response_is_stored_only_after_commit(self, *mocks):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.pay('10.00')
+            # До коммита ответа нет, а дубликат упирается в блокировку.
+            with override_settings(IDEMPOTENCY_LOCK_TIMEOUT=0.1):
+                self.assertEqual(self.pay('10.00').status_code, 409)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.pay('10.00')['Idempotent-Replayed'], 'true')
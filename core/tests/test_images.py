@@ -0,0 +1,40 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.test import SimpleTestCase, override_settings
+from PIL import Image
+
+from core.images import build_cover_renditions, open_cover
+
+
+def image_file(width, height, fmt):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), 'white').save(buffer, fmt)
+    buffer.seek(0)
+    return buffer
+
+
+class CoverRenditionsTests(SimpleTestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_widths_larger_than_source_are_skipped(self):
+        renditions = build_cover_renditions(image_file(900, 300, 'PNG'), 'a' * 64)
+        self.assertEqual(sorted(renditions['webp']), ['320', '640'])
+        self.assertEqual(sorted(renditions['jpeg']), ['320', '640'])
+
+    def test_small_source_is_kept_as_smallest_rendition(self):
+        renditions = build_cover_renditions(image_file(200, 100, 'PNG'), 'b' * 64)
+        self.assertEqual(list(renditions['webp']), ['320'])
+
+    @override_settings(COVER_MAX_DECODED_PIXELS=1000 * 1000)
+    def test_decoded_pixels_limit_applies_to_non_jpeg_only(self):
+        with self.assertRaises(Image.DecompressionBombError):
+            open_cover(image_file(1200, 1000, 'PNG'), 1280)
+        self.assertEqual(open_cover(image_file(1200, 1000, 'JPEG'), 1280).width, 1200)
@@ -0,0 +1,49 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.models import Collect, Payment
+from core.reconcile import reconcile_collect_totals
+
+from .utils import LOCMEM_CACHES, create_collect, create_user
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ReconcileTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        author = create_user('author')
+        self.donor = create_user()
+        self.drifted = create_collect(author, goal_amount=Decimal('20.00'))
+        self.consistent = create_collect(author)
+        self.empty = create_collect(author)
+        for collect in (self.drifted, self.consistent):
+            Payment.objects.create(collect=collect, donor=self.donor, amount='15.00')
+            Payment.objects.create(collect=collect, donor=self.donor, amount='10.00')
+        Collect.objects.filter(id=self.consistent.id).update(
+            collected_amount=Decimal('25.00'), collected_amount_minor=2500, donors_count=2,
+        )
+        Collect.objects.filter(id=self.empty.id).update(donors_count=3)
+
+    def test_fixes_only_drifted_collects(self):
+        result = reconcile_collect_totals(chunk_size=2)
+        self.assertTrue(result['finished'])
+        self.assertEqual(sorted(result['drifted']), [self.drifted.id, self.empty.id])
+
+        self.drifted.refresh_from_db()
+        self.assertEqual(self.drifted.collected_amount, Decimal('25.00'))
+        self.assertEqual(self.drifted.collected_amount_minor, 2500)
+        self.assertEqual(self.drifted.donors_count, 2)
+        self.assertEqual(self.drifted.status, Collect.STATUS_GOAL_REACHED)
+        self.empty.refresh_from_db()
+        self.assertEqual(self.empty.donors_count, 0)
+
+    def test_dry_run_changes_nothing(self):
+        result = reconcile_collect_totals(dry_run=True)
+        self.assertEqual(sorted(result['drifted']), [self.drifted.id, self.empty.id])
+        self.drifted.refresh_from_db()
+        self.assertEqual(self.drifted.donors_count, 0)
+        self.assertEqual(reconcile_collect_totals()['drifted'], result['drifted'])
+        self.assertEqual(reconcile_collect_totals()['drifted'], [])
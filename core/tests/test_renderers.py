@@ -0,0 +1,26 @@
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+
+    def assertSameAsJSONRenderer(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_floats_match_json_renderer(self):
+        for value in (0.0, -0.0, 0.1, 1e-4, 123.456, 1e15, 1e16, -2.5e-7, 5e-324,
+                      1.7976931348623157e308):
+            with self.subTest(value=value):
+                self.assertSameAsJSONRenderer({'items': [{'value': value}]})
+
+    def test_non_finite_floats_are_rejected(self):
+        for value in (float('nan'), float('inf'), float('-inf')):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                ORJSONRenderer().render({'value': value})
+
+    def test_big_integers_match_json_renderer(self):
+        for value in (2 ** 63 - 1, 2 ** 64, -2 ** 63 - 1, 10 ** 30):
+            with self.subTest(value=value):
+                self.assertSameAsJSONRenderer({'value': value})
@@ -0,0 +1,97 @@
+import gzip
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import CollectSnapshot, Payment, PaymentComment
+from core import snapshots
+from core.snapshots import DETAIL_KEY, finalize_collect, invalidate_collect_snapshots, payments_key
+
+from .utils import LOCMEM_CACHES, auth_client, create_collect, create_user
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SnapshotInvalidationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.donor = create_user()
+        self.collect = create_collect(
+            create_user('author'), end_datetime=timezone.now() - timedelta(days=1)
+        )
+        self.payment = Payment.objects.create(collect=self.collect, donor=self.donor, amount='10.00')
+        self.comment = PaymentComment.objects.create(payment=self.payment, user=self.donor, text='Поздравляю')
+        self.assertTrue(finalize_collect(self.collect.id))
+        self.comments_url = f'/api/v1/collects/{self.collect.id}/payments/{self.payment.id}/comments/'
+        self.client = auth_client(self.donor)
+
+    def assertSnapshotsDropped(self):
+        self.collect.refresh_from_db()
+        self.assertIsNone(self.collect.finalized_at)
+        self.assertFalse(CollectSnapshot.objects.filter(collect=self.collect).exists())
+
+    def test_comment_update_drops_snapshots(self):
+        response = self.client.patch(f'{self.comments_url}{self.comment.id}/', {'text': 'Исправлено'})
+        self.assertEqual(response.status_code, 200)
+        self.assertSnapshotsDropped()
+
+    def test_comment_delete_drops_snapshots(self):
+        response = self.client.delete(f'{self.comments_url}{self.comment.id}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertSnapshotsDropped()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class FinalizeCollectTests(TestCase):
+    payments = 25  # три страницы по PAGE_SIZE
+
+    def setUp(self):
+        cache.clear()
+        donor = create_user()
+        self.collect = create_collect(
+            create_user('author'), end_datetime=timezone.now() - timedelta(days=1)
+        )
+        for number in range(self.payments):
+            payment = Payment.objects.create(collect=self.collect, donor=donor, amount='10.00')
+            PaymentComment.objects.create(payment=payment, user=donor, text=f'Комментарий {number}')
+        self.payments_url = f'/api/v1/collects/{self.collect.id}/payments/'
+
+    def snapshot(self, key):
+        body = CollectSnapshot.objects.get(collect=self.collect, key=key).body
+        return json.loads(gzip.decompress(bytes(body)))
+
+    def test_pages_match_live_list(self):
+        live = [self.client.get(self.payments_url, {'page': page}).json() for page in (1, 2, 3)]
+        self.assertTrue(finalize_collect(self.collect.id))
+        for page, data in enumerate(live, start=1):
+            snapshot = self.snapshot(payments_key(page))
+            self.assertEqual(snapshot['count'], self.payments)
+            self.assertEqual(snapshot['results'], data['results'])
+        self.assertIsNone(self.snapshot(payments_key(3))['next'])
+        self.assertEqual(len(self.snapshot(DETAIL_KEY)['payments']), self.payments)
+
+    def test_query_count_is_constant_per_page(self):
+        # Сбор с автором, платежи и превью для детальной страницы, по два
+        # запроса на каждую из трёх страниц платежей, одна пачка снимков и
+        # заморозка (проверка версии, удаление старых снимков, UPDATE) в
+        # точке сохранения.
+        with self.assertNumQueries(15):
+            self.assertTrue(finalize_collect(self.collect.id))
+
+    def test_change_during_render_discards_snapshots(self):
+        render = snapshots.render_collect_snapshots
+
+        def render_with_write(collect):
+            yield from render(collect)
+            invalidate_collect_snapshots(collect.id)
+
+        with mock.patch('core.snapshots.render_collect_snapshots', render_with_write):
+            self.assertFalse(finalize_collect(self.collect.id))
+        self.collect.refresh_from_db()
+        self.assertIsNone(self.collect.finalized_at)
+        self.assertFalse(CollectSnapshot.objects.filter(collect=self.collect).exists())
+        self.assertTrue(finalize_collect(self.collect.id))
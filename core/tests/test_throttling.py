@@ -0,0 +1,48 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import throttling
+
+from .utils import LOCMEM_CACHES
+
+LOGIN_RATE_2_PER_MIN = {
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {**settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], 'login': '2/min'},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES, REST_FRAMEWORK=LOGIN_RATE_2_PER_MIN)
+@mock.patch('core.throttling.local_buckets', new_callable=throttling.LocalTokenBuckets)
+@mock.patch('core.throttling._script', None)
+class NonRedisCacheThrottleTests(TestCase):
+    url = reverse('token_obtain_pair')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_local_bucket_limits_without_redis(self, local_buckets):
+        credentials = {'username': 'nobody', 'password': 'wrong'}
+        with self.assertLogs('core.throttling', 'WARNING') as logs:
+            for _ in range(2):
+                self.assertEqual(self.client.post(self.url, credentials).status_code, 401)
+            self.assertEqual(self.client.post(self.url, credentials).status_code, 429)
+        # Бэкенд кэша проверяется один раз.
+        self.assertEqual(len(logs.output), 1)
+
+
+class LocalTokenBucketsTests(TestCase):
+
+    def test_least_recently_used_bucket_is_evicted(self):
+        buckets = throttling.LocalTokenBuckets()
+        buckets.max_keys = 2
+        self.assertTrue(buckets.consume('flood', 1, 0.001)[0])
+        buckets.consume('a', 1, 0.001)
+        # Повторное обращение поднимает ведро; вытесняется 'a', а не пустое 'flood'.
+        self.assertFalse(buckets.consume('flood', 1, 0.001)[0])
+        buckets.consume('b', 1, 0.001)
+        self.assertEqual(list(buckets.buckets), ['flood', 'b'])
+        self.assertFalse(buckets.consume('flood', 1, 0.001)[0])
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import Collect
+from core.serializers import ClaimsTokenObtainPairSerializer
+
+# Кэш в памяти процесса вместо Redis
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+# Без token bucket в Redis
+NO_THROTTLING = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}}
+
+
+def create_user(username='donor', **kwargs):
+    return User.objects.create_user(
+        username=username, email=f'{username}@example.com', password='Passw0rd!42', **kwargs
+    )
+
+
+def auth_client(user):
+    """
+    Клиент с access-токеном из claims, как после входа.
+    """
+    client = APIClient()
+    token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def create_collect(author, **kwargs):
+    kwargs.setdefault('end_datetime', timezone.now() + timedelta(days=30))
+    return Collect.objects.create(
+        author=author, title='Сбор', occasion='birthday', description='Описание', **kwargs
+    )
@@ -0,0 +1,183 @@
+"""
+Ограничение частоты запросов алгоритмом token bucket в Redis.
+
+Каждая проверка — один вызов атомарного Lua-скрипта (EVALSHA). Перед ним
+выполняется локальная проверка в памяти процесса: локальное ведро никогда
+не бывает пустее общего, поэтому очевидный флуд отсекается без Redis.
+
+Лимиты задаются в REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] по атрибуту
+`throttle_scope` представления: `<scope>` — на пользователя (для анонимов —
+на IP), `<scope>_ip` — на IP-адрес.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill_rate)
+
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / refill_rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill_rate * 1000))
+return {allowed, tostring(wait)}
+"""
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    '5/min' -> (5, 60), как в SimpleRateThrottle.
+    """
+    num, period = rate.split('/')
+    return int(num), DURATIONS[period[0]]
+
+
+class LocalTokenBuckets:
+    """
+    Token bucket в памяти процесса, параллельный общему ведру в Redis.
+
+    Хранит не больше `max_keys` вёдер: при переполнении вытесняется ведро,
+    к которому дольше всего не обращались, а активные ключи (в том числе
+    флудящие) остаются.
+    """
+    max_keys = 10000
+
+    def __init__(self):
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate):
+        now = time.monotonic()
+        with self.lock:
+            tokens, ts = self.buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - ts) * refill_rate)
+            allowed = tokens >= 1
+            self.buckets[key] = (tokens - 1 if allowed else tokens, now)
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+            return allowed, 0 if allowed else (1 - tokens) / refill_rate
+
+    def refund(self, key):
+        with self.lock:
+            if key in self.buckets:
+                tokens, ts = self.buckets[key]
+                self.buckets[key] = (tokens + 1, ts)
+
+
+local_buckets = LocalTokenBuckets()
+_script = None
+
+
+def get_script():
+    """
+    Lua-скрипт общего ведра или None, если кэш 'default' не в Redis
+    (например, LocMem): тогда действуют только локальные вёдра процесса.
+
+    Бэкенд проверяется один раз за процесс.
+    """
+    global _script
+    if _script is None:
+        try:
+            connection = get_redis_connection('default')
+        except NotImplementedError:
+            logger.warning('Кэш не в Redis, ограничение частоты только в памяти процесса')
+            _script = False
+        else:
+            _script = connection.register_script(TOKEN_BUCKET_SCRIPT)
+    return _script or None
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Базовый throttle: ведро на ключ `throttle:<scope>:<ident>`.
+
+    Если Redis недоступен, запрос пропускается (fail-open); если кэш не
+    в Redis, лимит проверяется только локальным ведром.
+    """
+    scope_suffix = ''
+
+    def __init__(self):
+        self.wait_time = None
+
+    def get_ident_key(self, request):
+        raise NotImplementedError('get_ident_key() должен быть переопределен в дочернем классе.')
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f'{scope}{self.scope_suffix}') if scope else None
+        if rate is None:
+            return True
+
+        capacity, period = parse_rate(rate)
+        refill_rate = capacity / period
+        key = f'throttle:{scope}{self.scope_suffix}:{self.get_ident_key(request)}'
+
+        allowed, wait = local_buckets.consume(key, capacity, refill_rate)
+        if not allowed:
+            self.wait_time = wait
+            return False
+
+        script = get_script()
+        if script is None:
+            return True
+        try:
+            allowed, wait = script(keys=[key], args=[capacity, refill_rate])
+        except RedisError:
+            logger.warning('Redis недоступен, ограничение частоты пропущено', exc_info=True)
+            return True
+
+        if not allowed:
+            # Общее ведро пусто: возвращаем локальный токен, чтобы не ужесточать лимит.
+            local_buckets.refund(key)
+            self.wait_time = float(wait)
+            return False
+        return True
+
+    def wait(self):
+        return self.wait_time
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Лимит на пользователя; для анонимных запросов — на IP-адрес.
+    """
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return f'user_{request.user.pk}'
+        return f'ip_{self.get_ident(request)}'
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Лимит на IP-адрес (ключ лимита `<scope>_ip`).
+    """
+    scope_suffix = '_ip'
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
@@ -1,13 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.views import TokenRefreshView
 
 from .views import (
     CollectViewSet,
     PaymentViewSet,
     PaymentCommentViewSet,
     PaymentLikeViewSet,
-    RegisterView, redirect_short_link
+    MyPaymentsView, StatsView, RegisterView, LoginView, LogoutView, redirect_short_link
 )
 
 v1_router = DefaultRouter()
@@ -23,7 +23,10 @@ v1_router.register(rf'{payment_prefix}/(?P<payment_id>\d+)/likes', PaymentLikeVi
 
 urlpatterns = [
     path('', include(v1_router.urls)),
+    path('me/payments/', MyPaymentsView.as_view(), name='my-payments'),
+    path('stats/', StatsView.as_view(), name='stats'),
     path('register/', RegisterView.as_view(), name='register'),
-    path('login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('login/', LoginView.as_view(), name='token_obtain_pair'),
+    path('logout/', LogoutView.as_view(), name='logout'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 ]
@@ -1,55 +1,295 @@
+from datetime import timedelta
+from decimal import Decimal
+
 from django.conf import settings
-from django.core.cache import cache
 from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import Count, Prefetch, Sum
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_datetime
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
-from rest_framework import viewsets, permissions, status
+from rest_framework import generics, viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from .authentication import revoke_token
 
-from .models import Collect, Payment
-from .pagination import Pagination
+from .batch import get_collects, parse_collect_ids
+from .cache import (
+    collects_page_key, collects_pages_version, get_or_compute, invalidate_collects,
+    invalidate_collects_pages,
+)
+from .comments import comments_count, preview_prefetch
+from .deletion import schedule_collect_deletion
+from .donors import get_donor_totals, invalidate_donor_totals, record_donation
+from .events import publish_collect_events
+from .exports import EXPORT_CONTENT_TYPES, export_stream
+from .fast_serializers import MONEY_FIELDS, FastCollectSerializer, FastPaymentSerializer, format_decimal
+from .field_selection import parse_field_selection, trim_representation
+from .idempotency import IdempotentCreateMixin
+from .models import Collect, DailyStats, OccasionStats, Payment
+from .pagination import CreatedCursorPagination, Pagination
 from .permissions import AuthorOrReadOnly, DonorOrReadOnly, IsDonatorOfCollect
+from .stats import STATS_CACHE_KEY, record_collect, record_payment, record_user
+from .status import add_payment, sync_status
+from .snapshots import DETAIL_KEY, invalidate_collect_snapshots, payments_key, snapshot_response
 from .serializers import (
     CollectSerializer, PaymentSerializer, RegisterSerializer,
-    PaymentCommentSerializer, PaymentLikeSerializer
+    PaymentCommentSerializer, PaymentLikeSerializer, LogoutSerializer, MyPaymentSerializer,
+    DailyStatsSerializer, OccasionStatsSerializer, UserSerializer
 )
-from .tasks import send_donation_emails, send_collect_creation_email
+from .tasks import send_donation_emails, send_collect_creation_email, process_cover_image
+
+
+def model_columns(fields, relations):
+    """
+    Колонки для `.only()` под выбранные поля сериализатора.
+
+    Аргументы:
+        fields (Iterable[str]): Поля ответа, совпадающие с полями модели.
+        relations (Iterable[str]): Выбранные связи, выводимые `UserSerializer`.
+    """
+    columns = {'id'}
+    for name in fields:
+        columns.add(name)
+        if name in MONEY_FIELDS:
+            columns.add(f'{name}_minor')
+    for name in relations:
+        columns.add(name)
+        columns.update(f'{name}__{field}' for field in UserSerializer.Meta.fields)
+    return columns
+
+
+def payments_queryset(queryset, fields, comments):
+    """
+    Подстраивает queryset платежей под выбранные поля `PaymentSerializer`:
+    донор, счётчики и превью комментариев загружаются, только если выбраны.
+    """
+    relations = [name for name in fields if name == 'donor']
+    columns = model_columns(
+        [name for name in fields if name not in ('donor', 'likes_count', 'comments_count')], relations
+    )
+    if relations:
+        # select_related() без аргументов загрузил бы все связи.
+        queryset = queryset.select_related(*relations)
+    queryset = queryset.only(*columns, 'collect')
+    if 'likes_count' in fields:
+        # Meta.ordering не применяется к запросам с GROUP BY.
+        ordering = queryset.query.order_by or Payment._meta.ordering
+        queryset = queryset.annotate(likes_count=Count('likes')).order_by(*ordering)
+    if 'comments_count' in fields:
+        queryset = queryset.annotate(comments_count=comments_count())
+    if comments:
+        queryset = queryset.prefetch_related(preview_prefetch())
+    return queryset
+
+
+def payments_prefetch(fields=None, comments=True):
+    """
+    Prefetch платежей сбора под выбранные поля (по умолчанию — все).
+    """
+    return Prefetch('payments', queryset=payments_queryset(
+        Payment.objects.all(), fields or PaymentSerializer.Meta.fields, comments
+    ))
+
+
+class FieldSelectionMixin:
+    """
+    Выбор полей ответа через `?fields=` и `?expand=` для запросов
+    на чтение (см. `core.field_selection`).
+    """
+
+    def get_field_selection(self):
+        """
+        Возвращает:
+            FieldSelection или None — ответ со всеми полями.
+        """
+        if not hasattr(self, '_field_selection'):
+            self._field_selection = None
+            if self.request is not None and self.request.method in permissions.SAFE_METHODS:
+                self._field_selection = parse_field_selection(
+                    self.request.query_params, self.get_serializer_class()
+                )
+        return self._field_selection
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['field_selection'] = self.get_field_selection()
+        return context
+
+
+class FastListMixin:
+    """
+    Опциональный быстрый путь для `list`.
+
+    Если включена настройка FAST_SERIALIZATION, список строится
+    сериализатором из `fast_serializer_class` по строкам `.values()`
+    вместо ModelSerializer.
+    """
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_SERIALIZATION or self.fast_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+
+        fast_serializer = self.fast_serializer_class(context=self.get_serializer_context())
+        rows = fast_serializer.get_rows(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast_serializer.serialize(page))
+        return Response(fast_serializer.serialize(rows))
+
+
+class NestedParentsMixin:
+    """
+    Родительские объекты вложенных маршрутов (`collect_id`, `payment_id`),
+    загруженные один раз за запрос.
+
+    Экземпляр представления живёт ровно один запрос, поэтому результаты
+    запоминаются на нём. Платёж загружается одним запросом вместе со
+    сбором и его автором и обязан принадлежать сбору из URL.
+    """
+
+    def get_collect(self):
+        """
+        Получает сбор из URL вместе с автором.
 
+        Возвращает:
+            Collect: Сбор или None для Swagger.
+
+        Исключения:
+            Http404: Если сбор не найден.
+        """
+        if getattr(self, 'swagger_fake_view', False):
+            return None
+        if not hasattr(self, '_collect'):
+            if self.kwargs.get('payment_id'):
+                self._collect = self.get_payment().collect
+            else:
+                self._collect = get_object_or_404(
+                    Collect.objects.visible().select_related('author'), id=self.kwargs.get('collect_id')
+                )
+        return self._collect
+
+    def get_payment(self):
+        """
+        Получает платёж из URL вместе со сбором и его автором.
 
-class CollectViewSet(viewsets.ModelViewSet):
+        Возвращает:
+            Payment: Платёж или None для Swagger и маршрутов без `payment_id`.
+
+        Исключения:
+            Http404: Если платёж не найден или относится к другому сбору.
+        """
+        if getattr(self, 'swagger_fake_view', False):
+            return None
+        payment_id = self.kwargs.get('payment_id')
+        if not payment_id:
+            return None
+        if not hasattr(self, '_payment'):
+            self._payment = get_object_or_404(
+                Payment.objects.select_related('collect__author'),
+                id=payment_id, collect_id=self.kwargs.get('collect_id'), collect__is_hidden=False,
+            )
+        return self._payment
+
+    def is_collect_donor(self, user):
+        """
+        Делал ли пользователь платёж в сбор из URL (запоминается на запрос).
+        """
+        if not hasattr(self, '_is_collect_donor'):
+            payment = self.get_payment()
+            if payment is not None and payment.donor_id == user.pk:
+                # Автор платежа из URL заведомо донор сбора.
+                self._is_collect_donor = True
+                return True
+            self._is_collect_donor = Payment.objects.filter(
+                collect_id=self.kwargs.get('collect_id'), donor=user
+            ).exists()
+        return self._is_collect_donor
+
+
+class CollectViewSet(IdempotentCreateMixin, FieldSelectionMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet для работы с сборами. Поддерживает CRUD-операции для сборов,
     а также кэширование данных для ускорения работы с часто запрашиваемыми коллекциями.
     """
-    queryset = Collect.objects.select_related('author').prefetch_related('payments')
+    queryset = Collect.objects.visible().select_related('author')
     serializer_class = CollectSerializer
+    fast_serializer_class = FastCollectSerializer
     permission_classes = [AuthorOrReadOnly,]
     pagination_class = Pagination
 
-    def get_cache_key(self, request, pk=None):
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'destroy':
+            # Для удаления платежи не нужны — их может быть очень много.
+            return queryset
+
+        selection = self.get_field_selection()
+        if selection is None:
+            return queryset.prefetch_related(payments_prefetch())
+        relations = [name for name in selection.fields if name == 'author']
+        if not relations:
+            queryset = queryset.select_related(None)
+        queryset = queryset.only(*model_columns(
+            [name for name in selection.fields if name != 'author'], relations
+        ))
+        if 'payments' in selection.expand:
+            queryset = queryset.prefetch_related(
+                payments_prefetch(comments='payments.comments' in selection.expand)
+            )
+        return queryset
+
+    def get_cache_key(self, request, version=None):
         """
         Генерирует уникальный ключ кэша для каждого запроса.
 
         Аргументы:
-            request (Request): Запрос, содержащий параметры страницы и лимита.
+            request (Request): Запрос, содержащий параметры страницы, лимита,
+                статуса и выбора полей.
+            version (int): Версия страниц (`core.cache.collects_pages_version`).
 
         Возвращает:
             str: Уникальный ключ кэша.
         """
         page = request.query_params.get('page', 1)
         limit = request.query_params.get('limit', 10)
-        return f"collects_page_{page}_limit_{limit}"
+        return collects_page_key(
+            page, limit, request.query_params.get('status'), self.get_field_selection(), version
+        )
+
+    def filter_queryset(self, queryset):
+        """
+        Фильтрует список по `?status=` (active, goal_reached, ended).
+        """
+        queryset = super().filter_queryset(queryset)
+        collect_status = self.request.query_params.get('status')
+        if self.action != 'list' or not collect_status:
+            return queryset
+        if collect_status not in dict(Collect.STATUS_CHOICES):
+            raise ValidationError({'status': f"Неизвестный статус '{collect_status}'."})
+        return queryset.filter(status=collect_status)
 
     def list(self, request, *args, **kwargs):
         """
         Возвращает список всех сборов, с возможностью использования кэша.
 
-        Если данные есть в кэше, они возвращаются из кэша. Если данных нет, выполняется запрос
-        к базе данных и результат кэшируется на 1 час.
+        Данные кэшируются на 1 час через `core.cache.get_or_compute`: при
+        промахе запрос к базе выполняет только один процесс, остальные
+        получают устаревшие данные или дожидаются результата.
 
         Аргументы:
             request (Request): Запрос на получение списка сборов.
@@ -57,15 +297,26 @@ class CollectViewSet(viewsets.ModelViewSet):
         Возвращает:
             Response: Ответ с данными о сборах.
         """
-        cache_key = self.get_cache_key(request)
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data)
+        version = collects_pages_version()
+        data = get_or_compute(
+            self.get_cache_key(request, version),
+            lambda: super(CollectViewSet, self).list(request, *args, **kwargs).data,
+            timeout=3600,
+            stale_key=self.get_cache_key(request, version - 1),
+        )
+        return Response(data)
 
-        # Если данные нет в кэше, выполняем запрос
-        response = super().list(request, *args, **kwargs)
-        cache.set(cache_key, response.data, timeout=3600)  # Кэшируем данные на 1 час
-        return response
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Возвращает сбор. Для замороженных завершённых сборов ответ
+        отдаётся из готового снимка без запросов к основным таблицам
+        (если не запрошен выбор полей).
+        """
+        if request.accepted_renderer.format == 'json' and self.get_field_selection() is None:
+            response = snapshot_response(request, self.kwargs['pk'], DETAIL_KEY)
+            if response is not None:
+                return response
+        return super().retrieve(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         collect = serializer.save(author=self.request.user)
@@ -78,10 +329,75 @@ class CollectViewSet(viewsets.ModelViewSet):
         send_collect_creation_email.delay(collect.author.email, collect.title)
 
         # Инвалидация кэша
-        cache.delete(f"collects_page_1_limit_10")
+        invalidate_collects_pages()
 
+        record_collect(collect)
+        self.schedule_cover_processing(collect)
         return collect
 
+    def perform_update(self, serializer):
+        """
+        Обновляет сбор. При замене обложки сбрасывает её варианты
+        и ставит новую обложку в очередь на обработку.
+        """
+        if 'cover_image' in serializer.validated_data:
+            collect = serializer.save(cover_hash='', cover_renditions={})
+            self.schedule_cover_processing(collect)
+        else:
+            collect = serializer.save()
+        if sync_status(collect):
+            invalidate_collects_pages()
+        invalidate_collect_snapshots(collect.id)
+        invalidate_collects(collect.id)
+
+    def destroy(self, request, *args, **kwargs):
+        """
+        Скрывает сбор и ставит удаление его платежей, лайков и комментариев
+        в фоновую задачу (см. `core.deletion`).
+
+        Возвращает:
+            Response: 202 — сбор скрыт, удаление выполняется.
+        """
+        collect = self.get_object()
+        schedule_collect_deletion(collect.id)
+        return Response(status=status.HTTP_202_ACCEPTED)
+
+    def schedule_cover_processing(self, collect):
+        """
+        После коммита транзакции отправляет обложку сбора в фоновую обработку.
+        """
+        if collect.cover_image:
+            transaction.on_commit(lambda: process_cover_image.delay(collect.id))
+
+    @action(detail=False, methods=['get', 'post'], permission_classes=[AllowAny],
+            url_path='batch')
+    def batch(self, request):
+        """
+        Возвращает несколько сборов по списку id (см. `core.batch`).
+
+        Параметры запроса:
+            ids: `1,2,3` в строке запроса (GET) или в теле запроса (POST),
+                в теле также можно передать массив. Не больше
+                COLLECTS_BATCH_MAX_IDS id.
+
+        Возвращает:
+            Response: `results` — сборы в порядке запроса; вместо
+            ненайденного сбора — `{"id": ..., "detail": "Не найдено."}`.
+            `?fields=` и `?expand=` применяются к закэшированным представлениям.
+        """
+        if request.method == 'POST':
+            raw = request.data.get('ids') if hasattr(request.data, 'get') else request.data
+        else:
+            raw = request.query_params.get('ids')
+        selection = parse_field_selection(request.query_params, CollectSerializer)
+        results = get_collects(parse_collect_ids(raw))
+        if selection is not None:
+            results = [
+                trim_representation(data, selection, CollectSerializer.expandable_fields)
+                for data in results
+            ]
+        return Response({'results': results})
+
     @action(detail=True, methods=['get'], permission_classes=[AllowAny],
             url_path='get-link')
     def get_link(self, request, pk=None):
@@ -102,27 +418,23 @@ class CollectViewSet(viewsets.ModelViewSet):
         return Response({"short-link": short_url}, status=status.HTTP_200_OK)
 
 
-class PaymentViewSet(viewsets.ModelViewSet):
+class PaymentViewSet(IdempotentCreateMixin, FieldSelectionMixin, NestedParentsMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet для работы с платежами. Поддерживает CRUD-операции для платежей,
     привязанных к конкретному сбору.
     """
     serializer_class = PaymentSerializer
+    fast_serializer_class = FastPaymentSerializer
     permission_classes = [DonorOrReadOnly]
+    throttle_scope = 'payment'
 
-    def get_collect(self):
+    def get_throttles(self):
         """
-        Получает объект сбора (Collect), привязанный к текущему платежу.
-
-        Возвращает:
-            Collect: Объект сбора, к которому привязан платеж.
-
-        Исключения:
-            Http404: Если сбор не найден.
+        Ограничение частоты применяется только к созданию платежей.
         """
-        if getattr(self, 'swagger_fake_view', False):
-            return None
-        return get_object_or_404(Collect, id=self.kwargs.get('collect_id'))
+        if self.action != 'create':
+            return []
+        return super().get_throttles()
 
     def get_queryset(self):
         """
@@ -134,7 +446,26 @@ class PaymentViewSet(viewsets.ModelViewSet):
         collect = self.get_collect()
         if collect is None:
             return Collect.objects.none()
-        return collect.payments.all()
+        selection = self.get_field_selection()
+        if selection is None:
+            return payments_queryset(collect.payments.all(), PaymentSerializer.Meta.fields, True)
+        return payments_queryset(
+            collect.payments.all(), selection.fields, 'comments' in selection.expand
+        )
+
+    def list(self, request, *args, **kwargs):
+        """
+        Возвращает платежи сбора. Страницы размера по умолчанию
+        для замороженных сборов отдаются из готовых снимков.
+        """
+        params = set(request.query_params)
+        if request.accepted_renderer.format == 'json' and params <= {'page'}:
+            page = request.query_params.get('page', '1')
+            if page.isdigit():
+                response = snapshot_response(request, self.kwargs['collect_id'], payments_key(int(page)))
+                if response is not None:
+                    return response
+        return super().list(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         """
@@ -145,45 +476,130 @@ class PaymentViewSet(viewsets.ModelViewSet):
 
         Также:
             - Инвалидация кэша для страницы с платежами.
-            - Обновление суммы сбора и количества доноров.
+            - Атомарное обновление суммы сбора, количества доноров и статуса.
+            - Обновление итогов пожертвований донора.
         """
         donor = self.request.user
         collect = self.get_collect()
+        new_collect = not self.is_collect_donor(donor)
         payment = serializer.save(collect=collect, donor=donor)
+        record_donation(donor.id, payment.amount, new_collect)
 
         # Инвалидация кэша
-        cache.delete(f"collects_page_1_limit_10")
-
-        collect.collected_amount += payment.amount
-        collect.donors_count += 1
-        collect.save()
+        invalidate_collects_pages()
+
+        add_payment(collect, payment.amount)
+        record_payment(collect.occasion, payment.amount, payment.created_at)
+        invalidate_collect_snapshots(collect.id)
+        invalidate_collects(collect.id)
+        publish_collect_events(
+            collect.id,
+            ('payment', {
+                'id': payment.id,
+                'amount': payment.amount,
+                'created_at': payment.created_at.isoformat(),
+                'donor': {'id': donor.id, 'username': donor.username},
+            }),
+            ('totals', {
+                'collected_amount': collect.collected_amount,
+                'donors_count': collect.donors_count,
+                'status': collect.status,
+            }),
+        )
         send_donation_emails.delay(donor.email, collect.author.email, payment.amount, collect.title)
 
+    def perform_update(self, serializer):
+        payment = serializer.save()
+        invalidate_donor_totals(payment.donor_id)
+        invalidate_collects_pages()
+        invalidate_collect_snapshots(payment.collect_id)
+        invalidate_collects(payment.collect_id)
+
+    def perform_destroy(self, instance):
+        donor_id = instance.donor_id
+        instance.delete()
+        invalidate_donor_totals(donor_id)
+        invalidate_collects_pages()
+        invalidate_collect_snapshots(instance.collect_id)
+        invalidate_collects(instance.collect_id)
+
+    @action(detail=False, methods=['get'], url_path='export',
+            permission_classes=[permissions.IsAuthenticated])
+    def export(self, request, collect_id=None):
+        """
+        Потоковая выгрузка всех платежей сбора для его автора.
+
+        Параметры запроса:
+            type: `csv` (по умолчанию) или `ndjson`.
+            after: водяной знак `<created_at>,<id>` последнего полученного
+                платежа — выгрузка продолжится со следующего.
 
-class CommentsLikesBaseViewSet(viewsets.ModelViewSet):
+        Клиентам, принимающим gzip, поток сжимается на лету.
+        """
+        collect = self.get_collect()
+        if collect.author_id != request.user.id:
+            raise PermissionDenied("Выгрузка платежей доступна только автору сбора.")
+
+        file_format = request.query_params.get('type', 'csv')
+        if file_format not in EXPORT_CONTENT_TYPES:
+            raise ValidationError({'type': "Допустимые значения: csv, ndjson."})
+
+        after = None
+        if 'after' in request.query_params:
+            created_at, _, payment_id = request.query_params['after'].rpartition(',')
+            try:
+                after = (parse_datetime(created_at), payment_id)
+            except ValueError:
+                after = (None, payment_id)
+            if after[0] is None or not payment_id.isdigit():
+                raise ValidationError({'after': "Ожидается формат '<created_at>,<id>'."})
+
+        compress = 'gzip' in request.headers.get('Accept-Encoding', '')
+        response = StreamingHttpResponse(
+            export_stream(collect.id, file_format, after, compress),
+            content_type=EXPORT_CONTENT_TYPES[file_format],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="collect-{collect.id}-payments.{file_format}"'
+        )
+        if compress:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+
+
+class CommentsLikesBaseViewSet(NestedParentsMixin, viewsets.ModelViewSet):
     """
     Базовый ViewSet для комментариев и лайков
     """
     permission_classes = [permissions.IsAuthenticated, IsDonatorOfCollect]
 
-    def get_payment(self):
-        """
-        Получаем платеж по ID из URL параметров.
-        Если вызвано из Swagger — возвращаем None.
-        """
-        if getattr(self, 'swagger_fake_view', False):
-            return None  # Swagger лезет сюда — просто игнорируем
-
-        payment_id = self.kwargs.get('payment_id')
-        if not payment_id:
-            return None
-        return get_object_or_404(Payment, id=payment_id)
-
     def perform_create(self, serializer):
         """
         Этот метод будет использоваться для сохранения данных, связанных с платежом.
         """
-        serializer.save(payment=self.get_payment(), user=self.request.user)
+        payment = self.get_payment()
+        instance = serializer.save(payment=payment, user=self.request.user)
+        invalidate_collect_snapshots(payment.collect_id)
+        invalidate_collects(payment.collect_id)
+        publish_collect_events(payment.collect_id, self.get_event(instance))
+
+    def perform_update(self, serializer):
+        instance = serializer.save()
+        invalidate_collect_snapshots(instance.payment.collect_id)
+        invalidate_collects(instance.payment.collect_id)
+
+    def perform_destroy(self, instance):
+        collect_id = instance.payment.collect_id
+        instance.delete()
+        invalidate_collect_snapshots(collect_id)
+        invalidate_collects(collect_id)
+
+    def get_event(self, instance):
+        """
+        Событие для SSE-потока сбора о созданном объекте — (тип, данные).
+        """
+        raise NotImplementedError("get_event() должен быть переопределен в дочернем классе.")
 
     def get_queryset(self):
         """
@@ -211,6 +627,9 @@ class PaymentLikeViewSet(CommentsLikesBaseViewSet):
             return None
         return payment.likes.all()
 
+    def get_event(self, instance):
+        return 'like', {'payment_id': instance.payment_id, 'user': instance.user_id}
+
 
 class PaymentCommentViewSet(CommentsLikesBaseViewSet):
     """
@@ -231,12 +650,23 @@ class PaymentCommentViewSet(CommentsLikesBaseViewSet):
             return None
         return payment.comments.all()
 
+    def get_event(self, instance):
+        return 'comment', {
+            'id': instance.id,
+            'payment_id': instance.payment_id,
+            'user': instance.user_id,
+            'text': instance.text,
+            'created_at': instance.created_at.isoformat(),
+        }
+
 
 
 class RegisterView(APIView):
     """
     View для регистрации нового пользователя.
     """
+    throttle_scope = 'register'
+
     def post(self, request):
         """
         Регистрирует нового пользователя, принимая данные из запроса.
@@ -249,11 +679,106 @@ class RegisterView(APIView):
         """
         serializer = RegisterSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            record_user(serializer.save())
             return Response({"message": "Пользователь создан."}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class LoginView(TokenObtainPairView):
+    """
+    Получение пары JWT-токенов с ограничением частоты попыток входа.
+    """
+    throttle_scope = 'login'
+
+
+class LogoutView(APIView):
+    """
+    Выход: отзывает текущий access-токен и, если передан, refresh-токен.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = LogoutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        refresh = serializer.validated_data.get('refresh')
+        if refresh:
+            try:
+                refresh = RefreshToken(refresh)
+            except TokenError as exc:
+                raise ValidationError({'refresh': str(exc)})
+            revoke_token(refresh)
+        revoke_token(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class MyPaymentsView(generics.ListAPIView):
+    """
+    Платежи текущего пользователя от новых к старым с краткими данными
+    сборов и итогами пожертвований.
+
+    Платежи выбираются по индексу `(donor, created_at)` одним запросом
+    вместе со сборами, страницы — по курсору (`?cursor=`), а итоги
+    берутся из кэша и обновляются при каждом новом платеже.
+    """
+    serializer_class = MyPaymentSerializer
+    pagination_class = CreatedCursorPagination
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return Payment.objects.none()
+        return Payment.objects.filter(
+            donor=self.request.user, collect__is_hidden=False
+        ).select_related('collect').only(
+            'id', 'amount', 'amount_minor', 'created_at', 'collect__id', 'collect__title',
+            'collect__occasion', 'collect__goal_amount', 'collect__goal_amount_minor',
+            'collect__collected_amount', 'collect__collected_amount_minor', 'collect__status',
+            'collect__end_datetime',
+        )
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        response.data['totals'] = get_donor_totals(request.user.id)
+        return response
+
+
+class StatsView(APIView):
+    """
+    Статистика платформы для дашбордов: итоги по поводам сборов
+    и по дням за последние `?days=` дней (по умолчанию STATS_DAYS).
+
+    Данные берутся только из сводных таблиц `core.stats` и кэшируются
+    на STATS_CACHE_TIMEOUT секунд.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        days = request.query_params.get('days', str(settings.STATS_DAYS))
+        if not days.isdigit() or not 1 <= int(days) <= settings.STATS_MAX_DAYS:
+            raise ValidationError({'days': f"Ожидается число от 1 до {settings.STATS_MAX_DAYS}."})
+        data = get_or_compute(
+            f"{STATS_CACHE_KEY}_{int(days)}", lambda: self.build(int(days)),
+            timeout=settings.STATS_CACHE_TIMEOUT,
+        )
+        return Response(data)
+
+    @staticmethod
+    def build(days):
+        totals = OccasionStats.objects.aggregate(
+            collects_count=Coalesce(Sum('collects_count'), 0),
+            active_collects=Coalesce(Sum('active_collects'), 0),
+            donations_count=Coalesce(Sum('donations_count'), 0),
+            donations_amount=Sum('donations_amount'),
+        )
+        totals['donations_amount'] = format_decimal(totals['donations_amount'] or Decimal(0))
+        first_day = timezone.localdate() - timedelta(days=days - 1)
+        return {
+            'totals': totals,
+            'occasions': OccasionStatsSerializer(OccasionStats.objects.all(), many=True).data,
+            'daily': DailyStatsSerializer(DailyStats.objects.filter(date__gte=first_day), many=True).data,
+        }
+
+
 @require_http_methods(["GET"])
 def redirect_short_link(request, short_link):
     """
@@ -261,6 +786,6 @@ def redirect_short_link(request, short_link):
     на оригинальный сбор.
     """
     # Ищем сбор по короткой ссылке
-    collect = get_object_or_404(Collect, short_link=short_link)
+    collect = get_object_or_404(Collect.objects.visible(), short_link=short_link)
     # Переадресовываем на оригинальный URL сбора
     return redirect(reverse('collect-detail', kwargs={'pk': collect.id}))